@@ -7,7 +7,7 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 from src.config import settings
 from src.models.base import Base
-from src.models import User # noqa
+from src.models import AuthEvent, Job, RevokedToken, Task, TaskTombstone, User # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
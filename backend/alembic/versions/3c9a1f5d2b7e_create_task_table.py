@@ -0,0 +1,49 @@
+"""create Task table
+
+Revision ID: 3c9a1f5d2b7e
+Revises: bb83afb84a46
+Create Date: 2026-10-18 10:12:40.118204
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a1f5d2b7e'
+down_revision: str | Sequence[str] | None = 'bb83afb84a46'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=16), server_default='open', nullable=False),
+    sa.Column('priority', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('due_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint("status IN ('open', 'in_progress', 'done')", name='ck_task_status'),
+    sa.CheckConstraint('priority BETWEEN 0 AND 3', name='ck_task_priority'),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_task_owner_open_due', 'task', ['owner_id', 'due_at', 'id'],
+        unique=False, postgresql_where=sa.text("status <> 'done'"),
+    )
+    op.create_index('ix_task_owner_status_due', 'task', ['owner_id', 'status', 'due_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_owner_status_due', table_name='task')
+    op.drop_index('ix_task_owner_open_due', table_name='task', postgresql_where=sa.text("status <> 'done'"))
+    op.drop_table('task')
@@ -0,0 +1,50 @@
+"""add task change versions and tombstones
+
+Revision ID: 7e2d4b91c0a3
+Revises: 3c9a1f5d2b7e
+Create Date: 2026-10-18 14:03:27.512870
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2d4b91c0a3'
+down_revision: str | Sequence[str] | None = '3c9a1f5d2b7e'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user', sa.Column('task_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('task', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+    # Existing tasks become version 1, so a full sync (since=0) returns them.
+    op.execute('UPDATE task SET version = 1')
+    op.execute(
+        'UPDATE "user" SET task_version = owned.version '
+        'FROM (SELECT owner_id, max(version) AS version FROM task GROUP BY owner_id) AS owned '
+        'WHERE "user".id = owned.owner_id'
+    )
+    op.create_index('ix_task_owner_version', 'task', ['owner_id', 'version'], unique=False)
+    op.create_table('task_tombstone',
+    sa.Column('task_id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_tombstone_owner_version', 'task_tombstone', ['owner_id', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_tombstone_owner_version', table_name='task_tombstone')
+    op.drop_table('task_tombstone')
+    op.drop_index('ix_task_owner_version', table_name='task')
+    op.drop_column('task', 'version')
+    op.drop_column('user', 'task_version')
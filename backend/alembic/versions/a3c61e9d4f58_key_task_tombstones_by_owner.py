@@ -0,0 +1,33 @@
+"""key task tombstones by owner and task id
+
+Revision ID: a3c61e9d4f58
+Revises: f2b8d4e6a1c7
+Create Date: 2026-10-19 10:12:44.905213
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c61e9d4f58'
+down_revision: str | Sequence[str] | None = 'f2b8d4e6a1c7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('task_tombstone_pkey', 'task_tombstone', type_='primary')
+    op.create_primary_key('pk_task_tombstone', 'task_tombstone', ['owner_id', 'task_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Keep the newest tombstone of ids deleted by several users.
+    op.execute(
+        'DELETE FROM task_tombstone older USING task_tombstone newer '
+        'WHERE older.task_id = newer.task_id AND (older.deleted_at, older.owner_id) < (newer.deleted_at, newer.owner_id)'
+    )
+    op.drop_constraint('pk_task_tombstone', 'task_tombstone', type_='primary')
+    op.create_primary_key('task_tombstone_pkey', 'task_tombstone', ['task_id'])
@@ -0,0 +1,46 @@
+"""add task full-text and trigram search
+
+Revision ID: c41f8e6a9d20
+Revises: 7e2d4b91c0a3
+Create Date: 2026-10-18 16:41:09.334512
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8e6a9d20'
+down_revision: str | Sequence[str] | None = '7e2d4b91c0a3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Adding a stored generated column rewrites the table once.
+    op.add_column('task', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True
+    ))
+    op.create_index('ix_task_search', 'task', ['owner_id', 'search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_task_title_trgm', 'task', ['owner_id', 'title'],
+        unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_title_trgm', table_name='task', postgresql_using='gin')
+    op.drop_index('ix_task_search', table_name='task', postgresql_using='gin')
+    op.drop_column('task', 'search_vector')
@@ -0,0 +1,28 @@
+"""include user id in the auth event listing index
+
+Revision ID: c8e1f4a7b392
+Revises: a3c61e9d4f58
+Create Date: 2026-10-19 14:37:05.118402
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e1f4a7b392'
+down_revision: str | Sequence[str] | None = 'a3c61e9d4f58'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_auth_event_username_occurred_at', table_name='auth_event', postgresql_include=['kind', 'client_ip', 'detail'])
+    op.create_index('ix_auth_event_username_occurred_at', 'auth_event', ['username', 'occurred_at'], unique=False, postgresql_include=['user_id', 'kind', 'client_ip', 'detail'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auth_event_username_occurred_at', table_name='auth_event', postgresql_include=['user_id', 'kind', 'client_ip', 'detail'])
+    op.create_index('ix_auth_event_username_occurred_at', 'auth_event', ['username', 'occurred_at'], unique=False, postgresql_include=['kind', 'client_ip', 'detail'])
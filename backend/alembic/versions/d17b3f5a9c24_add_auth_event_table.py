@@ -0,0 +1,43 @@
+"""add partitioned auth event table
+
+Revision ID: d17b3f5a9c24
+Revises: 9a4c6e1d3b58
+Create Date: 2026-10-18 20:26:48.113502
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd17b3f5a9c24'
+down_revision: str | Sequence[str] | None = '9a4c6e1d3b58'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auth_event',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('client_ip', sa.String(length=45), nullable=True),
+    sa.Column('detail', sa.String(length=64), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at', name='pk_auth_event'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_auth_event_username_occurred_at', 'auth_event', ['username', 'occurred_at'], unique=False, postgresql_include=['kind', 'client_ip', 'detail'])
+    # Monthly partitions are created by the application on startup.
+    op.execute('CREATE TABLE auth_event_default PARTITION OF auth_event DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auth_event_username_occurred_at', table_name='auth_event', postgresql_include=['kind', 'client_ip', 'detail'])
+    op.drop_table('auth_event')
@@ -0,0 +1,98 @@
+"""add per-user task counters maintained by triggers
+
+Revision ID: e5a7c2d9f013
+Revises: d17b3f5a9c24
+Create Date: 2026-10-18 21:12:37.904215
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c2d9f013'
+down_revision: str | Sequence[str] | None = 'd17b3f5a9c24'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+APPLY_DELTAS = """
+    INSERT INTO task_stats AS s (owner_id, open, in_progress, done)
+    SELECT d.owner_id,
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'open'), 0),
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'in_progress'), 0),
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'done'), 0)
+    FROM ({rows}) AS d
+    GROUP BY d.owner_id
+    HAVING bool_or(d.delta <> 0) AND EXISTS (SELECT FROM "user" u WHERE u.id = d.owner_id)
+    ON CONFLICT (owner_id) DO UPDATE SET
+        open = s.open + excluded.open,
+        in_progress = s.in_progress + excluded.in_progress,
+        done = s.done + excluded.done;
+"""
+NEW_ROWS = 'SELECT owner_id, status, 1 AS delta FROM new_rows'
+OLD_ROWS = 'SELECT owner_id, status, -1 AS delta FROM old_rows'
+UPDATED_ROWS = (
+    'SELECT owner_id, status, sum(delta) AS delta FROM '
+    f'({NEW_ROWS} UNION ALL {OLD_ROWS}) AS changed GROUP BY owner_id, status'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_stats',
+    sa.Column('owner_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('open', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('in_progress', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('done', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    op.execute(f"""
+CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {APPLY_DELTAS.format(rows=NEW_ROWS)}
+    ELSIF TG_OP = 'UPDATE' THEN
+        {APPLY_DELTAS.format(rows=UPDATED_ROWS)}
+    ELSE
+        {APPLY_DELTAS.format(rows=OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END
+$$
+""")
+    # Writes wait until the counters are backfilled, so none is counted twice or missed.
+    op.execute('LOCK TABLE task IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(
+        'CREATE TRIGGER task_stats_insert AFTER INSERT ON task REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()'
+    )
+    op.execute(
+        'CREATE TRIGGER task_stats_update AFTER UPDATE ON task REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()'
+    )
+    op.execute(
+        'CREATE TRIGGER task_stats_delete AFTER DELETE ON task REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()'
+    )
+    op.execute("""
+        INSERT INTO task_stats (owner_id, open, in_progress, done)
+        SELECT owner_id,
+               count(*) FILTER (WHERE status = 'open'),
+               count(*) FILTER (WHERE status = 'in_progress'),
+               count(*) FILTER (WHERE status = 'done')
+        FROM task
+        GROUP BY owner_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS task_stats_delete ON task')
+    op.execute('DROP TRIGGER IF EXISTS task_stats_update ON task')
+    op.execute('DROP TRIGGER IF EXISTS task_stats_insert ON task')
+    op.execute('DROP FUNCTION IF EXISTS task_stats_apply()')
+    op.drop_table('task_stats')
@@ -0,0 +1,6 @@
+"""Benchmarks for the ToDoList API.
+
+Run a benchmark module directly, for example ``python -m benchmarks.bench_me``.
+``python -m benchmarks.suite`` load-tests the auth endpoints and can compare
+its JSON results with an earlier run.
+"""
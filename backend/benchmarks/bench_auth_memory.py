@@ -0,0 +1,141 @@
+"""Memory of the auth path: ORM users vs. column records, and the per-route profile.
+
+Prints three reports:
+
+* the memory one loaded user holds, as a transient ORM ``User`` and as a
+  :class:`UserRecord`;
+* per lookup by username, the peak of traced memory and the time, loading
+  the ORM entity (the original ``select(User)``) vs. the column-only
+  :data:`USER_BY_USERNAME`. Each lookup opens its own session, as a request
+  does. The table lives in in-memory SQLite, so this isolates the ORM's
+  share; driver and network buffers come on top of both;
+* the allocation profile of ``register``, ``login`` and ``me`` through the
+  application, with users kept by the stand-in database
+  (:mod:`benchmarks.standin`) and measured by
+  :class:`AllocationProfilerMiddleware`, as ``/api/allocations`` shows it.
+
+tracemalloc runs throughout, so timings are slower than untraced ones and
+only comparable with each other.
+
+Usage:
+    python -m benchmarks.bench_auth_memory --lookups 5000 --requests 200
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine, bindparam, create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from benchmarks.standin import PASSWORD, account_name, standin_database
+from src.auth.hashing import password_hasher
+from src.main import app
+from src.models import User
+from src.utils.allocations import AllocationProfiler, AllocationProfilerMiddleware
+from src.utils.database import USER_BY_USERNAME
+from src.utils.rate_limit import rate_limiter
+from src.utils.user_cache import UserRecord
+
+ENTRIES = 10_000
+USERS = 1000
+ORM_USER_BY_USERNAME = select(User).where(User.username == bindparam('username'))
+
+
+def cached_entry_bytes(build: Callable[[int], object]) -> float:
+    """Return the traced bytes one object built by ``build`` keeps alive."""
+    start, _ = tracemalloc.get_traced_memory()
+    entries = [build(i) for i in range(ENTRIES)]
+    held, _ = tracemalloc.get_traced_memory()
+    del entries
+    return (held - start - 8 * ENTRIES) / ENTRIES  # minus the list's own pointers
+
+
+def lookups(engine: Engine, count: int, lookup: Callable[[Session, str], object]) -> tuple[float, float]:
+    """Run ``count`` lookups across the users; return the mean peak traced KiB and microseconds per lookup."""
+    peak_total = 0
+    started = time.perf_counter()
+    for i in range(count):
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        with Session(engine) as db:
+            assert lookup(db, f'user_{i % USERS}') is not None
+            _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - start
+    return peak_total / count / 1024, (time.perf_counter() - started) / count * 1_000_000
+
+
+def orm_lookup(db: Session, username: str) -> User | None:
+    """Load the user the way the original ``get_user_by_username`` did."""
+    return db.execute(ORM_USER_BY_USERNAME, {'username': username}).scalar_one_or_none()
+
+
+def record_lookup(db: Session, username: str) -> UserRecord | None:
+    """Load the user the way ``get_user_by_username`` does."""
+    row = db.execute(USER_BY_USERNAME, {'username': username}).one_or_none()
+    return UserRecord(*row) if row is not None else None
+
+
+async def route_profile(requests: int) -> str:
+    """Serve ``requests`` registrations, logins and ``me`` calls and return the profiler's report."""
+    profiler = AllocationProfiler(sample_every=requests)
+    transport = ASGITransport(app=AllocationProfilerMiddleware(app, profiler))
+    rate_limiter.enabled = False
+    password_hasher.start()
+    try:
+        with standin_database(app) as users:
+            users.seed_accounts()
+            async with AsyncClient(transport=transport, base_url='http://bench') as client:
+                login = {'username': account_name(0), 'password': PASSWORD}
+                token = (await client.post('/api/auth/login', json=login)).json()['access_token']
+                profiler.reset()
+                for i in range(requests):
+                    name = f'mem_{i}'
+                    body = {'username': name, 'password': PASSWORD, 'confirm_password': PASSWORD}
+                    (await client.post('/api/auth/register', json=body)).raise_for_status()
+                    (await client.post('/api/auth/login', json=login)).raise_for_status()
+                    headers = {'Authorization': f'Bearer {token}'}
+                    (await client.get('/api/auth/me', headers=headers)).raise_for_status()
+    finally:
+        password_hasher.shutdown()
+    return profiler.report()
+
+
+def main(count: int, requests: int) -> None:
+    """Print the three reports."""
+    tracemalloc.start()
+
+    user_id = uuid.uuid4()
+    orm = cached_entry_bytes(lambda i: User(id=user_id, username=f'user_{i}', password='x' * 60))
+    record = cached_entry_bytes(lambda i: UserRecord(user_id, f'user_{i}', 'x' * 60))
+    print('memory per loaded user')
+    print(f'  {"ORM User":<22} {orm:10.0f} B')
+    print(f'  {"UserRecord":<22} {record:10.0f} B')
+
+    engine = create_engine('sqlite://')
+    User.__table__.create(engine)
+    with Session(engine) as db:
+        db.execute(insert(User), [{'id': uuid.uuid4(), 'username': f'user_{i}', 'password': 'x'} for i in range(USERS)])
+        db.commit()
+    print(f'\nlookup by username, {count} lookups')
+    print(f'  {"strategy":<22} {"peak KiB":>10} {"us":>10}')
+    for name, lookup in (('select(User)', orm_lookup), ('column record', record_lookup)):
+        lookups(engine, 100, lookup)  # warm up the compiled cache
+        peak, micros = lookups(engine, count, lookup)
+        print(f'  {name:<22} {peak:>10.2f} {micros:>10.1f}')
+    engine.dispose()
+
+    print(f'\nper-route profile, {requests} requests each')
+    print(asyncio.run(route_profile(requests)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    main(args.lookups, args.requests)
@@ -0,0 +1,68 @@
+"""Throughput of ``/api/tasks/batch`` for batches of 1, 100 and 1000 operations.
+
+Each round creates ``size`` tasks, updates them and deletes them again, so
+every batch size processes the same mix. For comparison the same work is
+also sent as one request per task. Requests go through the ASGI app
+in-process against the database configured in ``DATABASE_URL``.
+
+Usage:
+    python -m benchmarks.bench_batch --operations 3000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app
+
+BATCH_SIZES = (1, 100, 1000)
+
+
+async def batched(client: AsyncClient, total: int, size: int) -> None:
+    """Create, update and delete ``total`` tasks in batches of ``size`` operations."""
+    ids = [str(uuid.uuid4()) for _ in range(total // 3)]
+    operations = (
+        [{'op': 'create', 'id': task_id, 'data': {'title': 'bench'}} for task_id in ids]
+        + [{'op': 'update', 'id': task_id, 'data': {'status': 'done'}} for task_id in ids]
+        + [{'op': 'delete', 'id': task_id} for task_id in ids]
+    )
+    for start in range(0, len(operations), size):
+        response = await client.post('/api/tasks/batch', json={'operations': operations[start : start + size]})
+        response.raise_for_status()
+
+
+async def one_by_one(client: AsyncClient, total: int) -> None:
+    """Do the same work with one request per operation."""
+    for _ in range(total // 3):
+        task_id = (await client.post('/api/tasks', json={'title': 'bench'})).json()['id']
+        await client.patch(f'/api/tasks/{task_id}', json={'status': 'done'})
+        await client.delete(f'/api/tasks/{task_id}')
+
+
+async def main(total: int) -> None:
+    """Register a throwaway user and time every variant."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://bench') as client:
+        username = f'bench_{uuid.uuid4().hex[:12]}'
+        response = await client.post(
+            '/api/auth/register', json={'username': username, 'password': 'bench', 'confirm_password': 'bench'}
+        )
+        response.raise_for_status()
+
+        started = time.perf_counter()
+        await one_by_one(client, total)
+        print(f'{"one request per op":<22} {total / (time.perf_counter() - started):10.1f} ops/s')
+
+        for size in BATCH_SIZES:
+            started = time.perf_counter()
+            await batched(client, total, size)
+            print(f'{f"batch of {size}":<22} {total / (time.perf_counter() - started):10.1f} ops/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--operations', type=int, default=3000)
+    args = parser.parse_args()
+    asyncio.run(main(args.operations))
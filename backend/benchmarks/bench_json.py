@@ -0,0 +1,115 @@
+"""Cost of turning a handler result into a JSON response body.
+
+Compares, for a small token payload and a page of tasks:
+
+* ``response_model``: what FastAPI does for a route with a response model,
+  validating the result against the model and dumping it with Pydantic.
+* ``stdlib``: ``jsonable_encoder`` followed by ``JSONResponse``, the path of
+  routes without a response model.
+* ``trusted (orjson)``: :func:`src.utils.responses.trusted_json`, which
+  skips the validation and renders with orjson. Only measured when orjson is
+  installed.
+* ``trusted (json)``: the same with the standard library fallback.
+
+Usage:
+    python -m benchmarks.bench_json --repeat 2000 --tasks 1000
+"""
+
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from src.auth.schemas import TokenResponse
+from src.models import TaskStatus
+from src.tasks.schemas import TaskResponse
+from src.utils import responses
+
+
+def small_payload() -> dict[str, Any]:
+    """Return a payload shaped like the response of ``/api/auth/login``."""
+    return {'access_token': 'a' * 220, 'refresh_token': 'r' * 260}
+
+
+def large_payload(tasks: int) -> list[dict[str, Any]]:
+    """Return ``tasks`` task dictionaries shaped like ``TaskResponse``."""
+    now = datetime.now(UTC)
+    return [
+        {
+            'id': uuid.uuid4(),
+            'title': f'Task {index}',
+            'description': 'Something that has to be done' if index % 2 else None,
+            'status': TaskStatus.OPEN,
+            'priority': index % 4,
+            'due_at': now if index % 3 else None,
+            'created_at': now,
+            'updated_at': now,
+            'version': 1,
+        }
+        for index in range(tasks)
+    ]
+
+
+def serializers(model: Any) -> dict[str, Callable[[Any], bytes]]:  # noqa: ANN401
+    """Build one body-rendering callable per strategy for payloads of ``model``."""
+    adapter = TypeAdapter(model)
+
+    def response_model(content: Any) -> bytes:  # noqa: ANN401
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    def stdlib(content: Any) -> bytes:  # noqa: ANN401
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def trusted(content: Any) -> bytes:  # noqa: ANN401
+        return responses.trusted_json(content).body
+
+    return {'response_model': response_model, 'stdlib': stdlib, 'trusted': trusted}
+
+
+def per_call_us(render: Callable[[Any], bytes], content: Any, repeat: int) -> float:  # noqa: ANN401
+    """Return the mean time of one ``render(content)`` call in microseconds."""
+    for _ in range(max(repeat // 10, 1)):
+        render(content)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(content)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main() -> None:
+    """Print the time per response body of every strategy and payload."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000, help='renders of the small payload')
+    parser.add_argument('--tasks', type=int, default=1000, help='tasks in the large payload')
+    args = parser.parse_args()
+
+    cases = [
+        ('small', TokenResponse, small_payload(), args.repeat),
+        (f'{args.tasks} tasks', list[TaskResponse], large_payload(args.tasks), max(args.repeat // 100, 5)),
+    ]
+    orjson = responses.orjson
+    encoders = {'json': None} if orjson is None else {'orjson': orjson, 'json': None}
+    print(f'encoders: {", ".join(encoders)}\n')
+    print(f'{"payload":<12} {"strategy":<18} {"us per body":>12} {"vs response_model":>17}')
+    for name, model, content, repeat in cases:
+        strategies = serializers(model)
+        trusted = strategies.pop('trusted')
+        timings = {strategy: per_call_us(render, content, repeat) for strategy, render in strategies.items()}
+        for encoder, module in encoders.items():
+            responses.orjson = module
+            try:
+                timings[f'trusted ({encoder})'] = per_call_us(trusted, content, repeat)
+            finally:
+                responses.orjson = orjson
+        for strategy, timing in timings.items():
+            print(f'{name:<12} {strategy:<18} {timing:>12.1f} {timings["response_model"] / timing:>16.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Requests per second of ``/api/auth/me`` with and without the verified-token cache.
+
+The "before" app reproduces the original handler: every request decodes the
+JWT through ``JwtAccessBearerCookie`` and validates the response through
+``ResponseUser``. The "after" app is the real application.
+
+Usage:
+    python -m benchmarks.bench_me --requests 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Annotated, Any
+
+from fastapi import FastAPI, Security
+from fastapi_jwt import JwtAuthorizationCredentials
+from httpx import ASGITransport, AsyncClient
+
+from src.auth.jwt_security import get_access_security
+from src.auth.schemas import ResponseUser
+from src.main import app
+
+
+def build_uncached_app() -> FastAPI:
+    """Build an app with the original, uncached ``/me`` handler."""
+    legacy = FastAPI()
+    access_security = get_access_security()
+
+    @legacy.get('/api/auth/me', response_model=ResponseUser)
+    async def me(credentials: Annotated[JwtAuthorizationCredentials, Security(access_security)]) -> dict[str, Any]:
+        return {'username': credentials.subject.get('username')}
+
+    return legacy
+
+
+async def run(target: FastAPI, token: str, requests: int, concurrency: int) -> float:
+    """Issue ``requests`` calls with ``concurrency`` clients and return requests per second."""
+    transport = ASGITransport(app=target)
+    headers = {'Authorization': f'Bearer {token}'}
+    per_worker = requests // concurrency
+
+    async with AsyncClient(transport=transport, base_url='http://bench', headers=headers) as client:
+
+        async def worker() -> None:
+            for _ in range(per_worker):
+                response = await client.get('/api/auth/me')
+                response.raise_for_status()
+
+        await worker()  # warm up caches and imports
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return per_worker * concurrency / elapsed
+
+
+def main() -> None:
+    """Run both variants and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    token = get_access_security().create_access_token(subject={'username': 'bench_user'})
+    before = asyncio.run(run(build_uncached_app(), token, args.requests, args.concurrency))
+    after = asyncio.run(run(app, token, args.requests, args.concurrency))
+
+    print(f'before (decode + ResponseUser): {before:10.1f} req/s')
+    print(f'after  (token cache, fast path): {after:10.1f} req/s')
+    print(f'speedup: {after / before:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Per-request overhead of the metrics middleware.
+
+Calls ``/api/healthcheck`` directly through the ASGI interface, without an
+HTTP client, so that the difference between the variants is the cost of the
+instrumentation itself. With ``METRICS_ENABLED`` unset the application has no
+middleware at all, which is the "off" baseline.
+
+Usage:
+    python -m benchmarks.bench_metrics --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.types import ASGIApp, Message
+
+from src.main import app
+from src.utils.instrumentation import MetricsMiddleware
+
+SCOPE = {
+    'type': 'http',
+    'asgi': {'version': '3.0'},
+    'http_version': '1.1',
+    'method': 'GET',
+    'scheme': 'http',
+    'path': '/api/healthcheck',
+    'raw_path': b'/api/healthcheck',
+    'root_path': '',
+    'query_string': b'',
+    'headers': [(b'host', b'bench')],
+    'client': ('127.0.0.1', 1234),
+    'server': ('bench', 80),
+}
+
+
+async def receive() -> Message:
+    """Return an empty request body."""
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(_: Message) -> None:
+    """Discard the response."""
+
+
+async def per_request_us(target: ASGIApp, requests: int) -> float:
+    """Return the mean time of one request in microseconds."""
+    for _ in range(requests // 10):
+        await target(dict(SCOPE), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await target(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    """Time the application without middleware, with metrics and with Server-Timing."""
+    variants = {
+        'off': app,
+        'metrics': MetricsMiddleware(app),
+        'metrics + Server-Timing': MetricsMiddleware(app, server_timing=True),
+    }
+    baseline = None
+    for name, target in variants.items():
+        micros = await per_request_us(target, requests)
+        baseline = micros if baseline is None else baseline
+        print(f'{name:<24} {micros:8.2f} us/request  ({micros - baseline:+.2f} us)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,117 @@
+"""Memory per idle server push connection.
+
+Starts the app under Uvicorn in a subprocess, opens ``--connections`` event
+streams to ``/api/tasks/events``, each for its own user with a freshly
+signed access token, and waits until every stream has received its initial
+event. The server's resident memory is read from ``/proc`` before and after,
+and the difference per connection is printed. The streams never touch the
+database, so none is needed; startup jobs that do will log warnings.
+Linux only. The open file limit is raised to fit the connections.
+
+Usage:
+    python -m benchmarks.bench_push --connections 10000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from src.auth.jwt_security import get_access_security
+
+OPEN_BATCH = 500
+FIRST_EVENT = b'{"version":null}'
+
+
+def rss_bytes(pid: int) -> int:
+    """Return the resident set size of a process."""
+    for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    raise RuntimeError(f'No VmRSS for process {pid}')
+
+
+def raise_file_limit(needed: int) -> None:
+    """Raise the soft open file limit, inherited by the server subprocess, as far as needed."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+async def wait_until_serving(host: str, port: int) -> None:
+    """Wait for the server to accept connections."""
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+
+async def open_stream(host: str, port: int, token: str) -> asyncio.StreamWriter:
+    """Open one event stream and wait for its first event."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f'GET /api/tasks/events HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {token}\r\n'
+        'Accept: text/event-stream\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    await reader.readuntil(FIRST_EVENT)
+    return writer
+
+
+async def main(connections: int, host: str, port: int) -> None:
+    """Start the server, hold the streams open and report the memory they cost."""
+    raise_file_limit(connections + 1024)
+    security = get_access_security()
+    tokens = [
+        security.create_access_token(subject={'id': str(user_id), 'username': f'push_{user_id.hex[:8]}'})
+        for user_id in (uuid.uuid4() for _ in range(connections))
+    ]
+
+    server = subprocess.Popen(  # noqa: ASYNC220
+        [sys.executable, '-m', 'uvicorn', 'src.main:app', '--host', host, '--port', str(port), '--log-level', 'error'],
+        env={**os.environ, 'METRICS_ENABLED': 'false'},
+    )
+    writers: list[asyncio.StreamWriter] = []
+    try:
+        await asyncio.wait_for(wait_until_serving(host, port), 30.0)
+        await asyncio.sleep(1.0)
+        baseline = rss_bytes(server.pid)
+
+        started = time.perf_counter()
+        for start in range(0, connections, OPEN_BATCH):
+            batch = tokens[start : start + OPEN_BATCH]
+            writers.extend(await asyncio.gather(*(open_stream(host, port, token) for token in batch)))
+        opened = time.perf_counter() - started
+        await asyncio.sleep(1.0)
+        loaded = rss_bytes(server.pid)
+
+        print(f'connections        {len(writers)}')
+        print(f'opened in          {opened:.1f} s')
+        print(f'server RSS before  {baseline / 2**20:.1f} MiB')
+        print(f'server RSS after   {loaded / 2**20:.1f} MiB')
+        print(f'per connection     {(loaded - baseline) / len(writers) / 1024:.1f} KiB')
+    finally:
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+        server.terminate()
+        await asyncio.to_thread(server.wait)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=10_000)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections, args.host, args.port))
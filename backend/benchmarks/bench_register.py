@@ -0,0 +1,81 @@
+"""Registration write paths: probe-then-insert vs. a single upsert, and bulk imports.
+
+Needs a reachable Postgres with the schema migrated. Rows created by the
+benchmark use a random username prefix and are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_register --users 2000 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.models import User
+from src.utils.database import create_user, create_users
+from src.utils.user_cache import user_cache
+
+
+async def probe_then_insert(db: AsyncSession, username: str, password_hash: str) -> User | None:
+    """Reproduce the original two-round-trip registration."""
+    result = await db.execute(select(User).where(User.username == username))
+    if result.scalar_one_or_none() is not None:
+        return None
+    stmt = insert(User).values(username=username, password=password_hash).on_conflict_do_nothing().returning(User)
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.scalar_one_or_none()
+
+
+async def timed(label: str, count: int, func: Callable[[], Awaitable[object]]) -> None:
+    """Run ``func`` once and print rows per second."""
+    started = time.perf_counter()
+    await func()
+    elapsed = time.perf_counter() - started
+    print(f'{label:<28} {count / elapsed:10.1f} rows/s  ({elapsed * 1000:8.1f} ms)')
+
+
+async def main(database_url: str, users: int) -> None:
+    """Run every variant against the same database."""
+    engine = create_async_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    prefix = f'bench_{uuid.uuid4().hex[:8]}'
+    user_cache.enabled = False
+
+    def names(variant: str) -> list[str]:
+        return [f'{prefix}_{variant}_{i}' for i in range(users)]
+
+    async def one_by_one(variant: str, func: Callable[[AsyncSession, str, str], Awaitable[object]]) -> None:
+        async with sessions() as db:
+            for username in names(variant):
+                await func(db, username, 'hash')
+
+    async def bulk(variant: str, use_copy: bool) -> None:
+        async with sessions() as db:
+            await create_users(db, [(username, 'hash') for username in names(variant)], use_copy=use_copy)
+
+    try:
+        await timed('probe then insert', users, lambda: one_by_one('probe', probe_then_insert))
+        await timed('single upsert', users, lambda: one_by_one('upsert', create_user))
+        await timed('create_users (executemany)', users, lambda: bulk('many', False))
+        await timed('create_users (COPY)', users, lambda: bulk('copy', True))
+    finally:
+        async with sessions() as db:
+            await db.execute(delete(User).where(User.username.startswith(prefix)))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--database-url', default=settings.database_url)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.users))
@@ -0,0 +1,118 @@
+"""Task search latency: prefix full-text search and trigram fallback vs. ILIKE.
+
+Seeds ``--users`` users sharing ``--tasks`` tasks (loaded with COPY in
+batches), then runs ``--queries`` searches for random users and prints
+p50/p99 latency of each strategy. Needs a reachable, migrated Postgres; the
+seeded users and their tasks are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_search --tasks 3000000 --users 1000 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import delete, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.models import Task, User
+from src.utils.tasks import search_tasks
+
+PAGE_SIZE = 20
+COPY_BATCH = 100_000
+VOCABULARY = """
+buy milk bread call mom report invoice meeting doctor dentist gym run book flight hotel pay rent
+clean kitchen garage fix bike review pull request deploy release plan sprint write blog post email
+groceries birthday gift renew passport insurance car service taxes budget backup laptop
+"""
+WORDS = VOCABULARY.split()
+
+
+def phrase(words: int) -> str:
+    """Return a random phrase made of ``words`` words."""
+    return ' '.join(random.choices(WORDS, k=words))
+
+
+async def seed(db: AsyncSession, users: int, tasks: int) -> list[uuid.UUID]:
+    """Create ``users`` users with ``tasks`` tasks between them and return their ids."""
+    owner_ids = [uuid.uuid4() for _ in range(users)]
+    await db.execute(insert(User), [{'id': i, 'username': f'bench_{i.hex[:16]}', 'password': 'x'} for i in owner_ids])
+    await db.commit()
+
+    connection = await db.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    for start in range(0, tasks, COPY_BATCH):
+        records = [
+            (uuid.uuid4(), random.choice(owner_ids), phrase(3), phrase(12) if i % 3 else None)
+            for i in range(start, min(start + COPY_BATCH, tasks))
+        ]
+        await driver.copy_records_to_table('task', records=records, columns=['id', 'owner_id', 'title', 'description'])
+    await db.commit()
+    await db.execute(text('ANALYZE task'))
+    return owner_ids
+
+
+async def percentiles(queries: int, search: Callable[[], Awaitable[object]]) -> tuple[float, float]:
+    """Run ``search`` ``queries`` times and return the p50 and p99 latency in milliseconds."""
+    samples = []
+    for _ in range(queries):
+        started = time.perf_counter()
+        await search()
+        samples.append((time.perf_counter() - started) * 1000)
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49], cuts[98]
+
+
+async def main(database_url: str, users: int, tasks: int, queries: int) -> None:
+    """Seed the table and compare the search strategies."""
+    engine = create_async_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as db:
+        owner_ids = await seed(db, users, tasks)
+
+        async def prefix() -> None:
+            word = random.choice(WORDS)
+            await search_tasks(db, random.choice(owner_ids), word[: max(3, len(word) - 2)], PAGE_SIZE)
+
+        async def typo() -> None:
+            word = random.choice([word for word in WORDS if len(word) > 6])  # noqa: PLR2004
+            await search_tasks(db, random.choice(owner_ids), word[:-2] + word[-1] + word[-2], PAGE_SIZE)
+
+        async def ilike() -> None:
+            pattern = f'%{random.choice(WORDS)[:3]}%'
+            await db.execute(
+                select(Task)
+                .where(
+                    Task.owner_id == random.choice(owner_ids),
+                    or_(Task.title.ilike(pattern), Task.description.ilike(pattern)),
+                )
+                .limit(PAGE_SIZE)
+            )
+
+        try:
+            print(f'{"strategy":<22} {"p50 ms":>10} {"p99 ms":>10}')
+            for name, search in (('prefix full-text', prefix), ('trigram fallback', typo), ('ILIKE %q%', ilike)):
+                p50, p99 = await percentiles(queries, search)
+                print(f'{name:<22} {p50:>10.2f} {p99:>10.2f}')
+        finally:
+            await db.execute(delete(User).where(User.id.in_(owner_ids)))
+            await db.commit()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=3_000_000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--database-url', default=settings.database_url)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.users, args.tasks, args.queries))
@@ -0,0 +1,136 @@
+"""Cold start profile of ``src.main``: import-time breakdown and startup phases.
+
+Every measurement runs in a fresh interpreter, like a newly started worker.
+The profile comes from ``python -X importtime`` and lists the modules with
+the largest cumulative import time and the self time per top-level package.
+The phases are importing the app, building the OpenAPI schema (done on the
+first ``/api/openapi.json`` request) and whether the database driver was
+loaded at import time, which it should not be since the engine is created
+in the lifespan.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5 --top 25
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+PHASES_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from src.main import app
+imported = time.perf_counter()
+app.openapi()
+built = time.perf_counter()
+print(json.dumps({
+    'import_seconds': imported - started,
+    'openapi_seconds': built - imported,
+    'driver_loaded': 'asyncpg' in sys.modules,
+    'modules': len(sys.modules),
+}))
+"""
+
+
+class ImportRecord(NamedTuple):
+    """One line of ``-X importtime`` output, times in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parse the stderr of ``python -X importtime``.
+
+    Args:
+        output (str): The captured stderr.
+
+    Returns:
+        list[ImportRecord]: One record per imported module, in output order.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def by_package(records: list[ImportRecord]) -> dict[str, int]:
+    """Sum self time per top-level package, largest first.
+
+    Args:
+        records (list[ImportRecord]): Parsed import records.
+
+    Returns:
+        dict[str, int]: Microseconds of self time by package name.
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.module.split('.')[0]] += record.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def import_profile(module: str = 'src.main') -> list[ImportRecord]:
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and parse the result.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        list[ImportRecord]: One record per imported module.
+    """
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return parse_importtime(completed.stderr)
+
+
+def measure_startup() -> dict[str, float | bool | int]:
+    """Import the app and build its OpenAPI schema in a fresh interpreter.
+
+    Returns:
+        dict[str, float | bool | int]: Seconds per phase, whether the driver was loaded and the module count.
+    """
+    completed = subprocess.run([sys.executable, '-c', PHASES_SCRIPT], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """Print the import profile and the median of every startup phase."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=25, help='number of modules and packages to list')
+    args = parser.parse_args()
+
+    records = import_profile()
+    total = max(record.cumulative_us for record in records if record.depth == 0 and record.module == 'src.main')
+    print(f'import src.main: {total / 1000:.1f} ms cumulative, {len(records)} modules\n')
+
+    print(f'{"module":<56} {"cumulative ms":>14} {"self ms":>9}')
+    for record in sorted(records, key=lambda record: record.cumulative_us, reverse=True)[: args.top]:
+        indented = '  ' * record.depth + record.module
+        print(f'{indented:<56} {record.cumulative_us / 1000:>14.1f} {record.self_us / 1000:>9.1f}')
+
+    print(f'\n{"package":<32} {"self ms":>9} {"share":>7}')
+    overall = sum(record.self_us for record in records)
+    for package, self_us in list(by_package(records).items())[: args.top]:
+        print(f'{package:<32} {self_us / 1000:>9.1f} {self_us / overall:>7.1%}')
+
+    runs = [measure_startup() for _ in range(args.repeat)]
+    print(f'\nmedian of {args.repeat} fresh interpreters:')
+    for phase in ('import_seconds', 'openapi_seconds'):
+        print(f'  {phase:<18} {statistics.median(run[phase] for run in runs) * 1000:8.1f} ms')
+    print(f'  {"driver loaded":<18} {runs[-1]["driver_loaded"]}')
+
+
+if __name__ == '__main__':
+    main()
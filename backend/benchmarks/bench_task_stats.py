@@ -0,0 +1,102 @@
+"""Dashboard counts: trigger-maintained counters vs. aggregating the tasks on every request.
+
+Seeds ``--users`` users sharing ``--tasks`` tasks (loaded with COPY in
+batches, which also fills the counters through the triggers), then reads the
+dashboard of ``--queries`` random users both ways and prints p50/p99 latency.
+It also times the COPY of the tasks, which includes the counter updates, and
+one full repair pass over all users. Needs a reachable, migrated Postgres;
+the seeded users and their tasks are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_task_stats --tasks 1000000 --users 100 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.bench_search import COPY_BATCH, percentiles
+from src.config import settings
+from src.models import Task, TaskStatus, User
+from src.utils.tasks import NOT_DONE, get_task_stats, repair_task_stats
+
+STATUSES = list(TaskStatus)
+
+
+async def seed(db: AsyncSession, users: int, tasks: int) -> tuple[list[uuid.UUID], float]:
+    """Create ``users`` users with ``tasks`` tasks between them; return their ids and the COPY time in seconds."""
+    owner_ids = [uuid.uuid4() for _ in range(users)]
+    await db.execute(insert(User), [{'id': i, 'username': f'bench_{i.hex[:16]}', 'password': 'x'} for i in owner_ids])
+    await db.commit()
+
+    now = datetime.now(UTC)
+    connection = await db.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    started = time.perf_counter()
+    for start in range(0, tasks, COPY_BATCH):
+        records = [
+            (
+                uuid.uuid4(),
+                random.choice(owner_ids),
+                f'task {i}',
+                random.choice(STATUSES).value,
+                now + timedelta(days=random.randint(-30, 60)) if i % 2 else None,
+            )
+            for i in range(start, min(start + COPY_BATCH, tasks))
+        ]
+        await driver.copy_records_to_table(
+            'task', records=records, columns=['id', 'owner_id', 'title', 'status', 'due_at']
+        )
+    await db.commit()
+    elapsed = time.perf_counter() - started
+    await db.execute(text('ANALYZE task'))
+    return owner_ids, elapsed
+
+
+async def main(database_url: str, users: int, tasks: int, queries: int) -> None:
+    """Seed the table and compare the two ways of counting."""
+    engine = create_async_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as db:
+        owner_ids, copy_seconds = await seed(db, users, tasks)
+
+        async def counters() -> None:
+            await get_task_stats(db, random.choice(owner_ids))
+
+        async def aggregate() -> None:
+            owner_id = random.choice(owner_ids)
+            await db.execute(select(Task.status, func.count()).where(Task.owner_id == owner_id).group_by(Task.status))
+            await db.execute(select(func.count()).where(Task.owner_id == owner_id, NOT_DONE, Task.due_at < func.now()))
+
+        try:
+            print(f'seeded {tasks} tasks in {copy_seconds:.1f} s, counters included')
+            print(f'{"strategy":<22} {"p50 ms":>10} {"p99 ms":>10}')
+            for name, read in (('counters', counters), ('GROUP BY status', aggregate)):
+                p50, p99 = await percentiles(queries, read)
+                print(f'{name:<22} {p50:>10.2f} {p99:>10.2f}')
+
+            started = time.perf_counter()
+            corrected = await repair_task_stats(db, settings.task_stats_repair_batch)
+            print(f'repair pass: {time.perf_counter() - started:.2f} s, {corrected} users corrected')
+        finally:
+            await db.execute(delete(User).where(User.id.in_(owner_ids)))
+            await db.commit()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--database-url', default=settings.database_url)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.users, args.tasks, args.queries))
@@ -0,0 +1,107 @@
+"""Task listing: keyset pagination vs. OFFSET at increasing page depth.
+
+Seeds one user with ``--tasks`` tasks (loaded with COPY), then times fetching a
+page at several depths both ways. Needs a reachable, migrated Postgres; the
+seeded user and its tasks are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_tasks --tasks 100000 --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.models import Task, User
+from src.utils.tasks import NOT_DONE, list_tasks
+
+PAGE_SIZE = 50
+REPEATS = 20
+
+
+async def seed(db: AsyncSession, count: int) -> uuid.UUID:
+    """Create a user with ``count`` tasks and return its id."""
+    owner_id = uuid.uuid4()
+    db.add(User(id=owner_id, username=f'bench_{owner_id.hex[:12]}', password='x'))
+    await db.commit()
+
+    connection = await db.connection()
+    driver = (await connection.get_raw_connection()).driver_connection
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    statuses = ('open', 'in_progress', 'done')
+    records = [
+        (
+            uuid.uuid4(),
+            owner_id,
+            f'task {i}',
+            random.choice(statuses),
+            random.randint(0, 3),
+            start + timedelta(minutes=random.randint(0, 525_600)) if i % 10 else None,
+        )
+        for i in range(count)
+    ]
+    await driver.copy_records_to_table(
+        'task', records=records, columns=['id', 'owner_id', 'title', 'status', 'priority', 'due_at']
+    )
+    await db.commit()
+    await db.execute(text('ANALYZE task'))
+    return owner_id
+
+
+async def time_ms(func: Callable[[], Awaitable[None]]) -> float:
+    """Return the median duration of ``REPEATS`` awaited calls in milliseconds."""
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main(database_url: str, count: int) -> None:
+    """Seed the table and compare both pagination strategies."""
+    engine = create_async_engine(database_url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as db:
+        owner_id = await seed(db, count)
+        base = select(Task).where(Task.owner_id == owner_id, NOT_DONE).order_by(Task.due_at, Task.id)
+
+        try:
+            print(f'{"depth":>10} {"offset ms":>12} {"keyset ms":>12}')
+            depth = PAGE_SIZE
+            while depth < count * 0.6:
+                position = (await db.execute(base.with_only_columns(Task.due_at, Task.id).offset(depth - 1))).first()
+                if position is None:
+                    break
+
+                async def by_offset(depth: int = depth) -> None:
+                    await db.execute(base.offset(depth).limit(PAGE_SIZE))
+
+                async def by_keyset(position: tuple = tuple(position)) -> None:
+                    await list_tasks(db, owner_id, PAGE_SIZE, after=position)
+
+                print(f'{depth:>10} {await time_ms(by_offset):>12.2f} {await time_ms(by_keyset):>12.2f}')
+                depth *= 10
+        finally:
+            await db.execute(delete(User).where(User.id == owner_id))
+            await db.commit()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--database-url', default=settings.database_url)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.tasks))
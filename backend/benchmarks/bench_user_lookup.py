@@ -0,0 +1,96 @@
+"""CPU per user lookup: rebuilt statements vs. statements built once.
+
+The "rebuilt" variant reproduces the original ``get_user_by_username``, which
+builds ``select(User).where(...)`` on every call. The "cached" variant
+executes the module-level :data:`USER_BY_USERNAME` with a bound parameter.
+Both run with asyncpg's prepared statement cache on and off (the PgBouncer
+setting). CPU time is process time of the benchmark, so database work
+in the server process is excluded.
+
+With ``--offline`` only the SQLAlchemy side is measured (statement
+construction and cache key generation), which needs no database.
+
+Usage:
+    python -m benchmarks.bench_user_lookup --lookups 20000 --database-url postgresql+asyncpg://...
+    python -m benchmarks.bench_user_lookup --offline
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.database import engine_options
+from src.models import User
+from src.utils.database import USER_BY_USERNAME
+
+
+def offline(lookups: int) -> None:
+    """Print the CPU cost of preparing a statement for execution without a database."""
+    started = time.process_time()
+    for i in range(lookups):
+        select(User).where(User.username == f'user_{i}')._generate_cache_key()
+    rebuilt = (time.process_time() - started) / lookups * 1_000_000
+
+    started = time.process_time()
+    for _ in range(lookups):
+        USER_BY_USERNAME._generate_cache_key()
+    cached = (time.process_time() - started) / lookups * 1_000_000
+
+    print(f'{"rebuilt (build + cache key)":<32} {rebuilt:8.2f} us CPU')
+    print(f'{"cached (cache key)":<32} {cached:8.2f} us CPU')
+
+
+async def cpu_per_lookup(db: AsyncSession, lookups: int, lookup: Callable[[AsyncSession], Awaitable[object]]) -> float:
+    """Return the mean process CPU time of one lookup in microseconds."""
+    for _ in range(100):
+        await lookup(db)
+    started = time.process_time()
+    for _ in range(lookups):
+        await lookup(db)
+    return (time.process_time() - started) / lookups * 1_000_000
+
+
+async def main(database_url: str, lookups: int) -> None:
+    """Create a user and time every lookup variant against it."""
+    username = f'bench_{uuid.uuid4().hex[:12]}'
+
+    async def rebuilt(db: AsyncSession) -> None:
+        (await db.execute(select(User).where(User.username == username))).scalar_one()
+
+    async def cached(db: AsyncSession) -> None:
+        (await db.execute(USER_BY_USERNAME, {'username': username})).scalar_one()
+
+    for pgbouncer in (False, True):
+        config = settings.model_copy(update={'database_url': database_url, 'db_pgbouncer': pgbouncer})
+        engine = create_async_engine(database_url, **engine_options(config))
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            if not pgbouncer:
+                db.add(User(username=username, password='x'))
+                await db.commit()
+            label = 'no statement cache' if pgbouncer else 'statement cache'
+            for name, lookup in (('rebuilt', rebuilt), ('cached', cached)):
+                micros = await cpu_per_lookup(db, lookups, lookup)
+                print(f'{f"{name}, {label}":<32} {micros:8.2f} us CPU')
+            if pgbouncer:
+                await db.execute(delete(User).where(User.username == username))
+                await db.commit()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=20_000)
+    parser.add_argument('--offline', action='store_true')
+    parser.add_argument('--database-url', default=settings.database_url)
+    args = parser.parse_args()
+    if args.offline:
+        offline(args.lookups)
+    else:
+        asyncio.run(main(args.database_url, args.lookups))
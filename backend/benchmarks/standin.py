@@ -0,0 +1,103 @@
+"""In-memory stand-in for the user table, for benchmarking without Postgres.
+
+The stand-in replaces the database helpers used by the auth router with
+dict-backed versions, so the auth endpoints exercise routing, validation,
+password hashing and JWT handling with no database round trips. Numbers
+measured with it are an upper bound for the application layer, not a
+substitute for runs against a real database.
+
+Every Uvicorn worker has its own stand-in, so the fixed benchmark accounts
+are created up front in each of them; otherwise a login could reach a worker
+that never saw the registration.
+"""
+
+import uuid
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.security import hash_password
+from src.database import get_db, get_read_db
+from src.main import app
+from src.utils.user_cache import UserRecord
+
+ACCOUNTS = 16
+PASSWORD = 'bench-password'
+
+
+def account_name(number: int) -> str:
+    """Return the username of fixed benchmark account ``number``."""
+    return f'bench_account_{number}'
+
+
+class StandInUsers:
+    """Dict-backed replacements for the user helpers of :mod:`src.utils.database`."""
+
+    def __init__(self) -> None:
+        """Start with no users."""
+        self.users: dict[str, UserRecord] = {}
+
+    def seed_accounts(self) -> None:
+        """Create the fixed benchmark accounts, all with :data:`PASSWORD`."""
+        password_hash = hash_password(PASSWORD)
+        for number in range(ACCOUNTS):
+            name = account_name(number)
+            self.users[name] = UserRecord(uuid.uuid4(), name, password_hash)
+
+    async def get_user_by_username(self, _: AsyncSession | None, username: str) -> UserRecord | None:
+        """Return the user with ``username``, if any."""
+        return self.users.get(username)
+
+    async def is_known_username(self, username: str) -> bool:
+        """Report whether ``username`` is taken."""
+        return username in self.users
+
+    async def create_user(self, _: AsyncSession | None, username: str, password_hash: str) -> UserRecord | None:
+        """Add a user unless the username is taken."""
+        if username in self.users:
+            return None
+        user = UserRecord(uuid.uuid4(), username, password_hash)
+        self.users[username] = user
+        return user
+
+    async def update_user_password(self, _: AsyncSession | None, user: UserRecord, password_hash: str) -> None:
+        """Replace the stored password hash of ``user``."""
+        self.users[user.username].password = password_hash
+
+
+async def _no_db() -> AsyncGenerator[None, None]:
+    yield None
+
+
+@contextmanager
+def standin_database(target: FastAPI = app) -> Iterator[StandInUsers]:
+    """Serve the auth endpoints of ``target`` from a :class:`StandInUsers` while the context is active.
+
+    Args:
+        target (FastAPI): The application whose ``get_db`` and ``get_read_db`` dependencies are overridden.
+
+    Yields:
+        StandInUsers: The in-memory user store.
+    """
+    users = StandInUsers()
+    helpers = ('get_user_by_username', 'is_known_username', 'create_user', 'update_user_password')
+    with mock.patch.multiple('src.auth.router', **{name: getattr(users, name) for name in helpers}):
+        target.dependency_overrides[get_db] = _no_db
+        target.dependency_overrides[get_read_db] = _no_db
+        try:
+            yield users
+        finally:
+            target.dependency_overrides.pop(get_db, None)
+            target.dependency_overrides.pop(get_read_db, None)
+
+
+_factory_stack = ExitStack()
+
+
+def create_standin_app() -> FastAPI:
+    """Return the application wired to a stand-in database, for ``uvicorn --factory``."""
+    _factory_stack.enter_context(standin_database()).seed_accounts()
+    return app
@@ -0,0 +1,315 @@
+"""Load test of the auth endpoints and ``/api/healthcheck``.
+
+Every endpoint is hit with ``--requests`` requests from ``--concurrency``
+concurrent clients, and throughput plus p50/p95/p99 latency are reported.
+The app runs either in-process through ``httpx.ASGITransport`` (``--mode
+asgi``) or as a real Uvicorn process with ``--workers`` workers (``--mode
+uvicorn``). With ``--standin`` users live in memory (see
+:mod:`benchmarks.standin`); otherwise the database in ``DATABASE_URL`` is used
+and the benchmark users are left behind (fixed ``bench_account_*`` accounts
+plus one per ``register`` request under a random prefix).
+
+The auth rate limits are turned off, since every request comes from the same
+client address.
+
+Results can be written as JSON with ``--output`` and compared with an
+earlier run with ``--compare``. The exit status is 1 if throughput dropped or
+p99 latency grew by more than ``--tolerance``.
+
+Usage:
+    python -m benchmarks.suite --mode asgi --standin --output before.json
+    python -m benchmarks.suite --mode uvicorn --workers 4 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient, Limits, Response, TransportError
+
+from benchmarks.standin import ACCOUNTS, PASSWORD, account_name, standin_database
+from src.main import app
+from src.utils.rate_limit import rate_limiter
+
+ENDPOINTS = ('healthcheck', 'register', 'login', 'me')
+STARTUP_TIMEOUT = 30.0
+
+Request = Callable[[AsyncClient, int], Awaitable[Response]]
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted ``samples``.
+
+    Args:
+        samples (Sequence[float]): Samples in ascending order.
+        fraction (float): The percentile as a fraction, for example 0.99.
+
+    Returns:
+        float: The sample at that rank, or 0.0 without samples.
+    """
+    if not samples:
+        return 0.0
+    rank = max(1, round(fraction * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    """Summarize one endpoint run.
+
+    Args:
+        latencies (list[float]): Latency of every request in milliseconds.
+        errors (int): Number of failed requests.
+        elapsed (float): Wall time of the run in seconds.
+
+    Returns:
+        dict[str, float]: Request and error counts, throughput and latency percentiles.
+    """
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+async def load(client: AsyncClient, request: Request, requests: int, concurrency: int) -> dict[str, float]:
+    """Send ``requests`` requests from ``concurrency`` concurrent clients.
+
+    Args:
+        client (AsyncClient): The client connected to the app.
+        request (Request): Sends the request with the given sequence number.
+        requests (int): Total number of requests.
+        concurrency (int): Number of requests in flight at once.
+
+    Returns:
+        dict[str, float]: See :func:`summarize`.
+    """
+    sequence = iter(range(requests))
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for number in sequence:
+            started = time.perf_counter()
+            try:
+                response = await request(client, number)
+                failed = response.is_error
+            except TransportError:
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def prepare_requests(client: AsyncClient) -> dict[str, Request]:
+    """Make sure the accounts used by ``login`` and ``me`` exist and build one request factory per endpoint.
+
+    The accounts have fixed names, so they are registered on the first run
+    against a database and only logged into afterwards.
+
+    Args:
+        client (AsyncClient): The client connected to the app.
+
+    Returns:
+        dict[str, Request]: Request factories by endpoint name.
+    """
+    prefix = f'bench_{uuid.uuid4().hex[:8]}'
+    accounts = [{'username': account_name(number), 'password': PASSWORD} for number in range(ACCOUNTS)]
+    tokens = []
+    for account in accounts:
+        await client.post('/api/auth/register', json={**account, 'confirm_password': PASSWORD})
+        response = await client.post('/api/auth/login', json=account)
+        response.raise_for_status()
+        tokens.append(response.json()['access_token'])
+    client.cookies.clear()
+
+    def healthcheck(client: AsyncClient, _: int) -> Awaitable[Response]:
+        return client.get('/api/healthcheck')
+
+    def register(client: AsyncClient, number: int) -> Awaitable[Response]:
+        username = f'{prefix}_new_{number}'
+        body = {'username': username, 'password': PASSWORD, 'confirm_password': PASSWORD}
+        return client.post('/api/auth/register', json=body)
+
+    def login(client: AsyncClient, number: int) -> Awaitable[Response]:
+        return client.post('/api/auth/login', json=accounts[number % ACCOUNTS])
+
+    def me(client: AsyncClient, number: int) -> Awaitable[Response]:
+        return client.get('/api/auth/me', headers={'Authorization': f'Bearer {tokens[number % ACCOUNTS]}'})
+
+    return {'healthcheck': healthcheck, 'register': register, 'login': login, 'me': me}
+
+
+async def run_endpoints(
+    client: AsyncClient, endpoints: Sequence[str], requests: int, concurrency: int
+) -> dict[str, dict[str, float]]:
+    """Load-test each endpoint in turn.
+
+    Args:
+        client (AsyncClient): The client connected to the app.
+        endpoints (Sequence[str]): Names from :data:`ENDPOINTS`.
+        requests (int): Requests per endpoint.
+        concurrency (int): Requests in flight at once.
+
+    Returns:
+        dict[str, dict[str, float]]: Summary per endpoint.
+    """
+    factories = await prepare_requests(client)
+    results = {}
+    for endpoint in endpoints:
+        results[endpoint] = await load(client, factories[endpoint], requests, concurrency)
+        client.cookies.clear()
+    return results
+
+
+def free_port() -> int:
+    """Return a TCP port that is free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def asgi_client(standin: bool) -> AsyncIterator[AsyncClient]:
+    """Yield a client that calls the app in-process, with its lifespan running."""
+    async with AsyncExitStack() as stack:
+        if standin:
+            stack.enter_context(standin_database(app))
+        rate_limiter.enabled = False
+        await stack.enter_async_context(app.router.lifespan_context(app))
+        yield await stack.enter_async_context(AsyncClient(transport=ASGITransport(app=app), base_url='http://bench'))
+
+
+@asynccontextmanager
+async def uvicorn_client(standin: bool, workers: int, concurrency: int) -> AsyncIterator[AsyncClient]:
+    """Start Uvicorn with ``workers`` workers and yield a client connected to it over TCP."""
+    port = free_port()
+    target = ['--factory', 'benchmarks.standin:create_standin_app'] if standin else ['src.main:app']
+    command = [sys.executable, '-m', 'uvicorn', *target, '--host', '127.0.0.1', '--port', str(port)]
+    command += ['--workers', str(workers), '--log-level', 'warning', '--no-access-log']
+    server = await asyncio.create_subprocess_exec(*command, env={**os.environ, 'RATE_LIMIT_ENABLED': 'false'})
+    try:
+        limits = Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with AsyncClient(base_url=f'http://127.0.0.1:{port}', limits=limits) as client:
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while True:
+                try:
+                    (await client.get('/api/healthcheck')).raise_for_status()
+                    break
+                except TransportError:
+                    if time.monotonic() > deadline or server.returncode is not None:
+                        raise
+                    await asyncio.sleep(0.2)
+            yield client
+    finally:
+        server.terminate()
+        await server.wait()
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    """Compare two result files and describe every regression beyond ``tolerance``.
+
+    An endpoint regresses when its throughput drops or its p99 latency grows
+    by more than ``tolerance``, or when it has errors the baseline did not have.
+
+    Args:
+        baseline (dict[str, Any]): Results of the reference run.
+        current (dict[str, Any]): Results of this run.
+        tolerance (float): Allowed relative change, for example 0.1 for 10 %.
+
+    Returns:
+        list[str]: One line per regression; empty if there is none.
+    """
+    regressions = []
+    for endpoint, now in current['results'].items():
+        before = baseline['results'].get(endpoint)
+        if before is None:
+            continue
+        if now['throughput_rps'] < before['throughput_rps'] * (1 - tolerance):
+            regressions.append(f'{endpoint}: throughput {before["throughput_rps"]} -> {now["throughput_rps"]} req/s')
+        if now['p99_ms'] > before['p99_ms'] * (1 + tolerance):
+            regressions.append(f'{endpoint}: p99 {before["p99_ms"]} -> {now["p99_ms"]} ms')
+        if now['errors'] > before['errors']:
+            regressions.append(f'{endpoint}: errors {before["errors"]} -> {now["errors"]}')
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the suite as configured on the command line and return the result document."""
+    if args.mode == 'asgi':
+        client_context = asgi_client(args.standin)
+    else:
+        client_context = uvicorn_client(args.standin, args.workers, args.concurrency)
+    async with client_context as client:
+        results = await run_endpoints(client, args.endpoints, args.requests, args.concurrency)
+
+    return {
+        'meta': {
+            'created_at': datetime.now(UTC).isoformat(),
+            'mode': args.mode,
+            'workers': args.workers if args.mode == 'uvicorn' else 1,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'database': 'standin' if args.standin else 'postgres',
+            'python': platform.python_version(),
+        },
+        'results': results,
+    }
+
+
+def main() -> int:
+    """Parse arguments, run the suite, print a table and write or compare results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('asgi', 'uvicorn'), default='asgi')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument('--standin', action='store_true', help='keep users in memory instead of Postgres')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    document = asyncio.run(run(args))
+
+    print(f'{"endpoint":<12} {"req/s":>10} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"errors":>7}')
+    for endpoint, stats in document['results'].items():
+        print(
+            f'{endpoint:<12} {stats["throughput_rps"]:>10.1f} {stats["p50_ms"]:>9.2f} '
+            f'{stats["p95_ms"]:>9.2f} {stats["p99_ms"]:>9.2f} {stats["errors"]:>7}'
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = compare(json.load(file), document, args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,18 @@ set -euo pipefail
 
 # --------- НАСТРОЙКИ ПО УМОЛЧАНИЮ --------------------------------------------
 # Можно переопределить через переменные окружения в docker-compose:
-#   DATABASE_URL, APP_MODULE, APP_HOST, APP_PORT, UVICORN_WORKERS, UVICORN_RELOAD
+#   DATABASE_URL, APP_MODULE, APP_HOST, APP_PORT, UVICORN_WORKERS, UVICORN_RELOAD, UVICORN_PRELOAD,
+#   FORWARDED_ALLOW_IPS (адреса прокси, которым можно доверять X-Forwarded-For)
 : "${DATABASE_URL:=postgresql+asyncpg://postgres:postgres@db:5432/to_do_list}"
 : "${APP_MODULE:=src.main:app}"
 : "${APP_HOST:=0.0.0.0}"
 : "${APP_PORT:=8000}"
 : "${UVICORN_WORKERS:=1}"
 : "${UVICORN_RELOAD:=false}"
+: "${UVICORN_PRELOAD:=false}"
+: "${FORWARDED_ALLOW_IPS:=127.0.0.1}"
+# Settings делит DB_MAX_CONNECTIONS между воркерами, поэтому число воркеров экспортируется.
+export UVICORN_WORKERS
 
 echo "DATABASE_URL=${DATABASE_URL}"
 echo "APP_MODULE=${APP_MODULE}"
@@ -45,12 +50,21 @@ echo "Running Alembic migrations..."
 # Если alembic.ini у вас в корне /app, этого достаточно:
 uv run alembic upgrade head
 
+# --------- ОБСЛУЖИВАНИЕ ПРИ СТАРТЕ --------------------------------------------
+# Один раз на запуск контейнера, а не в каждом воркере; ошибка не мешает старту.
+echo "Running startup maintenance..."
+python -m src.maintenance || echo "WARNING: startup maintenance failed" >&2
+export STARTUP_JOBS_ENABLED=false
+
 # --------- ЗАПУСК ПРИЛОЖЕНИЯ --------------------------------------------------
 echo "Starting Uvicorn..."
 if [ "${UVICORN_RELOAD}" = "true" ]; then
   # режим разработки
-  exec uvicorn "${APP_MODULE}" --host "${APP_HOST}" --port "${APP_PORT}" --reload --proxy-headers --forwarded-allow-ips="*"
+  exec uvicorn "${APP_MODULE}" --host "${APP_HOST}" --port "${APP_PORT}" --reload --proxy-headers --forwarded-allow-ips="${FORWARDED_ALLOW_IPS}"
+elif [ "${UVICORN_PRELOAD}" = "true" ]; then
+  # приложение импортируется один раз, затем воркеры форкаются (src/server.py)
+  exec python -m src.server --host "${APP_HOST}" --port "${APP_PORT}" --workers "${UVICORN_WORKERS}" --timeout-graceful-shutdown "${UVICORN_GRACEFUL_TIMEOUT:-10}" --forwarded-allow-ips="${FORWARDED_ALLOW_IPS}"
 else
   # режим продакшн
-  exec uvicorn "${APP_MODULE}" --host "${APP_HOST}" --port "${APP_PORT}" --workers "${UVICORN_WORKERS}" --proxy-headers --forwarded-allow-ips="*"
+  exec uvicorn "${APP_MODULE}" --host "${APP_HOST}" --port "${APP_PORT}" --workers "${UVICORN_WORKERS}" --timeout-graceful-shutdown "${UVICORN_GRACEFUL_TIMEOUT:-10}" --proxy-headers --forwarded-allow-ips="${FORWARDED_ALLOW_IPS}"
 fi
\ No newline at end of file
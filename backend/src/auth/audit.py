@@ -0,0 +1,183 @@
+"""Audit log of authentication events, buffered in memory and written in batches.
+
+Handlers call :meth:`AuthEventLog.record`, which only appends to a ring
+buffer, so a login costs no extra statement. A background task started in
+the lifespan writes the buffer with multi-row INSERTs on a session of its
+own, once ``flush_rows`` events are waiting or ``flush_interval`` seconds
+have passed, and a last time on shutdown.
+
+The loss bounds are configurable. A crash loses at most the events of one
+flush interval. While the database is unreachable, unwritten events are kept
+and retried, but never more than ``capacity``: beyond that the oldest events
+are overwritten and counted in ``auth_events_dropped_total``.
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import database
+from src.models import AuthEventKind
+from src.utils.auth_events import create_monthly_partitions, drop_expired_partitions, insert_auth_events
+from src.utils.jobs import job_queue
+from src.utils.metrics import Counter, Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+auth_events_dropped = registry.register(
+    Counter('auth_events_dropped_total', 'Auth events overwritten in the full buffer before being written.')
+)
+
+
+class AuthEventLog:
+    """Ring buffer of auth events with a background flusher."""
+
+    def __init__(self, capacity: int, flush_rows: int, flush_interval: float, enabled: bool = True) -> None:
+        """Configure the buffer; nothing is flushed until :meth:`start`.
+
+        Args:
+            capacity (int): Most events held in memory.
+            flush_rows (int): Buffered events that trigger a flush, and rows per INSERT.
+            flush_interval (float): Most seconds an event waits in the buffer.
+            enabled (bool): When False events are not recorded.
+        """
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        """Return the number of buffered events."""
+        return len(self._buffer)
+
+    def record(
+        self,
+        kind: AuthEventKind,
+        username: str,
+        client_ip: str | None = None,
+        user_id: uuid.UUID | None = None,
+        detail: str | None = None,
+    ) -> None:
+        """Buffer an event; never waits for the database.
+
+        Args:
+            kind (AuthEventKind): What happened.
+            username (str): The username the request was made for.
+            client_ip (str | None): Address of the client.
+            user_id (uuid.UUID | None): The user, when it is known.
+            detail (str | None): Short machine-readable reason, such as ``wrong_password``.
+        """
+        if not self.enabled:
+            return
+        self._append(
+            [
+                {
+                    'occurred_at': datetime.now(UTC),
+                    'kind': kind,
+                    'username': username[:50],
+                    'user_id': user_id,
+                    'client_ip': client_ip,
+                    'detail': detail,
+                }
+            ]
+        )
+        if len(self._buffer) >= self.flush_rows:
+            self._wakeup.set()
+
+    def _append(self, events: list[dict[str, Any]]) -> None:
+        overflow = len(self._buffer) + len(events) - self._buffer.maxlen
+        if overflow > 0:
+            auth_events_dropped.inc(overflow)
+        self._buffer.extend(events)
+
+    def start(self) -> None:
+        """Start the flusher on the running loop."""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush the remaining events and stop the flusher."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+        # Events recorded while the last flush was running.
+        await self.flush()
+
+    async def flush(self, db: AsyncSession | None = None) -> int:
+        """Write every buffered event; on failure put them back in front of newer ones.
+
+        Args:
+            db (AsyncSession | None): Session to write with; a new one when None.
+
+        Returns:
+            int: Number of events written.
+        """
+        if not self._buffer:
+            return 0
+        events = list(self._buffer)
+        self._buffer.clear()
+        try:
+            if db is not None:
+                await insert_auth_events(db, events, self.flush_rows)
+            else:
+                async with database.sessions() as session:
+                    await insert_auth_events(session, events, self.flush_rows)
+        except (OSError, SQLAlchemyError):
+            logger.warning(
+                'Could not write %d auth events, keeping them for the next flush', len(events), exc_info=True
+            )
+            newer = list(self._buffer)
+            self._buffer.clear()
+            self._buffer.extend(events)
+            self._append(newer)
+            return 0
+        return len(events)
+
+
+@job_queue.register('maintain_auth_event_partitions')
+async def maintain_partitions(_: list[Any]) -> None:
+    """Create the auth event partitions of the coming months and drop expired ones.
+
+    Expired partitions are dropped even if creating a partition failed.
+    """
+    now = datetime.now(UTC)
+    try:
+        async with database.sessions() as db:
+            await create_monthly_partitions(db, now, settings.auth_event_partitions_ahead)
+    finally:
+        async with database.sessions() as db:
+            await drop_expired_partitions(db, now, settings.auth_event_retention_months)
+
+
+auth_events = AuthEventLog(
+    capacity=settings.auth_event_buffer_size,
+    flush_rows=settings.auth_event_flush_rows,
+    flush_interval=settings.auth_event_flush_interval,
+    enabled=settings.auth_events_enabled,
+)
+
+registry.register(
+    Gauge('auth_events_buffered', 'Auth events waiting to be written.', callback=lambda: len(auth_events))
+)
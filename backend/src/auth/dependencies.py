@@ -0,0 +1,32 @@
+"""Dependencies for endpoints that require an authenticated user."""
+
+import uuid
+from typing import Annotated
+
+from fastapi import HTTPException, Security, status
+from fastapi_jwt import JwtAuthorizationCredentials
+
+from .router import access_credentials
+
+
+async def get_current_user_id(
+    credentials: Annotated[JwtAuthorizationCredentials, Security(access_credentials)],
+) -> uuid.UUID:
+    """Return the id of the user the access token was issued to.
+
+    Args:
+        credentials (JwtAuthorizationCredentials): Verified access token credentials.
+
+    Returns:
+        uuid.UUID: The primary key of the authenticated user.
+
+    Raises:
+        HTTPException: If the token predates user ids in the subject.
+    """
+    try:
+        return uuid.UUID(credentials.subject['id'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials') from e
+
+
+CurrentUserId = Annotated[uuid.UUID, Security(get_current_user_id)]
@@ -0,0 +1,179 @@
+"""Bounded worker pool for password hashing.
+
+Hashing is deliberately slow, so it never runs on the event loop. Work is
+submitted to a thread or process pool and the number of in-flight jobs is
+capped; once the cap is reached new requests are rejected immediately with
+:class:`HashingPoolSaturatedError` instead of queueing without bound.
+"""
+
+import asyncio
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Literal
+
+from src.config import settings
+from src.utils.metrics import Gauge, registry
+
+from . import security
+
+
+class HashingPoolSaturatedError(Exception):
+    """Raised when the hashing pool has no free capacity."""
+
+    def __init__(self, retry_after: int) -> None:
+        """Store the suggested retry delay.
+
+        Args:
+            retry_after (int): Seconds the client should wait before retrying.
+        """
+        super().__init__('Password hashing pool is saturated')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Run password hashing and verification on a bounded executor."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        executor: Literal['thread', 'process'] = 'thread',
+        cost: int | None = None,
+        target_ms: float = 50.0,
+    ) -> None:
+        """Configure the hasher without starting any workers.
+
+        Args:
+            workers (int): Number of pool workers.
+            max_queue (int): Number of jobs allowed to wait for a free worker.
+            executor (str): Either ``thread`` or ``process``.
+            cost (int | None): Fixed scrypt cost; calibrated on start when None.
+            target_ms (float): Latency target used for calibration.
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_kind = executor
+        self.target_ms = target_ms
+        self._fixed_cost = cost
+        self._cost: int | None = cost
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._avg_seconds = target_ms / 1000
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs running or waiting at once."""
+        return self.workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs currently running or waiting."""
+        return self._in_flight
+
+    @property
+    def average_seconds(self) -> float:
+        """Moving average of the time a job takes, waiting included."""
+        return self._avg_seconds
+
+    @property
+    def cost(self) -> int:
+        """Scrypt cost used for new hashes."""
+        return self._cost if self._cost is not None else security.DEFAULT_COST
+
+    def start(self, calibrate: bool = True) -> None:
+        """Create the executor and calibrate the cost if it is not fixed.
+
+        Args:
+            calibrate (bool): Whether to measure the cost against ``target_ms``.
+        """
+        if self._executor is None:
+            if self.executor_kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        if calibrate and self._fixed_cost is None and self._cost is None:
+            self._cost = security.calibrate_cost(self.target_ms)
+
+    def shutdown(self) -> None:
+        """Stop the executor and wait for running jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def retry_after(self) -> int:
+        """Estimate how long a rejected client should wait, in seconds."""
+        return max(1, math.ceil(self._in_flight * self._avg_seconds / self.workers))
+
+    async def _submit(self, func: Any, *args: Any) -> Any:  # noqa: ANN401
+        if self._in_flight >= self.capacity:
+            raise HashingPoolSaturatedError(self.retry_after())
+
+        if self._executor is None:
+            self.start(calibrate=False)
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+        finally:
+            self._in_flight -= 1
+            self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * (time.perf_counter() - started)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the pool.
+
+        Args:
+            password (str): The plain-text password to hash.
+
+        Returns:
+            str: The encoded password hash.
+        """
+        return await self._submit(security.hash_password, password, self.cost)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a stored hash on the pool.
+
+        Args:
+            plain_password (str): The plain-text password provided by the user.
+            hashed_password (str): The previously stored hashed password.
+
+        Returns:
+            bool: True if the password is valid, False otherwise.
+        """
+        return await self._submit(security.verify_password, plain_password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a stored hash is legacy or weaker than the current cost.
+
+        Args:
+            hashed_password (str): The previously stored hashed password.
+
+        Returns:
+            bool: True if the hash should be replaced.
+        """
+        return security.needs_rehash(hashed_password, self.cost)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    executor=settings.password_hash_executor,
+    cost=settings.password_hash_cost,
+    target_ms=settings.password_hash_target_ms,
+)
+
+registry.register(
+    Gauge('password_hash_in_flight', 'Hashing jobs running or waiting.', callback=lambda: password_hasher.in_flight)
+)
+registry.register(
+    Gauge('password_hash_capacity', 'Hashing jobs allowed at once.', callback=lambda: password_hasher.capacity)
+)
+registry.register(
+    Gauge(
+        'password_hash_average_seconds',
+        'Moving average of hashing job latency.',
+        callback=lambda: password_hasher.average_seconds,
+    )
+)
@@ -0,0 +1,60 @@
+"""JWT security objects, built on first use instead of at import time.
+
+The app lifespan builds them before serving (see :mod:`src.main`), so the
+first request does not pay for it. Route dependencies only need the bearer
+and cookie schemes, which are plain FastAPI security classes.
+"""
+
+import functools
+from datetime import timedelta
+from typing import Annotated
+
+from fastapi import Security
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi_jwt import JwtAccessBearerCookie, JwtAuthorizationCredentials, JwtRefreshBearerCookie
+from fastapi_jwt.jwt import JwtAuthBase
+
+from src.config import settings
+
+
+@functools.cache
+def get_access_security() -> JwtAccessBearerCookie:
+    """Return the access token issuer and verifier configured from the settings."""
+    return JwtAccessBearerCookie(
+        secret_key=settings.jwt_secret_key.get_secret_value(),
+        algorithm=settings.jwt_algorithm,
+        access_expires_delta=timedelta(seconds=settings.jwt_access_expires),
+    )
+
+
+@functools.cache
+def get_refresh_security() -> JwtRefreshBearerCookie:
+    """Return the refresh token issuer and verifier configured from the settings."""
+    return JwtRefreshBearerCookie(
+        secret_key=settings.jwt_secret_key.get_secret_value(),
+        algorithm=settings.jwt_algorithm,
+        refresh_expires_delta=timedelta(seconds=settings.jwt_refresh_expires),
+    )
+
+
+class RefreshCredentials:
+    """Security dependency equivalent to :class:`fastapi_jwt.JwtRefreshBearerCookie`, built lazily.
+
+    Accepts the refresh token from the same bearer header and cookie and
+    registers the same security schemes in the OpenAPI document.
+    """
+
+    _bearer = JwtAuthBase.JwtRefreshBearer()
+    _cookie = JwtAuthBase.JwtRefreshCookie()
+
+    async def __call__(
+        self,
+        bearer: Annotated[HTTPAuthorizationCredentials | None, Security(_bearer)] = None,
+        cookie: Annotated[str | None, Security(_cookie)] = None,
+    ) -> JwtAuthorizationCredentials | None:
+        """Return the credentials carried by the request's refresh token.
+
+        Raises:
+            HTTPException: If no token is provided or it is not a valid refresh token.
+        """
+        return await get_refresh_security()(bearer=bearer, cookie=cookie)
@@ -0,0 +1,169 @@
+"""Refresh token rotation with an in-memory index of revoked token IDs.
+
+Every refresh token carries a ``family`` claim shared by all tokens issued
+from one login. Using a refresh token stores its ``jti`` in the
+``revoked_token`` table, so presenting it a second time is reuse: the whole
+family is revoked, which locks out both the thief and the victim until the
+next login.
+
+The table is authoritative. :class:`RevocationIndex` keeps Bloom filters of
+the revoked IDs this worker knows about, so a token that is definitely not
+revoked skips the lookup and goes straight to the single atomic claim
+statement. Only a filter hit costs an extra indexed read. Bloom filters cannot
+forget, so the index keeps two generations and drops the older one every
+``jwt_refresh_expires`` seconds: an ID stays in the index for at least the
+lifetime of any token it could match. Rows of expired tokens are purged by a
+background job submitted on startup.
+"""
+
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import database
+from src.utils.bloom import BloomFilter
+from src.utils.jobs import job_queue
+from src.utils.tokens import (
+    claim_refresh_token,
+    find_revoked_token_ids,
+    purge_expired_tokens,
+    revoke_token_id,
+    stream_revoked_token_ids,
+)
+
+
+class RefreshTokenRevokedError(Exception):
+    """Raised when a refresh token was already used or its family is revoked."""
+
+    def __init__(self) -> None:
+        """Set the message returned to the client."""
+        super().__init__('Refresh token has been revoked')
+
+
+class RevocationIndex:
+    """Two generations of Bloom filters over revoked token and family IDs."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        lifetime: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty, not yet loaded index.
+
+        Until :meth:`load` has run, every ID counts as possibly revoked, so
+        each refresh confirms against the table.
+
+        Args:
+            capacity (int): Revoked IDs per generation the filters are sized for.
+            error_rate (float): Target false positive rate of one filter.
+            lifetime (float): Lifetime of a refresh token in seconds.
+            clock (Callable[[], float]): Source of the current time in seconds.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.lifetime = lifetime
+        self.clock = clock
+        self.loaded = False
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._loading: BloomFilter | None = None
+        self._rotated_at = clock()
+
+    def _rotate(self) -> None:
+        elapsed = self.clock() - self._rotated_at
+        if elapsed < self.lifetime:
+            return
+        self._previous = self._current if elapsed < 2 * self.lifetime else BloomFilter(self.capacity, self.error_rate)
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = self.clock()
+
+    def add(self, token_id: str) -> None:
+        """Record a revoked ID in the current generation."""
+        self._rotate()
+        self._current.add(token_id)
+        if self._loading is not None:
+            self._loading.add(token_id)
+
+    def might_be_revoked(self, *token_ids: str) -> bool:
+        """Report whether any of ``token_ids`` may be revoked; False is definitive for this worker."""
+        if not self.loaded:
+            return True
+        self._rotate()
+        return any(token_id in self._current or token_id in self._previous for token_id in token_ids)
+
+    async def load(self, db: AsyncSession) -> int:
+        """Rebuild the filters from the unexpired rows of the table.
+
+        IDs added while the table is read are kept.
+
+        Args:
+            db (AsyncSession): The active SQLAlchemy asynchronous session.
+
+        Returns:
+            int: Number of revoked IDs loaded.
+        """
+        self._loading = loading = BloomFilter(self.capacity, self.error_rate)
+        try:
+            async for token_id in stream_revoked_token_ids(db):
+                loading.add(token_id)
+        finally:
+            self._loading = None
+        self._current, self._previous = loading, BloomFilter(self.capacity, self.error_rate)
+        self._rotated_at = self.clock()
+        self.loaded = True
+        return len(loading)
+
+    async def revoke(self, db: AsyncSession, token_id: str) -> None:
+        """Store ``token_id`` as revoked for one token lifetime.
+
+        Args:
+            db (AsyncSession): The active SQLAlchemy asynchronous session.
+            token_id (str): The token or family ID.
+        """
+        await revoke_token_id(db, token_id, self._expiry())
+        self.add(token_id)
+
+    async def consume(self, db: AsyncSession, token_id: str, family: str) -> None:
+        """Use up a refresh token, revoking its family on reuse.
+
+        Args:
+            db (AsyncSession): The active SQLAlchemy asynchronous session.
+            token_id (str): The ``jti`` of the presented refresh token.
+            family (str): The family claim of the presented refresh token.
+
+        Raises:
+            RefreshTokenRevokedError: If the token was used before or its family is revoked.
+        """
+        if self.might_be_revoked(token_id, family) and await find_revoked_token_ids(db, (token_id, family)):
+            await self.revoke(db, family)
+            raise RefreshTokenRevokedError
+
+        if not await claim_refresh_token(db, token_id, family, self._expiry()):
+            # Used concurrently or through another worker, whose index this one has not seen.
+            await self.revoke(db, family)
+            raise RefreshTokenRevokedError
+        self.add(token_id)
+
+    def _expiry(self) -> datetime:
+        # No token issued so far, in any family, is valid beyond one lifetime from now.
+        return datetime.now(UTC) + timedelta(seconds=self.lifetime)
+
+
+@job_queue.register('purge_expired_tokens')
+async def purge_expired(_: list[Any]) -> None:
+    """Delete revoked IDs whose tokens have all expired."""
+    async with database.sessions() as db:
+        await purge_expired_tokens(db)
+
+
+revocation_index = RevocationIndex(
+    capacity=settings.revocation_filter_capacity,
+    error_rate=settings.revocation_filter_error_rate,
+    lifetime=settings.jwt_refresh_expires,
+)
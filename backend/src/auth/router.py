@@ -1,134 +1,299 @@
 """All endpoints related to user authentication."""
 
-from datetime import timedelta
+import contextlib
+import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING, Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response, Security, status
-from fastapi_jwt import JwtAccessBearerCookie, JwtAuthorizationCredentials, JwtRefreshBearerCookie
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, Security, status
+from fastapi_jwt import JwtAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
-from src.utils.database import create_user, get_user_by_username
+from src.database import get_db, get_read_db
+from src.models import AuthEventKind
+from src.utils.auth_events import recent_auth_events
+from src.utils.database import create_user, get_user_by_username, is_known_username, update_user_password
+from src.utils.rate_limit import Limit, rate_limiter
+from src.utils.responses import trusted_json
 
 from ..config import settings
-from .schemas import LoginUser, RegisterUser, ResponseUser, TokenResponse
-from .security import hash_password, verify_password
+from .audit import auth_events
+from .hashing import HashingPoolSaturatedError, password_hasher
+from .jwt_security import RefreshCredentials, get_access_security, get_refresh_security
+from .revocation import RefreshTokenRevokedError, revocation_index
+from .schemas import AuthEventResponse, LoginUser, RegisterUser, ResponseUser, TokenResponse
+from .token_cache import CachedJwtAccess, VerifiedTokenCache
 
 if TYPE_CHECKING:
-    from src.models.user import User
+    from src.utils.user_cache import UserRecord
 
 router: APIRouter = APIRouter(prefix='/auth', tags=['auth'])
 
-access_security = JwtAccessBearerCookie(
-    secret_key=settings.jwt_secret_key.get_secret_value(),
-    algorithm=settings.jwt_algorithm,
-    access_expires_delta=timedelta(seconds=settings.jwt_access_expires),
-)
+MAX_EVENTS = 200
+
+token_cache = VerifiedTokenCache(maxsize=settings.token_cache_size, enabled=settings.token_cache_enabled)
+access_credentials = CachedJwtAccess(get_access_security, token_cache)
+refresh_credentials = RefreshCredentials()
 
-refresh_security = JwtRefreshBearerCookie(
-    secret_key=settings.jwt_secret_key.get_secret_value(),
-    algorithm=settings.jwt_algorithm,
-    refresh_expires_delta=timedelta(seconds=settings.jwt_refresh_expires),
+# Registrations and logins are counted in separate buckets per address, so a
+# burst of sign-ups behind one NAT address does not lock out its logins.
+ip_limit = Limit(settings.rate_limit_ip_requests, settings.rate_limit_ip_period)
+username_limit = Limit(
+    settings.rate_limit_username_attempts, settings.rate_limit_username_window, algorithm='sliding_window'
 )
 
 
+def subject_user_id(credentials: JwtAuthorizationCredentials) -> uuid.UUID | None:
+    """Return the user id in the token subject, or None for tokens issued before ids were added.
+
+    Args:
+        credentials (JwtAuthorizationCredentials): Verified token credentials.
+
+    Returns:
+        uuid.UUID | None: The primary key of the user the token was issued to.
+    """
+    try:
+        return uuid.UUID(credentials.subject['id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def client_ip(request: Request) -> str:
+    """Return the address of the client, as resolved by the server's proxy header handling.
+
+    ``X-Forwarded-For`` is only honoured from the proxies in ``FORWARDED_ALLOW_IPS``;
+    trusting any sender would let a client pick the address it is limited by.
+    """
+    return request.client.host if request.client is not None else 'unknown'
+
+
+def issue_tokens(subject: dict[str, Any], family: str | None = None) -> Response:
+    """Create an access and a refresh token for ``subject`` and return them with both cookies set.
+
+    The payload always has the shape of ``TokenResponse``, so it is returned
+    as a trusted response without re-validation.
+
+    Args:
+        subject (dict[str, Any]): The user claims, ``id`` and ``username``.
+        family (str | None): Refresh token family to continue; a login starts a new one.
+
+    Returns:
+        Response: JSON with the issued access and refresh tokens.
+    """
+    access_security = get_access_security()
+    refresh_security = get_refresh_security()
+    access_token = access_security.create_access_token(subject=subject)
+    refresh_subject = {**subject, 'family': family or str(uuid.uuid4())}
+    refresh_token = refresh_security.create_refresh_token(subject=refresh_subject)
+
+    response = trusted_json({'access_token': access_token, 'refresh_token': refresh_token})
+    access_security.set_access_cookie(response, access_token)
+    refresh_security.set_refresh_cookie(response, refresh_token)
+    return response
+
+
 @router.post('/register', response_model=TokenResponse)
-async def register(
-    user: RegisterUser, db: Annotated[AsyncSession, Depends(get_db)], response: Response
-) -> dict[str, Any]:
+async def register(user: RegisterUser, db: Annotated[AsyncSession, Depends(get_db)], request: Request) -> Response:
     """Register a new user and issue authentication tokens.
 
     This endpoint creates a new user account after verifying that:
     - The provided passwords match.
     - The username is not already registered.
 
+    The duplicate check and the insert are a single atomic
+    ``INSERT ... ON CONFLICT DO NOTHING`` statement; usernames already known
+    to the user cache are rejected before hashing the password.
+
     Upon successful registration, it returns both access and refresh JWT tokens
-    and sets them as HTTP cookies in the response.
+    and sets them as HTTP cookies in the response. The outcome is recorded in
+    the auth event log.
 
     Args:
         user (RegisterUser): The registration data provided by the client.
         db (AsyncSession): The active asynchronous SQLAlchemy database session.
-        response (Response): The FastAPI response object used to set cookies.
+        request (Request): The incoming request, used for the client address.
 
     Returns:
-        dict[str, Any]: A dictionary containing the issued access and refresh tokens.
+        Response: The issued access and refresh tokens, also set as cookies.
 
     Raises:
         HTTPException: If the passwords do not match or the username is already registered.
+        HashingPoolSaturatedError: If the password hashing pool has no free capacity.
+        RateLimitExceededError: If the client address made too many attempts.
     """
+    ip = client_ip(request)
+    await rate_limiter.check((f'register:ip:{ip}', ip_limit))
+
     if user.password != user.confirm_password:
+        auth_events.record(AuthEventKind.REGISTER_FAILED, user.username, ip, detail='passwords_mismatch')
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Passwords do not match',
         )
 
-    user_in_db: User = await get_user_by_username(db, user.username)
-    if user_in_db:
+    if await is_known_username(user.username):
+        auth_events.record(AuthEventKind.REGISTER_FAILED, user.username, ip, detail='username_taken')
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Username already registered')
 
-    password_hash: str = hash_password(user.password)
-    user = await create_user(db, user.username, password_hash)
-
-    subject: dict[str, Any] = {'username': user.username}
-
-    access_token = access_security.create_access_token(subject=subject)
-    refresh_token = refresh_security.create_refresh_token(subject=subject)
-
-    access_security.set_access_cookie(response, access_token)
-    refresh_security.set_refresh_cookie(response, refresh_token)
+    password_hash: str = await password_hasher.hash(user.password)
+    created: UserRecord | None = await create_user(db, user.username, password_hash)
+    if created is None:
+        auth_events.record(AuthEventKind.REGISTER_FAILED, user.username, ip, detail='username_taken')
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Username already registered')
 
-    return {'access_token': access_token, 'refresh_token': refresh_token}
+    auth_events.record(AuthEventKind.REGISTER, created.username, ip, created.id)
+    return issue_tokens({'id': str(created.id), 'username': created.username})
 
 
 @router.post('/login', response_model=TokenResponse)
-async def login(user: LoginUser, db: Annotated[AsyncSession, Depends(get_db)], response: Response) -> dict[str, str]:
+async def login(
+    user: LoginUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
+) -> Response:
     """Authenticate a user and return a JWT access token.
 
     This endpoint verifies the user's credentials against the database.
     If authentication succeeds, it issues a JWT access token that can be used
-    to access protected routes.
+    to access protected routes. Legacy or outdated password hashes are
+    transparently replaced with a hash at the current cost, unless the
+    hashing pool is saturated; the rehash is then left to a later login.
+
+    Attempts are rate limited per client address and per username before
+    the user is looked up or a password is verified. Successes and failures
+    are recorded in the auth event log.
 
     Args:
         user (User): The user credentials submitted in the request body.
-        db (AsyncSession): The active SQLAlchemy asynchronous database session.
-        response (Response): The response returned by the endpoint.
+        db (AsyncSession): The active SQLAlchemy asynchronous database session, used to rehash the password.
+        read_db (AsyncSession): A read-only session for the user lookup, on a replica when one is configured.
+        request (Request): The incoming request, used for the client address.
 
     Returns:
-        dict[str, str]: A dictionary containing the generated access token.
+        Response: The issued access and refresh tokens, also set as cookies.
+
+    Raises:
+        RateLimitExceededError: If the client address or the username made too many attempts.
     """
-    user_in_db: User = await get_user_by_username(db, user.username)
+    ip = client_ip(request)
+    await rate_limiter.check(
+        (f'login:ip:{ip}', ip_limit),
+        (f'login:user:{user.username.lower()}', username_limit),
+    )
+
+    user_in_db: UserRecord | None = await get_user_by_username(read_db, user.username)
     if not user_in_db:
+        auth_events.record(AuthEventKind.LOGIN_FAILED, user.username, ip, detail='unknown_user')
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User does not exist')
 
-    if not verify_password(user.password, user_in_db.password):
+    if not await password_hasher.verify(user.password, user_in_db.password):
+        auth_events.record(AuthEventKind.LOGIN_FAILED, user.username, ip, user_in_db.id, detail='wrong_password')
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Wrong Password')
 
-    subject: dict[str, Any] = {'username': user.username}
+    if password_hasher.needs_rehash(user_in_db.password):
+        # Best effort: the password was verified, so a saturated pool only postpones the rehash to a later login.
+        with contextlib.suppress(HashingPoolSaturatedError):
+            await update_user_password(db, user_in_db, await password_hasher.hash(user.password))
 
-    access_token = access_security.create_access_token(subject=subject)
-    refresh_token = refresh_security.create_refresh_token(subject=subject)
+    auth_events.record(AuthEventKind.LOGIN, user_in_db.username, ip, user_in_db.id)
+    return issue_tokens({'id': str(user_in_db.id), 'username': user_in_db.username})
 
-    access_security.set_access_cookie(response, access_token)
-    refresh_security.set_refresh_cookie(response, refresh_token)
 
-    return {'access_token': access_token, 'refresh_token': refresh_token}
+@router.post('/refresh', response_model=TokenResponse)
+async def refresh(
+    credentials: Annotated[JwtAuthorizationCredentials, Security(refresh_credentials)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+) -> Response:
+    """Exchange a refresh token for a new access and refresh token.
+
+    Refresh tokens are single use. The presented token is recorded as used in
+    the same statement that checks it, so a second use, concurrent or not, is
+    detected as reuse: the token's whole family is revoked and every refresh
+    token issued from the same login stops working. Reuse is recorded in the
+    auth event log.
+
+    The user is not looked up and no password is verified; the claims of the
+    signed refresh token are carried over.
+
+    Args:
+        credentials (JwtAuthorizationCredentials): The verified refresh token claims.
+        db (AsyncSession): The active SQLAlchemy asynchronous database session.
+        request (Request): The incoming request, used for the client address.
+
+    Returns:
+        Response: The new access and refresh tokens, also set as cookies.
+
+    Raises:
+        HTTPException: If the token has no ID, was already used or belongs to a revoked family.
+    """
+    if not credentials or credentials.jti is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
+
+    # Tokens issued before families existed start a family of their own.
+    family = credentials.subject.get('family') or credentials.jti
+    try:
+        await revocation_index.consume(db, credentials.jti, family)
+    except RefreshTokenRevokedError as exc:
+        username = str(credentials.subject.get('username'))
+        user_id = subject_user_id(credentials)
+        auth_events.record(AuthEventKind.REFRESH_REUSED, username, client_ip(request), user_id, detail=family[:64])
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+
+    subject = {'id': credentials.subject.get('id'), 'username': credentials.subject.get('username')}
+    return issue_tokens(subject, family)
 
 
 @router.get('/me', response_model=ResponseUser)
 async def me(
-    credentials: Annotated[JwtAuthorizationCredentials, Security(access_security)],
-) -> dict[str, Any]:
+    credentials: Annotated[JwtAuthorizationCredentials, Security(access_credentials)],
+) -> Any:  # noqa: ANN401
     """Retrieve information about the currently authenticated user.
 
+    Claims come from the verified-token cache, so a repeated token is not
+    decoded again. Well-formed claims are rendered directly, skipping
+    ``ResponseUser`` validation; anything else goes through the response model.
+
     Args:
         credentials (JwtAuthorizationCredentials): The user credentials submitted in the request body.
 
     Returns:
-        None: Placeholder for user information (to be implemented).
+        Response | dict[str, Any]: The username of the authenticated user.
     """
     if not credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
 
-    subject = credentials.subject
+    username = credentials.subject.get('username')
+    if isinstance(username, str):
+        return trusted_json({'username': username})
+
+    return {'username': username}
+
+
+@router.get('/events', response_model=list[AuthEventResponse])
+async def my_auth_events(
+    credentials: Annotated[JwtAuthorizationCredentials, Security(access_credentials)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    limit: Annotated[int, Query(ge=1, le=MAX_EVENTS)] = 50,
+    before: datetime | None = None,
+) -> Any:  # noqa: ANN401
+    """List the recent registration, login and refresh reuse events of the current user.
+
+    Failed logins with a wrong password are included. Events are written in batches, so the newest may take up to
+    ``AUTH_EVENT_FLUSH_INTERVAL`` seconds to appear.
+
+    Args:
+        credentials (JwtAuthorizationCredentials): The verified access token claims.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+        limit (int): Maximum number of events.
+        before (datetime | None): Only list events older than this, to page back.
+
+    Returns:
+        list[AuthEventResponse]: The events, newest first.
+    """
+    user_id = subject_user_id(credentials) if credentials else None
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
 
-    return {'username': subject.get('username')}
+    return await recent_auth_events(db, str(credentials.subject.get('username')), user_id, limit, before)
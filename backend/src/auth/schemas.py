@@ -1,6 +1,8 @@
 """All schemas for auth."""
 
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
 
 
 class BaseUser(BaseModel):
@@ -33,3 +35,14 @@ class TokenResponse(BaseModel):
 
     access_token: str
     refresh_token: str
+
+
+class AuthEventResponse(BaseModel):
+    """An audited authentication event."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    occurred_at: datetime
+    kind: str
+    client_ip: str | None
+    detail: str | None
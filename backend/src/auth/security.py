@@ -1,10 +1,69 @@
-"""Utility functions for password hashing and verification."""
+"""Utility functions for password hashing and verification.
 
+Passwords are hashed with scrypt. Hashes are stored in a self-describing
+``scrypt$<log2_n>$<r>$<p>$<salt>$<digest>`` format so that the cost can be
+raised later without invalidating existing hashes. Plain hex SHA-256 digests
+written by earlier versions are still accepted by :func:`verify_password`
+and reported by :func:`needs_rehash` so they can be upgraded on login.
+"""
+
+import base64
 import hashlib
+import hmac
+import os
+import time
+
+SCRYPT_PREFIX = 'scrypt'
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+DIGEST_BYTES = 32
+
+MIN_COST = 12
+MAX_COST = 16
+DEFAULT_COST = 14
+
+_LEGACY_SHA256_LENGTH = 64
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
 
 
-def hash_password(password: str) -> str:
-    """Generate an SHA-256 hash for the given password.
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _scrypt(password: str, salt: bytes, cost: int, r: int = SCRYPT_R, p: int = SCRYPT_P) -> bytes:
+    n = 1 << cost
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r + (1 << 20),
+        dklen=DIGEST_BYTES,
+    )
+
+
+def hash_password(password: str, cost: int = DEFAULT_COST) -> str:
+    """Generate a salted scrypt hash for the given password.
+
+    Args:
+        password (str): The plain-text password to hash.
+        cost (int): The scrypt work factor as log2 of N.
+
+    Returns:
+        str: The encoded hash including algorithm parameters and salt.
+    """
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, cost)
+    return f'{SCRYPT_PREFIX}${cost}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}'
+
+
+def hash_password_legacy(password: str) -> str:
+    """Generate an unsalted SHA-256 hash as stored by earlier versions.
 
     Args:
         password (str): The plain-text password to hash.
@@ -15,6 +74,18 @@ def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def is_legacy_hash(hashed_password: str) -> bool:
+    """Check whether a stored hash is a legacy SHA-256 digest.
+
+    Args:
+        hashed_password (str): The previously stored hashed password.
+
+    Returns:
+        bool: True if the hash is a bare hexadecimal SHA-256 digest.
+    """
+    return len(hashed_password) == _LEGACY_SHA256_LENGTH and not hashed_password.startswith(SCRYPT_PREFIX)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify that a plain-text password matches its stored hash.
 
@@ -25,4 +96,62 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password is valid, False otherwise.
     """
-    return hash_password(plain_password) == hashed_password
+    if is_legacy_hash(hashed_password):
+        return hmac.compare_digest(hash_password_legacy(plain_password), hashed_password)
+
+    try:
+        prefix, cost, r, p, salt, digest = hashed_password.split('$')
+        if prefix != SCRYPT_PREFIX:
+            return False
+        expected = _b64decode(digest)
+        actual = _scrypt(plain_password, _b64decode(salt), int(cost), int(r), int(p))
+    except ValueError:
+        return False
+
+    return hmac.compare_digest(actual, expected)
+
+
+def needs_rehash(hashed_password: str, cost: int = DEFAULT_COST) -> bool:
+    """Check whether a stored hash should be replaced with a fresh one.
+
+    Args:
+        hashed_password (str): The previously stored hashed password.
+        cost (int): The work factor currently used for new hashes.
+
+    Returns:
+        bool: True for legacy hashes and for scrypt hashes weaker than ``cost``.
+    """
+    if is_legacy_hash(hashed_password):
+        return True
+
+    parts = hashed_password.split('$')
+    if len(parts) != 6 or parts[0] != SCRYPT_PREFIX:  # noqa: PLR2004
+        return True
+
+    try:
+        return int(parts[1]) < cost
+    except ValueError:
+        return True
+
+
+def calibrate_cost(target_ms: float, min_cost: int = MIN_COST, max_cost: int = MAX_COST) -> int:
+    """Find the largest scrypt cost whose single hash stays within a latency target.
+
+    Args:
+        target_ms (float): The desired upper bound for one hash, in milliseconds.
+        min_cost (int): The lowest cost that may be returned.
+        max_cost (int): The highest cost that may be returned.
+
+    Returns:
+        int: The calibrated work factor as log2 of N.
+    """
+    salt = os.urandom(SALT_BYTES)
+    cost = min_cost
+    while cost < max_cost:
+        started = time.perf_counter()
+        _scrypt('calibration', salt, cost + 1)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        cost += 1
+    return cost
@@ -0,0 +1,129 @@
+"""Cache of verified access tokens.
+
+Decoding an access token means parsing the JWT and checking its HMAC
+signature on every request. Verified claims are kept in an LRU keyed by the
+SHA-256 digest of the raw token, so a repeated token is accepted after one
+hash instead of a full JWT decode. Each entry expires together with the
+token's ``exp`` claim, which keeps the cache from outliving the token.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable
+from typing import Annotated, Any
+
+from fastapi import HTTPException, Security, status
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi_jwt import JwtAccessBearerCookie, JwtAuthorizationCredentials
+from fastapi_jwt.jwt import JwtAuthBase
+from fastapi_jwt.jwt_backends.abstract_backend import BackendException
+
+from src.utils.cache import MISSING, LRUCache
+
+
+class VerifiedTokenCache:
+    """Bounded map from token digest to already verified credentials."""
+
+    def __init__(self, maxsize: int, enabled: bool = True) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of tokens kept.
+            enabled (bool): When False every token is decoded and verified.
+        """
+        self.enabled = enabled
+        self._cache = LRUCache(maxsize=maxsize, ttl=0)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> JwtAuthorizationCredentials | None:
+        """Return cached credentials for a token, or None when not cached or expired.
+
+        Args:
+            token (str): The raw encoded JWT.
+        """
+        if not self.enabled:
+            return None
+        cached = self._cache.get(self._key(token))
+        return None if cached is MISSING else cached
+
+    def set(self, token: str, credentials: JwtAuthorizationCredentials, expires_at: float) -> None:
+        """Store credentials until the token expires.
+
+        Args:
+            token (str): The raw encoded JWT.
+            credentials (JwtAuthorizationCredentials): The verified credentials.
+            expires_at (float): The ``exp`` claim as a POSIX timestamp.
+        """
+        ttl = expires_at - time.time()
+        if self.enabled and ttl > 0:
+            self._cache.set(self._key(token), credentials, ttl)
+
+    def clear(self) -> None:
+        """Forget all cached tokens."""
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss and eviction counters together with the current size."""
+        return self._cache.stats()
+
+
+class CachedJwtAccess:
+    """Security dependency that verifies access tokens through :class:`VerifiedTokenCache`.
+
+    Accepts the token from the same bearer header and cookie as
+    :class:`fastapi_jwt.JwtAccessBearerCookie` and registers the same
+    security schemes in the OpenAPI document.
+    """
+
+    _bearer = JwtAuthBase.JwtAccessBearer()
+    _cookie = JwtAuthBase.JwtAccessCookie()
+
+    def __init__(self, security: Callable[[], JwtAccessBearerCookie], cache: VerifiedTokenCache) -> None:
+        """Wrap an access token security object.
+
+        Args:
+            security (Callable[[], JwtAccessBearerCookie]): Returns the object providing the secret key
+                and JWT backend; called on first use, not here.
+            cache (VerifiedTokenCache): Where verified tokens are kept.
+        """
+        self.security = security
+        self.cache = cache
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        security = self.security()
+        try:
+            payload = security.jwt_backend.decode(token, security.secret_key)
+        except BackendException as e:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e)) from e
+        except Exception as e:
+            # The JWT backend lets some errors (e.g. a bad signature) escape untranslated.
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f'Invalid token: {e}') from e
+        if payload is None or payload.get('type') != 'access':
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
+        return payload
+
+    async def __call__(
+        self,
+        bearer: Annotated[HTTPAuthorizationCredentials | None, Security(_bearer)] = None,
+        cookie: Annotated[str | None, Security(_cookie)] = None,
+    ) -> JwtAuthorizationCredentials:
+        """Return the credentials carried by the request's access token.
+
+        Raises:
+            HTTPException: If no token is provided or it fails verification.
+        """
+        token = bearer.credentials if bearer else cookie
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Credentials are not provided')
+
+        credentials = self.cache.get(token)
+        if credentials is not None:
+            return credentials
+
+        payload = self._decode(token)
+        credentials = JwtAuthorizationCredentials(payload['subject'], payload.get('jti'))
+        self.cache.set(token, credentials, float(payload['exp']))
+        return credentials
@@ -1,6 +1,7 @@
 """Load data from .env file."""
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import AliasChoices, Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,9 +26,110 @@ class Settings(BaseSettings):
         alias='JWT_SECRET_KEY',
     )
 
+    uvicorn_workers: int = Field(default=1, ge=1, alias='UVICORN_WORKERS')
+    uvicorn_graceful_timeout: int = Field(default=10, ge=1, alias='UVICORN_GRACEFUL_TIMEOUT')
+    # Off when the startup jobs already ran once for the deployment (src.maintenance, src.server).
+    startup_jobs_enabled: bool = Field(default=True, alias='STARTUP_JOBS_ENABLED')
+    forwarded_allow_ips: str = Field(
+        default='127.0.0.1',
+        alias='FORWARDED_ALLOW_IPS',
+        description='Comma-separated proxy addresses trusted to set X-Forwarded-For',
+    )
+
+    db_max_connections: int = Field(default=90, ge=1, alias='DB_MAX_CONNECTIONS')
+    db_pool_size: int | None = Field(default=None, ge=1, alias='DB_POOL_SIZE')
+    db_max_overflow: int | None = Field(default=None, ge=0, alias='DB_MAX_OVERFLOW')
+    db_pool_timeout: float = Field(default=30.0, gt=0, alias='DB_POOL_TIMEOUT')
+    db_pool_recycle: int = Field(default=1800, alias='DB_POOL_RECYCLE')
+    db_pool_pre_ping: bool = Field(default=True, alias='DB_POOL_PRE_PING')
+    db_statement_cache_size: int = Field(default=100, ge=0, alias='DB_STATEMENT_CACHE_SIZE')
+    db_query_cache_size: int = Field(default=500, ge=0, alias='DB_QUERY_CACHE_SIZE')
+    db_pgbouncer: bool = Field(default=False, alias='DB_PGBOUNCER')
+    database_replica_urls: str = Field(
+        default='', alias='DATABASE_REPLICA_URLS', description='Comma-separated DSNs of read replicas'
+    )
+    db_replica_strategy: Literal['round_robin', 'least_connections'] = Field(
+        default='round_robin', alias='DB_REPLICA_STRATEGY'
+    )
+    db_replica_check_interval: float = Field(default=5.0, gt=0, alias='DB_REPLICA_CHECK_INTERVAL')
+    db_replica_check_timeout: float = Field(default=2.0, gt=0, alias='DB_REPLICA_CHECK_TIMEOUT')
+    db_read_your_writes_seconds: int = Field(default=5, ge=0, alias='DB_READ_YOUR_WRITES_SECONDS')
+
     jwt_algorithm: str = Field(default='HS256', alias='JWT_ALGORITHM')
     jwt_access_expires: int = Field(default=3600, alias='JWT_ACCESS_EXPIRES')
     jwt_refresh_expires: int = Field(default=86400, alias='JWT_REFRESH_EXPIRES')
+    revocation_filter_capacity: int = Field(default=100_000, ge=1, alias='REVOCATION_FILTER_CAPACITY')
+    revocation_filter_error_rate: float = Field(default=0.001, gt=0, lt=1, alias='REVOCATION_FILTER_ERROR_RATE')
+
+    password_hash_executor: Literal['thread', 'process'] = Field(default='thread', alias='PASSWORD_HASH_EXECUTOR')
+    password_hash_workers: int = Field(default=4, ge=1, alias='PASSWORD_HASH_WORKERS')
+    password_hash_max_queue: int = Field(default=64, ge=0, alias='PASSWORD_HASH_MAX_QUEUE')
+    password_hash_target_ms: float = Field(default=50.0, gt=0, alias='PASSWORD_HASH_TARGET_MS')
+    password_hash_cost: int | None = Field(default=None, ge=10, le=20, alias='PASSWORD_HASH_COST')
+
+    export_chunk_rows: int = Field(default=500, ge=1, alias='EXPORT_CHUNK_ROWS')
+    task_stats_repair_batch: int = Field(default=1000, ge=1, alias='TASK_STATS_REPAIR_BATCH')
+    # Seconds between recounts of the task counters; 0 leaves the repair off.
+    task_stats_repair_interval: float = Field(default=0.0, ge=0, alias='TASK_STATS_REPAIR_INTERVAL')
+
+    token_cache_enabled: bool = Field(default=True, alias='TOKEN_CACHE_ENABLED')
+    token_cache_size: int = Field(default=10_000, ge=1, alias='TOKEN_CACHE_SIZE')
+
+    user_cache_enabled: bool = Field(default=True, alias='USER_CACHE_ENABLED')
+    user_cache_size: int = Field(default=10_000, ge=1, alias='USER_CACHE_SIZE')
+    user_cache_ttl: float = Field(default=60.0, ge=0, alias='USER_CACHE_TTL')
+    user_cache_negative_ttl: float = Field(default=5.0, ge=0, alias='USER_CACHE_NEGATIVE_TTL')
+
+    response_cache_enabled: bool = Field(default=False, alias='RESPONSE_CACHE_ENABLED')
+    response_cache_size: int = Field(default=10_000, ge=1, alias='RESPONSE_CACHE_SIZE')
+    response_cache_ttl: float = Field(default=30.0, gt=0, alias='RESPONSE_CACHE_TTL')
+
+    rate_limit_enabled: bool = Field(default=True, alias='RATE_LIMIT_ENABLED')
+    rate_limit_ip_requests: int = Field(default=30, ge=1, alias='RATE_LIMIT_IP_REQUESTS')
+    rate_limit_ip_period: float = Field(default=60.0, gt=0, alias='RATE_LIMIT_IP_PERIOD')
+    rate_limit_username_attempts: int = Field(default=10, ge=1, alias='RATE_LIMIT_USERNAME_ATTEMPTS')
+    rate_limit_username_window: float = Field(default=300.0, gt=0, alias='RATE_LIMIT_USERNAME_WINDOW')
+    rate_limit_shards: int = Field(default=16, ge=1, alias='RATE_LIMIT_SHARDS')
+    rate_limit_max_keys: int = Field(default=100_000, ge=1, alias='RATE_LIMIT_MAX_KEYS')
+
+    auth_events_enabled: bool = Field(default=True, alias='AUTH_EVENTS_ENABLED')
+    auth_event_buffer_size: int = Field(default=10_000, ge=1, alias='AUTH_EVENT_BUFFER_SIZE')
+    auth_event_flush_rows: int = Field(default=500, ge=1, alias='AUTH_EVENT_FLUSH_ROWS')
+    auth_event_flush_interval: float = Field(default=1.0, gt=0, alias='AUTH_EVENT_FLUSH_INTERVAL')
+    auth_event_retention_months: int = Field(default=12, ge=1, alias='AUTH_EVENT_RETENTION_MONTHS')
+    auth_event_partitions_ahead: int = Field(default=3, ge=1, alias='AUTH_EVENT_PARTITIONS_AHEAD')
+    auth_event_maintenance_interval: float = Field(default=3600.0, gt=0, alias='AUTH_EVENT_MAINTENANCE_INTERVAL')
+
+    job_concurrency: int = Field(default=8, ge=1, alias='JOB_CONCURRENCY')
+    job_max_pending: int = Field(default=10_000, ge=1, alias='JOB_MAX_PENDING')
+    job_drain_timeout: float = Field(default=10.0, ge=0, alias='JOB_DRAIN_TIMEOUT')
+    job_durable_enabled: bool = Field(default=False, alias='JOB_DURABLE_ENABLED')
+    job_poll_interval: float = Field(default=1.0, gt=0, alias='JOB_POLL_INTERVAL')
+    job_max_attempts: int = Field(default=5, ge=1, alias='JOB_MAX_ATTEMPTS')
+    job_retry_delay: float = Field(default=30.0, ge=0, alias='JOB_RETRY_DELAY')
+
+    push_queue_size: int = Field(default=64, ge=1, alias='PUSH_QUEUE_SIZE')
+    push_max_connections_per_user: int = Field(default=8, ge=1, alias='PUSH_MAX_CONNECTIONS_PER_USER')
+    push_heartbeat_interval: float = Field(default=15.0, gt=0, alias='PUSH_HEARTBEAT_INTERVAL')
+    push_bridge_enabled: bool = Field(default=False, alias='PUSH_BRIDGE_ENABLED')
+    push_bridge_url: str = Field(
+        default='', alias='PUSH_BRIDGE_URL', description='DSN to LISTEN on when DATABASE_URL goes through a pooler'
+    )
+
+    idempotency_enabled: bool = Field(default=True, alias='IDEMPOTENCY_ENABLED')
+    idempotency_backend: Literal['memory', 'database'] = Field(default='memory', alias='IDEMPOTENCY_BACKEND')
+    idempotency_cache_size: int = Field(default=10_000, ge=1, alias='IDEMPOTENCY_CACHE_SIZE')
+    idempotency_ttl: float = Field(default=86400.0, gt=0, alias='IDEMPOTENCY_TTL')
+    idempotency_wait: float = Field(default=10.0, ge=0, alias='IDEMPOTENCY_WAIT')
+    idempotency_lease: float = Field(default=60.0, gt=0, alias='IDEMPOTENCY_LEASE')
+    idempotency_max_body: int = Field(default=65_536, ge=0, alias='IDEMPOTENCY_MAX_BODY')
+
+    fast_json_enabled: bool = Field(default=False, alias='FAST_JSON_ENABLED')
+
+    metrics_enabled: bool = Field(default=False, alias='METRICS_ENABLED')
+    server_timing_enabled: bool = Field(default=False, alias='SERVER_TIMING_ENABLED')
+    allocation_profiling_enabled: bool = Field(default=False, alias='ALLOCATION_PROFILING_ENABLED')
+    allocation_profiling_sample: int = Field(default=50, ge=1, alias='ALLOCATION_PROFILING_SAMPLE')
 
 
 settings = Settings()
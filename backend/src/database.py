@@ -1,13 +1,237 @@
 """Main database configuration."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+import contextlib
+import time
+import uuid
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
-from src.config import settings
+from src.config import Settings, settings
+from src.utils.instrumentation import instrument_engine
+from src.utils.metrics import Counter, Gauge, Histogram, registry
+from src.utils.replicas import PrimarySession, Replica, ReplicaRouter, read_session
 
-engine = create_async_engine(settings.database_url, echo=False)
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+pool_checkout_seconds = registry.register(
+    Histogram('db_pool_checkout_seconds', 'Time spent waiting for a pooled database connection.')
+)
+pool_checkout_timeouts = registry.register(
+    Counter('db_pool_checkout_timeouts_total', 'Connection checkouts that gave up after pool_timeout.')
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout latency and timeouts."""
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection and record how long it took."""
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+def pool_sizing(config: Settings) -> tuple[int, int]:
+    """Split the connection budget of the deployment between Uvicorn workers.
+
+    Every worker has its own pool, so ``db_max_connections`` is divided by the
+    worker count. Unless set explicitly, roughly two thirds of a worker's share
+    are kept open permanently and the rest is allowed as overflow.
+
+    Args:
+        config (Settings): The project settings.
+
+    Returns:
+        tuple[int, int]: ``pool_size`` and ``max_overflow`` for one worker.
+    """
+    per_worker = max(1, config.db_max_connections // config.uvicorn_workers)
+    pool_size = config.db_pool_size or max(1, per_worker * 2 // 3)
+    if config.db_max_overflow is not None:
+        max_overflow = config.db_max_overflow
+    else:
+        max_overflow = max(0, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+def _unique_statement_name() -> str:
+    return f'__asyncpg_{uuid.uuid4()}__'
+
+
+def engine_options(config: Settings) -> dict[str, Any]:
+    """Build keyword arguments for :func:`create_async_engine` from the settings.
+
+    ``db_query_cache_size`` sizes SQLAlchemy's compiled statement cache and
+    ``db_statement_cache_size`` asyncpg's per-connection prepared statement
+    cache. Behind PgBouncer in transaction pooling mode (``db_pgbouncer``) a
+    prepared statement may live on a different server connection than the next
+    transaction, so statement caching is turned off and every statement gets a
+    unique name.
+
+    Args:
+        config (Settings): The project settings.
+
+    Returns:
+        dict[str, Any]: Pool and driver options.
+    """
+    pool_size, max_overflow = pool_sizing(config)
+    options: dict[str, Any] = {
+        'poolclass': InstrumentedAsyncPool,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': config.db_pool_timeout,
+        'pool_recycle': config.db_pool_recycle,
+        'pool_pre_ping': config.db_pool_pre_ping,
+        'query_cache_size': config.db_query_cache_size,
+    }
+    if make_url(config.database_url).get_driver_name() == 'asyncpg':
+        if config.db_pgbouncer:
+            options['connect_args'] = {
+                'statement_cache_size': 0,
+                'prepared_statement_cache_size': 0,
+                'prepared_statement_name_func': _unique_statement_name,
+            }
+        else:
+            options['connect_args'] = {'prepared_statement_cache_size': config.db_statement_cache_size}
+    return options
+
+
+def replica_urls(config: Settings) -> list[str]:
+    """Return the replica DSNs from the comma-separated ``DATABASE_REPLICA_URLS``."""
+    return [url.strip() for url in config.database_replica_urls.split(',') if url.strip()]
+
+
+class Database:
+    """The application's engines and session factories, created on first use.
+
+    Creating the engine loads the driver dialect, so it is deferred from
+    import time to the app lifespan. This also keeps connection pools out of
+    a process that forks workers after importing the app (see
+    :mod:`src.server`): each worker builds its own engine on startup.
+
+    With replicas configured, :meth:`read_session` routes read-only sessions
+    to them through a :class:`ReplicaRouter`; see :mod:`src.utils.replicas`.
+    """
+
+    def __init__(self, config: Settings) -> None:
+        """Remember the settings; nothing is connected or created yet.
+
+        Args:
+            config (Settings): The project settings.
+        """
+        self.config = config
+        self._replica_urls = replica_urls(config)
+        self._engine: AsyncEngine | None = None
+        self._sessions: async_sessionmaker[AsyncSession] | None = None
+        self._router: ReplicaRouter | None = None
+        self._health_checks: asyncio.Task[None] | None = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the engine has been created."""
+        return self._engine is not None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """The engine, created with :func:`engine_options` on first access."""
+        if self._engine is None:
+            self._engine = create_async_engine(self.config.database_url, echo=False, **engine_options(self.config))
+            if self.config.metrics_enabled:
+                instrument_engine(self._engine.sync_engine)
+        return self._engine
+
+    @property
+    def sessions(self) -> async_sessionmaker[AsyncSession]:
+        """The session factory bound to :attr:`engine`."""
+        if self._sessions is None:
+            self._sessions = async_sessionmaker(self.engine, expire_on_commit=False, sync_session_class=PrimarySession)
+        return self._sessions
+
+    @property
+    def router(self) -> ReplicaRouter | None:
+        """The replica router, created on first access; None without replicas."""
+        if self._router is None and self._replica_urls:
+            options = engine_options(self.config)
+            replicas = [Replica(create_async_engine(url, echo=False, **options)) for url in self._replica_urls]
+            if self.config.metrics_enabled:
+                for replica in replicas:
+                    instrument_engine(replica.engine.sync_engine)
+            self._router = ReplicaRouter(
+                replicas, self.config.db_replica_strategy, self.config.db_replica_check_timeout
+            )
+        return self._router
+
+    def read_session(self) -> AsyncSession:
+        """Open a session for read-only work, on a healthy replica when possible."""
+        return read_session(self.sessions, self.router)
+
+    def start_health_checks(self) -> None:
+        """Check the replicas periodically on the running loop, if there are any."""
+        if self.router is not None and self._health_checks is None:
+            self._health_checks = asyncio.get_running_loop().create_task(
+                self.router.watch(self.config.db_replica_check_interval)
+            )
+
+    async def dispose(self) -> None:
+        """Stop the health checks and close all pooled connections; engines are recreated on next use."""
+        if self._health_checks is not None:
+            self._health_checks.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_checks
+            self._health_checks = None
+        if self._router is not None:
+            for replica in self._router.replicas:
+                await replica.engine.dispose()
+        if self._engine is not None:
+            await self._engine.dispose()
+        self._engine = None
+        self._sessions = None
+        self._router = None
+
+
+database = Database(settings)
+
+
+def _pool_saturation(pool: AsyncAdaptedQueuePool) -> float:
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return pool.checkedout() / capacity if capacity else 0.0
+
+
+def _pool_overflow(pool: AsyncAdaptedQueuePool) -> float:
+    return max(pool.overflow(), 0)
+
+
+def _current_pool(read: Callable[[AsyncAdaptedQueuePool], float]) -> Callable[[], float]:
+    # Resolve the pool on every scrape because engine.dispose() replaces it; report 0 before startup.
+    return lambda: read(database.engine.pool) if database.started else 0.0
+
+
+registry.register(
+    Gauge(
+        'db_pool_size',
+        'Configured number of persistent connections.',
+        callback=_current_pool(AsyncAdaptedQueuePool.size),
+    )
+)
+registry.register(
+    Gauge(
+        'db_pool_checked_out', 'Connections currently in use.', callback=_current_pool(AsyncAdaptedQueuePool.checkedout)
+    )
+)
+registry.register(
+    Gauge('db_pool_overflow', 'Connections opened beyond pool_size.', callback=_current_pool(_pool_overflow))
+)
+registry.register(
+    Gauge('db_pool_saturation', 'Checked-out connections over pool capacity.', callback=_current_pool(_pool_saturation))
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -15,5 +239,14 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
     :return: database session
     """
-    async with SessionLocal() as session:
+    async with database.sessions() as session:
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for read-only endpoints, on a replica when one is configured and healthy.
+
+    :return: database session
+    """
+    async with database.read_session() as session:
         yield session
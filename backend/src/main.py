@@ -1,10 +1,91 @@
 """Entrypoint file."""
 
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import Any
 
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.auth import router as auth_router
+from src.auth.audit import auth_events
+from src.auth.hashing import HashingPoolSaturatedError, password_hasher
+from src.auth.jwt_security import get_access_security, get_refresh_security
+from src.auth.revocation import revocation_index
+from src.config import settings
+from src.database import database, replica_urls
+from src.tasks import router as tasks_router
+from src.utils.allocations import AllocationProfilerMiddleware, allocation_profiler
+from src.utils.idempotency import IdempotencyMiddleware, idempotency_store
+from src.utils.instrumentation import MetricsMiddleware
+from src.utils.jobs import job_queue
+from src.utils.metrics import registry
+from src.utils.push import push_hub
+from src.utils.rate_limit import RateLimitExceededError
+from src.utils.replicas import ReadYourWritesMiddleware
+from src.utils.responses import FastJSONResponse
+from src.utils.tasks import UnknownOwnerError
+
+logger = logging.getLogger(__name__)
+
+
+def startup_jobs() -> list[str]:
+    """Return the kinds of the one-off maintenance jobs that run when the service starts.
+
+    Returns:
+        list[str]: Registered job kinds.
+    """
+    kinds = ['purge_expired_tokens']
+    if settings.idempotency_enabled and settings.idempotency_backend == 'database':
+        kinds.append('purge_idempotency_keys')
+    return kinds
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    """Start the pools and background tasks of a worker and load the token revocation index.
+
+    This creates the JWT objects, the hashing pool, the replica health checks,
+    the job queue, the auth event flusher and the push bridge, and starts
+    allocation tracing when profiling is enabled. On shutdown push
+    streams are closed, buffered auth events are written and the job queue is
+    drained before the pools are released.
+    Nothing here runs at import time, so a pre-forking server (:mod:`src.server`)
+    can import the app once and every worker still gets its own pools.
+    The :func:`startup_jobs` are queued only with ``STARTUP_JOBS_ENABLED``;
+    it is off when they already ran once for the deployment (:mod:`src.maintenance`).
+    """
+    if settings.allocation_profiling_enabled:
+        allocation_profiler.start()
+    get_access_security()
+    get_refresh_security()
+    password_hasher.start()
+    database.start_health_checks()
+    job_queue.start(database.sessions if settings.job_durable_enabled else None)
+    if settings.startup_jobs_enabled:
+        for kind in startup_jobs():
+            job_queue.submit(kind)
+    job_queue.every('maintain_auth_event_partitions', settings.auth_event_maintenance_interval)
+    if settings.task_stats_repair_interval:
+        interval = settings.task_stats_repair_interval
+        job_queue.every('repair_task_stats', interval, delay=interval)
+    auth_events.start()
+    push_hub.start()
+    try:
+        async with database.sessions() as session:
+            await revocation_index.load(session)
+    except (OSError, SQLAlchemyError):
+        # Refreshes still work, confirming every token against the table until the index is loaded.
+        logger.warning('Could not load the token revocation index', exc_info=True)
+    yield
+    await push_hub.stop()
+    await auth_events.stop()
+    await job_queue.drain()
+    password_hasher.shutdown()
+    await database.dispose()
+
 
 app: FastAPI = FastAPI(
     title='ToDoList API',
@@ -12,9 +93,51 @@ app: FastAPI = FastAPI(
     docs_url='/api/docs',  # Swagger UI
     redoc_url='/api/redoc',  # ReDoc (альтернативная документация)
     openapi_url='/api/openapi.json',  # JSON-схема OpenAPI
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.fast_json_enabled else JSONResponse,
 )
+if replica_urls(settings) and settings.db_read_your_writes_seconds:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.db_read_your_writes_seconds)
+if settings.idempotency_enabled:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=idempotency_store,
+        wait=settings.idempotency_wait,
+        max_body=settings.idempotency_max_body,
+    )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_enabled)
+if settings.allocation_profiling_enabled:
+    app.add_middleware(AllocationProfilerMiddleware, profiler=allocation_profiler)
 router: APIRouter = APIRouter(prefix='/api')
 router.include_router(auth_router)
+router.include_router(tasks_router)
+
+
+@app.exception_handler(HashingPoolSaturatedError)
+async def hashing_pool_saturated_handler(_: Request, exc: HashingPoolSaturatedError) -> JSONResponse:
+    """Answer with 503 and a Retry-After hint when the hashing pool is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': str(exc)},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exceeded_handler(_: Request, exc: RateLimitExceededError) -> JSONResponse:
+    """Answer with 429 and a Retry-After hint when a rate limit is exhausted."""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={'detail': str(exc)},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(UnknownOwnerError)
+async def unknown_owner_handler(_: Request, exc: UnknownOwnerError) -> JSONResponse:
+    """Answer with 401 when a still valid token belongs to a deleted user."""
+    return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={'detail': str(exc)})
 
 
 @router.get('/healthcheck')
@@ -23,4 +146,20 @@ async def root() -> dict[str, Any]:
     return {'message': 'Hello World'}
 
 
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Expose request, database, pool and hashing metrics in the Prometheus text format, when enabled."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Metrics are disabled')
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
+
+
+@router.get('/allocations', response_class=PlainTextResponse, include_in_schema=False)
+async def allocations() -> PlainTextResponse:
+    """Report the memory allocated per request of every route, when allocation profiling is enabled."""
+    if not settings.allocation_profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Allocation profiling is disabled')
+    return PlainTextResponse(allocation_profiler.report())
+
+
 app.include_router(router)
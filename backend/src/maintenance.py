@@ -0,0 +1,51 @@
+"""Run the startup maintenance jobs once for a deployment instead of in every worker.
+
+Each worker's lifespan queues the jobs of :func:`src.main.startup_jobs`, such
+as purging expired revoked tokens, which repeats the same work once per
+worker. Running this module before the workers start, and starting them with
+``STARTUP_JOBS_ENABLED=false``, does it once. :mod:`src.server` does the same
+in its master process before forking. A failing job is logged and the others
+still run.
+
+Usage:
+    python -m src.maintenance
+"""
+
+import asyncio
+import logging
+import sys
+
+from src.database import database
+from src.main import startup_jobs
+from src.utils.jobs import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def run_startup_jobs() -> int:
+    """Run every startup job to completion, then close the connections they opened.
+
+    Returns:
+        int: Number of jobs that failed.
+    """
+    failed = 0
+    try:
+        for kind in startup_jobs():
+            try:
+                await job_queue.run(kind)
+            except Exception:
+                failed += 1
+                logger.exception('Startup job %s failed', kind)
+    finally:
+        # Nothing pooled may survive into forked workers.
+        await database.dispose()
+    return failed
+
+
+def main() -> int:
+    """Run the startup jobs and report failure through the exit status."""
+    return 1 if asyncio.run(run_startup_jobs()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,22 @@
 """All database models."""
 
+from .auth_event import AuthEvent, AuthEventKind
+from .idempotency_key import IdempotencyKey
+from .job import Job
+from .revoked_token import RevokedToken
+from .task import Task, TaskStatus, TaskTombstone
+from .task_stats import TaskStats
 from .user import User
 
-__all__: list[str] = ['User']
+__all__: list[str] = [
+    'AuthEvent',
+    'AuthEventKind',
+    'IdempotencyKey',
+    'Job',
+    'RevokedToken',
+    'Task',
+    'TaskStats',
+    'TaskStatus',
+    'TaskTombstone',
+    'User',
+]
@@ -0,0 +1,61 @@
+"""file for an authentication event model."""
+
+import uuid
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import DDL, BigInteger, DateTime, Identity, Index, PrimaryKeyConstraint, String, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class AuthEventKind(StrEnum):
+    """What happened in an authentication event."""
+
+    REGISTER = 'register'
+    REGISTER_FAILED = 'register_failed'
+    LOGIN = 'login'
+    LOGIN_FAILED = 'login_failed'
+    REFRESH_REUSED = 'refresh_reused'
+
+
+class AuthEvent(Base):
+    """Audit record of a registration, login attempt or refresh token reuse.
+
+    The table is partitioned by month on ``occurred_at``, so old months are
+    dropped as whole partitions; rows outside every monthly partition land in
+    ``auth_event_default``. The primary key includes the partition key, as
+    Postgres requires. ``ix_auth_event_username_occurred_at`` includes every
+    column the event listing filters on and returns, so it is answered by an
+    index-only scan.
+    """
+
+    __tablename__ = 'auth_event'
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'occurred_at', name='pk_auth_event'),
+        Index(
+            'ix_auth_event_username_occurred_at',
+            'username',
+            'occurred_at',
+            postgresql_include=['user_id', 'kind', 'client_ip', 'detail'],
+        ),
+        {'postgresql_partition_by': 'RANGE (occurred_at)'},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity())
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    username: Mapped[str] = mapped_column(String(50), nullable=False)
+    user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    client_ip: Mapped[str | None] = mapped_column(String(45), nullable=True)
+    detail: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+# Catch-all partition, so inserts never fail when the schema is created without migrations.
+event.listen(
+    AuthEvent.__table__,
+    'after_create',
+    DDL('CREATE TABLE IF NOT EXISTS auth_event_default PARTITION OF auth_event DEFAULT'),
+)
@@ -0,0 +1,31 @@
+"""file for an idempotency key model."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Index, LargeBinary, SmallInteger, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """Outcome of a request sent with an ``Idempotency-Key`` header.
+
+    A row without a status is a claim: a worker is running the request and
+    holds it until ``locked_until``, after which another may take it over.
+    Once the response is stored, retries are answered from the row until
+    ``expires_at``; ``ix_idempotency_key_expires_at`` serves purging them.
+    """
+
+    __tablename__ = 'idempotency_key'
+    __table_args__ = (Index('ix_idempotency_key_expires_at', 'expires_at'),)
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    headers: Mapped[list[Any] | None] = mapped_column(JSONB, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    locked_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,32 @@
+"""file for a durable background job model."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Identity, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class Job(Base):
+    """Deferred work that has to survive a restart.
+
+    Rows are inserted in the transaction of the write that caused them and
+    deleted once their handler succeeded. Workers claim due rows with
+    ``FOR UPDATE SKIP LOCKED`` through ``ix_job_kind_run_at``, so each row is
+    handled by one worker at a time. A failed row is retried at a later
+    ``run_at`` until ``attempts`` reaches the limit and it stays for inspection.
+    """
+
+    __tablename__ = 'job'
+    __table_args__ = (Index('ix_job_kind_run_at', 'kind', 'run_at'),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[Any] = mapped_column(JSONB, nullable=True)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
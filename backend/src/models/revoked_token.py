@@ -0,0 +1,25 @@
+"""file for a revoked token model."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class RevokedToken(Base):
+    """Refresh token ID, or token family ID, that may no longer be used.
+
+    A refresh token's ID is stored when it is rotated, and a family ID when
+    reuse of one of its tokens was detected. Rows are useless once every token
+    they could match has expired; ``ix_revoked_token_expires_at`` serves
+    purging them.
+    """
+
+    __tablename__ = 'revoked_token'
+    __table_args__ = (Index('ix_revoked_token_expires_at', 'expires_at'),)
+
+    token_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
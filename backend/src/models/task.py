@@ -0,0 +1,115 @@
+"""file for a task model."""
+
+import uuid
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    CheckConstraint,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
+    SmallInteger,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+# The 'simple' configuration does no stemming and no stop words, so titles in
+# any language are searchable and prefixes of typed words match as written.
+SEARCH_CONFIG = 'simple'
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
+class TaskStatus(StrEnum):
+    """Lifecycle state of a task."""
+
+    OPEN = 'open'
+    IN_PROGRESS = 'in_progress'
+    DONE = 'done'
+
+
+class Task(Base):
+    """Model for a todo item owned by a user.
+
+    Listing is keyset-paginated on ``(due_at, id)``. The partial index
+    ``ix_task_owner_open_due`` serves the hot "my open tasks by due date"
+    query; ``ix_task_owner_status_due`` serves listings filtered by status.
+    ``version`` is the owner's ``task_version`` at the last write and
+    ``ix_task_owner_version`` serves the delta sync feed.
+
+    ``search_vector`` is a stored generated column; ``ix_task_search`` (GIN)
+    serves full-text search and ``ix_task_title_trgm`` the typo-tolerant
+    fallback. Both lead with ``owner_id`` through ``btree_gin`` so a search
+    only visits the owner's entries.
+    """
+
+    __tablename__ = 'task'
+    __table_args__ = (
+        CheckConstraint("status IN ('open', 'in_progress', 'done')", name='ck_task_status'),
+        CheckConstraint('priority BETWEEN 0 AND 3', name='ck_task_priority'),
+        Index('ix_task_owner_open_due', 'owner_id', 'due_at', 'id', postgresql_where=text("status <> 'done'")),
+        Index('ix_task_owner_status_due', 'owner_id', 'status', 'due_at', 'id'),
+        Index('ix_task_owner_version', 'owner_id', 'version'),
+        Index('ix_task_search', 'owner_id', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_task_title_trgm',
+            'owner_id',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('user.id', ondelete='CASCADE'), nullable=False
+    )
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=TaskStatus.OPEN, server_default='open')
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default='0')
+    due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default='0')
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True)
+
+
+# Extensions needed by the search indexes when the schema is created without migrations.
+event.listen(Task.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS btree_gin'))
+event.listen(Task.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+
+
+class TaskTombstone(Base):
+    """Marker left behind by a deleted task so that delta sync can report the deletion.
+
+    Task ids are generated by clients, so two users can delete tasks with the
+    same id; the key includes the owner to keep one tombstone for each.
+    """
+
+    __tablename__ = 'task_tombstone'
+    __table_args__ = (
+        PrimaryKeyConstraint('owner_id', 'task_id', name='pk_task_tombstone'),
+        Index('ix_task_tombstone_owner_version', 'owner_id', 'version'),
+    )
+
+    task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('user.id', ondelete='CASCADE'))
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
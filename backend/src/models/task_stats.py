@@ -0,0 +1,85 @@
+"""file for a per-user task counters model."""
+
+import uuid
+
+from sqlalchemy import DDL, ForeignKey, Integer, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.models.task import Task
+
+# Statement-level triggers see every row a statement wrote through transition
+# tables, so a batch of a thousand tasks updates each owner's counters once.
+# The owner must still exist: when a user is deleted, the cascade removes
+# their counters along with their tasks. Net-zero changes, such as renaming
+# a task, do not touch the counters row.
+APPLY_DELTAS = """
+    INSERT INTO task_stats AS s (owner_id, open, in_progress, done)
+    SELECT d.owner_id,
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'open'), 0),
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'in_progress'), 0),
+           coalesce(sum(d.delta) FILTER (WHERE d.status = 'done'), 0)
+    FROM ({rows}) AS d
+    GROUP BY d.owner_id
+    HAVING bool_or(d.delta <> 0) AND EXISTS (SELECT FROM "user" u WHERE u.id = d.owner_id)
+    ON CONFLICT (owner_id) DO UPDATE SET
+        open = s.open + excluded.open,
+        in_progress = s.in_progress + excluded.in_progress,
+        done = s.done + excluded.done;
+"""
+NEW_ROWS = 'SELECT owner_id, status, 1 AS delta FROM new_rows'
+OLD_ROWS = 'SELECT owner_id, status, -1 AS delta FROM old_rows'
+UPDATED_ROWS = (
+    'SELECT owner_id, status, sum(delta) AS delta FROM '
+    f'({NEW_ROWS} UNION ALL {OLD_ROWS}) AS changed GROUP BY owner_id, status'
+)
+
+CREATE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {APPLY_DELTAS.format(rows=NEW_ROWS)}
+    ELSIF TG_OP = 'UPDATE' THEN
+        {APPLY_DELTAS.format(rows=UPDATED_ROWS)}
+    ELSE
+        {APPLY_DELTAS.format(rows=OLD_ROWS)}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+CREATE_TRIGGERS = tuple(
+    f'CREATE TRIGGER task_stats_{operation.lower()} AFTER {operation} ON task REFERENCING {transition} '
+    'FOR EACH STATEMENT EXECUTE FUNCTION task_stats_apply()'
+    for operation, transition in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+)
+
+
+class TaskStats(Base):
+    """Counters of a user's tasks by status, kept up to date by triggers on ``task``.
+
+    Reading a user's dashboard is one primary key lookup instead of a
+    ``GROUP BY status`` over all of their tasks. A user without tasks has no
+    row. ``repair_task_stats`` recomputes the counters in batches should
+    they ever drift; ``TASK_STATS_REPAIR_INTERVAL`` schedules it.
+    """
+
+    __tablename__ = 'task_stats'
+
+    owner_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('user.id', ondelete='CASCADE'), primary_key=True
+    )
+    open: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    in_progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+
+
+# Triggers maintaining the counters when the schema is created without migrations.
+event.listen(Task.__table__, 'after_create', DDL(CREATE_FUNCTION))
+for trigger in CREATE_TRIGGERS:
+    event.listen(Task.__table__, 'after_create', DDL(trigger))
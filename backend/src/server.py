@@ -0,0 +1,147 @@
+"""Pre-forking server: import the app once, then fork the Uvicorn workers.
+
+``uvicorn --workers N`` starts every worker as a fresh interpreter, which
+imports FastAPI, SQLAlchemy, pydantic and the app from scratch. This runner
+imports :mod:`src.main` once in the master, binds the listening socket and
+forks the workers, which inherit the loaded modules and the built OpenAPI
+schema copy-on-write and only run the app lifespan. The engine, the hashing pool and the JWT objects are
+created in the lifespan, so nothing that holds connections or threads
+crosses the fork.
+
+Startup maintenance (:func:`src.main.startup_jobs`) runs once in the master
+before the fork, and the workers skip it, instead of every worker repeating
+it. It is skipped entirely when ``STARTUP_JOBS_ENABLED`` is off, for example
+because the deployment ran :mod:`src.maintenance` already.
+
+The master forwards SIGINT and SIGTERM to the workers and replaces a worker
+that dies unexpectedly. If a worker fails during startup, the master stops
+all workers and exits, rather than restarting it in a loop. Requires
+``os.fork``, so it does not run on Windows.
+
+Usage:
+    python -m src.server --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+from types import FrameType
+
+import uvicorn
+
+from src.config import settings
+from src.main import app
+from src.maintenance import run_startup_jobs
+
+logger = logging.getLogger(__name__)
+
+STARTUP_FAILURE = 3
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(config: uvicorn.Config, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            _run_worker(config, sock)
+        except SystemExit as exc:
+            status = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            logger.exception('Worker %s crashed', os.getpid())
+            status = 1
+        finally:
+            os._exit(status)
+    return pid
+
+
+def serve(config: uvicorn.Config, workers: int) -> int:
+    """Bind the socket, fork ``workers`` workers and supervise them until told to stop.
+
+    Args:
+        config (uvicorn.Config): Server configuration for :data:`src.main.app`.
+        workers (int): Number of worker processes.
+
+    Returns:
+        int: Exit status for the master process.
+    """
+    sock = config.bind_socket()
+    if settings.startup_jobs_enabled:
+        # Failures are logged; the workers start either way, as they did when each queued the jobs.
+        asyncio.run(run_startup_jobs())
+        # Inherited by the workers, whose lifespan then leaves the jobs out.
+        settings.startup_jobs_enabled = False
+    # Served from app.openapi_schema afterwards, so workers inherit it instead of each building it.
+    app.openapi()
+    # Objects created so far are never freed; keep the collector from touching
+    # (and thereby copying) their pages in every worker.
+    gc.freeze()
+
+    stopping = False
+
+    def stop(signum: int, _: FrameType | None) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signum)
+
+    children: set[int] = {_spawn(config, sock) for _ in range(workers)}
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    status = 0
+    while children:
+        pid, wait_status = os.wait()
+        children.discard(pid)
+        code = os.waitstatus_to_exitcode(wait_status)
+        if stopping:
+            continue
+        if code == STARTUP_FAILURE:
+            logger.error('Worker %s failed to start, shutting down', pid)
+            stop(signal.SIGTERM, None)
+            status = 1
+        else:
+            logger.warning('Worker %s exited with status %s, starting a new one', pid, code)
+            children.add(_spawn(config, sock))
+
+    sock.close()
+    return status
+
+
+def main() -> int:
+    """Serve the app, imported with this module, from pre-forked workers."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=settings.uvicorn_workers)
+    parser.add_argument('--log-level', default='info')
+    parser.add_argument('--timeout-graceful-shutdown', type=int, default=settings.uvicorn_graceful_timeout)
+    parser.add_argument('--forwarded-allow-ips', default=settings.forwarded_allow_ips)
+    args = parser.parse_args()
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        proxy_headers=True,
+        # Client addresses feed the auth rate limits; only listed proxies may override them.
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        # Push streams never end on their own; cancel them so the lifespan shutdown can run.
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+    )
+    return serve(config, args.workers)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""tasks backend."""
+
+from .router import router
+from .stats import repair_stats
+
+__all__: list[str] = ['repair_stats', 'router']
@@ -0,0 +1,65 @@
+"""Encoders that turn streamed task rows into NDJSON or CSV chunks."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import Row
+
+from src.utils.tasks import EXPORT_COLUMNS
+
+
+class ExportFormat(StrEnum):
+    """Supported export formats."""
+
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+MEDIA_TYPES = {ExportFormat.NDJSON: 'application/x-ndjson', ExportFormat.CSV: 'text/csv'}
+
+
+def _plain(value: Any) -> Any:  # noqa: ANN401
+    if value is None or isinstance(value, str | int):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson(rows: Sequence[Row[Any]]) -> bytes:
+    lines = [json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row), strict=True))) for row in rows]
+    lines.append('')
+    return '\n'.join(lines).encode()
+
+
+def _csv(rows: Sequence[Row[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def encode_chunks(
+    chunks: AsyncIterable[Sequence[Row[Any]]], export_format: ExportFormat
+) -> AsyncGenerator[bytes, None]:
+    """Encode streamed row chunks one at a time.
+
+    Only one chunk of rows and its encoded bytes are alive at once, so memory
+    use is bounded by the chunk size regardless of how many rows are exported.
+
+    Args:
+        chunks (AsyncIterable[Sequence[Row[Any]]]): Row chunks from :func:`stream_task_rows`.
+        export_format (ExportFormat): The output format.
+
+    Yields:
+        bytes: Encoded chunks, starting with a header row for CSV.
+    """
+    if export_format is ExportFormat.CSV:
+        yield (','.join(EXPORT_COLUMNS) + '\r\n').encode()
+    encode = _csv if export_format is ExportFormat.CSV else _ndjson
+    async for rows in chunks:
+        yield encode(rows)
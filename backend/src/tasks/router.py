@@ -0,0 +1,373 @@
+"""All endpoints related to the tasks of the authenticated user."""
+
+import uuid
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.dependencies import CurrentUserId, get_current_user_id
+from src.config import settings
+from src.database import get_db, get_read_db
+from src.models import Task, TaskStatus
+from src.utils.push import push_hub
+from src.utils.response_cache import etag_matches, response_cache
+from src.utils.tasks import (
+    apply_task_batch,
+    create_task,
+    decode_cursor,
+    decode_search_cursor,
+    delete_task,
+    encode_cursor,
+    encode_search_cursor,
+    get_task,
+    get_task_stats,
+    get_task_version,
+    list_task_changes,
+    list_tasks,
+    search_tasks,
+    stream_task_rows,
+    update_task,
+)
+
+from .export import MEDIA_TYPES, ExportFormat, encode_chunks
+from .schemas import (
+    BatchRequest,
+    BatchResponse,
+    CreateOperation,
+    TaskChanges,
+    TaskCreate,
+    TaskPage,
+    TaskResponse,
+    TaskSearchPage,
+    TaskStatsResponse,
+    TaskUpdate,
+    UpdateOperation,
+)
+
+router: APIRouter = APIRouter(prefix='/tasks', tags=['tasks'])
+
+MAX_PAGE_SIZE = 200
+MAX_CHANGES = 1000
+
+
+@router.get('', response_model=TaskPage, responses={status.HTTP_304_NOT_MODIFIED: {}})
+@response_cache.cached(TaskPage, identity=get_current_user_id)
+async def list_my_tasks(
+    user_id: CurrentUserId,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    status_filter: Annotated[TaskStatus | None, Query(alias='status')] = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 50,
+) -> dict[str, Any]:
+    """List tasks of the current user ordered by due date.
+
+    Pagination is cursor based: pass ``next_cursor`` of a page as ``cursor``
+    to get the following page. Without ``status`` only tasks that are not
+    done are listed. Pages are served from the response cache when it is
+    enabled, with an ETag for conditional requests.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+        status_filter (TaskStatus | None): Only list tasks with this status.
+        cursor (str | None): Cursor returned with the previous page.
+        limit (int): Page size.
+
+    Returns:
+        dict[str, Any]: The tasks of the page and the cursor of the next page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from e
+
+    tasks, next_position = await list_tasks(db, user_id, limit, status_filter, after)
+    return {'items': tasks, 'next_cursor': encode_cursor(next_position) if next_position else None}
+
+
+@router.post('', response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_my_task(
+    task: TaskCreate, user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_db)]
+) -> Task:
+    """Create a task for the current user.
+
+    Args:
+        task (TaskCreate): The new task.
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): The active asynchronous SQLAlchemy database session.
+
+    Returns:
+        Task: The created task.
+    """
+    return await create_task(db, user_id, task.model_dump())
+
+
+@router.post('/batch', response_model=BatchResponse)
+async def batch_my_tasks(
+    batch: BatchRequest, user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_db)]
+) -> dict[str, Any]:
+    """Apply many creates, updates and deletes of the current user's tasks at once.
+
+    All operations run in one transaction as a handful of set-based
+    statements, so syncing hundreds of offline edits costs a few round trips
+    instead of one per item. Each task id may appear at most once per batch;
+    repeats are reported as ``duplicate`` and skipped.
+
+    Args:
+        batch (BatchRequest): The operations, applied creates first, then updates, then deletes.
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): The active asynchronous SQLAlchemy database session.
+
+    Returns:
+        dict[str, Any]: One result per operation, in request order.
+    """
+    creates: list[tuple[uuid.UUID, dict[str, Any]]] = []
+    updates: list[tuple[uuid.UUID, dict[str, Any]]] = []
+    deletes: list[uuid.UUID] = []
+    planned: list[tuple[int, str, uuid.UUID, bool]] = []
+    seen: set[uuid.UUID] = set()
+
+    for index, operation in enumerate(batch.operations):
+        task_id = operation.id or uuid.uuid4()
+        duplicate = task_id in seen
+        seen.add(task_id)
+        planned.append((index, operation.op, task_id, duplicate))
+        if duplicate:
+            continue
+        if isinstance(operation, CreateOperation):
+            creates.append((task_id, operation.data.model_dump()))
+        elif isinstance(operation, UpdateOperation):
+            updates.append((task_id, operation.data.changes()))
+        else:
+            deletes.append(task_id)
+
+    created, updated, deleted = await apply_task_batch(db, user_id, creates, updates, deletes)
+    outcomes = {
+        'create': (created, 'created', 'conflict'),
+        'update': (updated, 'updated', 'not_found'),
+        'delete': (deleted, 'deleted', 'not_found'),
+    }
+
+    results = []
+    for index, op, task_id, duplicate in planned:
+        applied, success, failure = outcomes[op]
+        result = 'duplicate' if duplicate else success if task_id in applied else failure
+        results.append({'index': index, 'op': op, 'id': task_id, 'status': result})
+    return {'results': results}
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_my_tasks(
+    user_id: CurrentUserId,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    export_format: Annotated[ExportFormat, Query(alias='format')] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Stream every task of the current user as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and encoded chunk by chunk,
+    so memory use does not grow with the number of tasks.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+        export_format (ExportFormat): Either ``ndjson`` or ``csv``.
+
+    Returns:
+        StreamingResponse: The exported tasks.
+    """
+    chunks = stream_task_rows(db, user_id, settings.export_chunk_rows)
+    return StreamingResponse(
+        encode_chunks(chunks, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="tasks.{export_format}"'},
+    )
+
+
+@router.get('/events', response_class=StreamingResponse)
+async def my_task_events(user_id: CurrentUserId) -> StreamingResponse:
+    """Push a server-sent event whenever the current user's tasks change.
+
+    Replaces polling ``/changes``: each ``tasks`` event carries the new
+    change version, or null when the client should sync anyway, as on every
+    (re)connect. Fetch ``/changes`` with the last applied version on each
+    event. Idle streams get a keep-alive comment every few seconds and hold
+    no database connection.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+
+    Returns:
+        StreamingResponse: A ``text/event-stream`` that stays open until the client leaves.
+    """
+    return StreamingResponse(
+        push_hub.stream(user_id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.get('/search', response_model=TaskSearchPage, responses={status.HTTP_304_NOT_MODIFIED: {}})
+@response_cache.cached(TaskSearchPage, identity=get_current_user_id)
+async def search_my_tasks(
+    user_id: CurrentUserId,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 20,
+) -> dict[str, Any]:
+    """Search the current user's tasks by title and description.
+
+    Every word matches as a prefix, so results can be shown while the user
+    is typing. Results are ranked, titles first; pass ``next_cursor`` as
+    ``cursor`` for the following page. Served from the response cache when
+    it is enabled.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+        q (str): The search text.
+        cursor (str | None): Cursor returned with the previous page.
+        limit (int): Page size.
+
+    Returns:
+        dict[str, Any]: The matching tasks, whether they are fuzzy matches and the cursor of the next page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        after = decode_search_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from e
+
+    tasks, fuzzy, next_position = await search_tasks(db, user_id, q, limit, after)
+    return {
+        'items': tasks,
+        'fuzzy': fuzzy,
+        'next_cursor': encode_search_cursor(next_position) if next_position else None,
+    }
+
+
+@router.get('/stats', response_model=TaskStatsResponse)
+async def my_task_stats(user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_read_db)]) -> dict[str, int]:
+    """Return the dashboard counts of the current user's tasks.
+
+    The counts by status are kept up to date by the database on every write,
+    so this reads one row however many tasks the user has.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+
+    Returns:
+        dict[str, int]: Open, in progress, done, overdue and total counts.
+    """
+    return await get_task_stats(db, user_id)
+
+
+@router.get('/changes', response_model=TaskChanges, responses={status.HTTP_304_NOT_MODIFIED: {}})
+async def my_task_changes(  # noqa: PLR0913, PLR0917
+    user_id: CurrentUserId,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    response: Response,
+    since: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=MAX_CHANGES)] = 500,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> dict[str, Any] | Response:
+    """Return the tasks changed or deleted since a version.
+
+    The ETag is the ``version`` of the response. A poll that is caught up,
+    with ``since`` at the user's current version, and sends that ETag back in
+    ``If-None-Match`` is answered with 304 after a single primary key lookup,
+    without reading any task rows. Requests for older changes, such as the
+    next page or a full resync, always get them.
+
+    Args:
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+        response (Response): The response, used to set the ETag.
+        since (int): The ``version`` of the last applied response; 0 for a full sync.
+        limit (int): Soft maximum number of changes per response.
+        if_none_match (str | None): ETag of the client's last response.
+
+    Returns:
+        dict[str, Any] | Response: The changes, or an empty 304 response.
+    """
+    current = await get_task_version(db, user_id)
+    if since >= current and if_none_match is not None and etag_matches(if_none_match, f'"{current}"'):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': f'"{current}"'})
+
+    changed, deleted, version, has_more = await list_task_changes(db, user_id, since, current, limit)
+    response.headers['ETag'] = f'"{version}"'
+    return {'changed': changed, 'deleted': deleted, 'version': version, 'has_more': has_more}
+
+
+@router.get('/{task_id}', response_model=TaskResponse, responses={status.HTTP_304_NOT_MODIFIED: {}})
+@response_cache.cached(TaskResponse, identity=get_current_user_id)
+async def get_my_task(
+    task_id: uuid.UUID, user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_read_db)]
+) -> Task:
+    """Retrieve one task of the current user, from the response cache when it is enabled.
+
+    Args:
+        task_id (uuid.UUID): The task id.
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): A read-only session, on a replica when one is configured.
+
+    Returns:
+        Task: The task.
+
+    Raises:
+        HTTPException: If the task does not exist or belongs to another user.
+    """
+    task = await get_task(db, user_id, task_id)
+    if task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Task not found')
+    return task
+
+
+@router.patch('/{task_id}', response_model=TaskResponse)
+async def update_my_task(
+    task_id: uuid.UUID, changes: TaskUpdate, user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_db)]
+) -> Task:
+    """Change fields of a task of the current user.
+
+    Args:
+        task_id (uuid.UUID): The task id.
+        changes (TaskUpdate): Fields to change; omitted fields stay as they are.
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): The active asynchronous SQLAlchemy database session.
+
+    Returns:
+        Task: The updated task.
+
+    Raises:
+        HTTPException: If the task does not exist or belongs to another user.
+    """
+    task = await update_task(db, user_id, task_id, changes.changes())
+    if task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Task not found')
+    return task
+
+
+@router.delete('/{task_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete_my_task(
+    task_id: uuid.UUID, user_id: CurrentUserId, db: Annotated[AsyncSession, Depends(get_db)]
+) -> None:
+    """Delete a task of the current user.
+
+    Args:
+        task_id (uuid.UUID): The task id.
+        user_id (uuid.UUID): The authenticated user.
+        db (AsyncSession): The active asynchronous SQLAlchemy database session.
+
+    Raises:
+        HTTPException: If the task does not exist or belongs to another user.
+    """
+    if not await delete_task(db, user_id, task_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Task not found')
@@ -0,0 +1,151 @@
+"""All schemas for tasks."""
+
+import uuid
+from datetime import datetime
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.models import TaskStatus
+
+NULLABLE_FIELDS = frozenset({'description', 'due_at'})
+MAX_BATCH_SIZE = 1000
+
+
+class TaskCreate(BaseModel):
+    """Create a new task."""
+
+    title: str = Field(min_length=1, max_length=200)
+    description: str | None = None
+    status: TaskStatus = TaskStatus.OPEN
+    priority: int = Field(default=0, ge=0, le=3)
+    due_at: datetime | None = None
+
+
+class TaskUpdate(BaseModel):
+    """Partially update a task; omitted fields are left unchanged."""
+
+    title: str | None = Field(default=None, min_length=1, max_length=200)
+    description: str | None = None
+    status: TaskStatus | None = None
+    priority: int | None = Field(default=None, ge=0, le=3)
+    due_at: datetime | None = None
+
+    def changes(self) -> dict[str, Any]:
+        """Return the fields to write; explicit nulls only clear nullable columns."""
+        values = self.model_dump(exclude_unset=True)
+        return {key: value for key, value in values.items() if value is not None or key in NULLABLE_FIELDS}
+
+
+class TaskResponse(BaseModel):
+    """Return task information."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    title: str
+    description: str | None
+    status: TaskStatus
+    priority: int
+    due_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+
+class TaskPage(BaseModel):
+    """One page of tasks and the cursor of the next page."""
+
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+
+
+class TaskStatsResponse(BaseModel):
+    """Dashboard counts of the user's tasks; ``overdue`` counts tasks not done whose due date has passed."""
+
+    open: int
+    in_progress: int
+    done: int
+    overdue: int
+    total: int
+
+
+class TaskSearchPage(BaseModel):
+    """One page of search results, best matches first.
+
+    ``fuzzy`` is set when nothing matched the words as typed and the results
+    come from the typo-tolerant fallback.
+    """
+
+    items: list[TaskResponse]
+    fuzzy: bool = False
+    next_cursor: str | None = None
+
+
+class DeletedTask(BaseModel):
+    """A task deleted at ``version``."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID = Field(validation_alias='task_id')
+    version: int
+
+
+class TaskChanges(BaseModel):
+    """Changes of the user's tasks since a version, in version order.
+
+    Pass ``version`` as ``since`` on the next poll; while ``has_more`` is set,
+    more changes are waiting.
+    """
+
+    changed: list[TaskResponse]
+    deleted: list[DeletedTask]
+    version: int
+    has_more: bool
+
+
+class CreateOperation(BaseModel):
+    """Create a task; ``id`` may be generated by an offline client."""
+
+    op: Literal['create']
+    id: uuid.UUID | None = None
+    data: TaskCreate
+
+
+class UpdateOperation(BaseModel):
+    """Change fields of an existing task."""
+
+    op: Literal['update']
+    id: uuid.UUID
+    data: TaskUpdate
+
+
+class DeleteOperation(BaseModel):
+    """Delete an existing task."""
+
+    op: Literal['delete']
+    id: uuid.UUID
+
+
+BatchOperation = Annotated[CreateOperation | UpdateOperation | DeleteOperation, Field(discriminator='op')]
+
+
+class BatchRequest(BaseModel):
+    """Mutations applied together in one transaction."""
+
+    operations: list[BatchOperation] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one operation, in request order."""
+
+    index: int
+    op: Literal['create', 'update', 'delete']
+    id: uuid.UUID
+    status: Literal['created', 'updated', 'deleted', 'not_found', 'conflict', 'duplicate']
+
+
+class BatchResponse(BaseModel):
+    """Per-operation outcomes of a batch."""
+
+    results: list[BatchItemResult]
@@ -0,0 +1,33 @@
+"""Background repair of the trigger-maintained task counters."""
+
+import logging
+from typing import Any
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.database import database
+from src.utils.jobs import job_queue
+from src.utils.tasks import repair_task_stats
+
+logger = logging.getLogger(__name__)
+
+TRY_LOCK_REPAIR = text("SELECT pg_try_advisory_xact_lock(hashtext('repair_task_stats'))")
+
+
+@job_queue.register('repair_task_stats')
+async def repair_stats(_: list[Any]) -> None:
+    """Recount every user's tasks in batches and log how many counters had drifted.
+
+    The repair commits once per batch, so the advisory lock that keeps other
+    workers from recounting at the same time is held by a transaction on a
+    connection of its own. A worker that finds it taken skips this run.
+    """
+    async with database.engine.connect() as lock, lock.begin():
+        if not await lock.scalar(TRY_LOCK_REPAIR):
+            logger.debug('Task counters are being repaired by another worker')
+            return
+        async with database.sessions() as db:
+            corrected = await repair_task_stats(db, settings.task_stats_repair_batch)
+    if corrected:
+        logger.warning('Corrected the task counters of %d users', corrected)
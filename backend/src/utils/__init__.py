@@ -1,3 +1,21 @@
 """Define public exports for the current package."""
 
-__all__: list[str] = ['database']
+__all__: list[str] = [
+    'allocations',
+    'auth_events',
+    'bloom',
+    'cache',
+    'database',
+    'idempotency',
+    'instrumentation',
+    'jobs',
+    'metrics',
+    'push',
+    'rate_limit',
+    'replicas',
+    'response_cache',
+    'responses',
+    'tasks',
+    'tokens',
+    'user_cache',
+]
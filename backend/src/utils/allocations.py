@@ -0,0 +1,174 @@
+"""Allocation profiling of HTTP requests, per route.
+
+With ``ALLOCATION_PROFILING_ENABLED`` set, :mod:`tracemalloc` traces the
+worker and :class:`AllocationProfilerMiddleware` measures every request when
+its response ends: the peak of traced memory above the level at which the
+request started, and how much of it the request still holds. Every
+``ALLOCATION_PROFILING_SAMPLE``-th request also takes a snapshot at both
+ends, and the source lines that allocated the most in between are kept for
+its route. :meth:`AllocationProfiler.report` renders the numbers, and
+``/api/allocations`` serves them.
+
+tracemalloc makes Python several times slower and its counters belong to the
+whole process, so concurrent requests are attributed to each other. Profile
+a single worker under light load, not production traffic.
+"""
+
+import tracemalloc
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+TOP_LINES = 10
+
+# Allocations made by tracemalloc itself while taking a snapshot are not the request's.
+_IGNORED = (tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),)
+
+
+class RouteAllocations:
+    """Memory traced while serving the requests of one route."""
+
+    __slots__ = ('held', 'peak', 'requests', 'top')
+
+    def __init__(self) -> None:
+        """Start with no requests."""
+        self.requests = 0
+        self.peak = 0
+        self.held = 0
+        self.top: list[tracemalloc.StatisticDiff] = []
+
+
+class AllocationProfiler:
+    """Collects per-route allocation figures measured by :class:`AllocationProfilerMiddleware`."""
+
+    def __init__(self, sample_every: int, frames: int = 1) -> None:
+        """Configure the profiler; nothing is traced until :meth:`start`.
+
+        Args:
+            sample_every (int): Take snapshots on every n-th request; 1 snapshots every request.
+            frames (int): Frames kept per traced allocation; 1 attributes it to the allocating line.
+        """
+        self.sample_every = sample_every
+        self.frames = frames
+        self.routes: dict[tuple[str, str], RouteAllocations] = {}
+        self._seen = 0
+
+    @property
+    def tracing(self) -> bool:
+        """Whether tracemalloc is running."""
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        """Start tracing allocations, unless already traced."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        """Stop tracing and drop the traces; the collected figures are kept."""
+        tracemalloc.stop()
+
+    def reset(self) -> None:
+        """Forget the collected figures."""
+        self.routes.clear()
+        self._seen = 0
+
+    def sample_next(self) -> bool:
+        """Count a request and report whether it should take snapshots."""
+        self._seen += 1
+        return self._seen % self.sample_every == 0
+
+    def record(
+        self,
+        key: tuple[str, str],
+        peak: int,
+        held: int,
+        top: list[tracemalloc.StatisticDiff] | None = None,
+    ) -> None:
+        """Add one request to its route.
+
+        Args:
+            key (tuple[str, str]): Method and route template.
+            peak (int): Peak traced bytes above the level at the start of the request.
+            held (int): Traced bytes still allocated when the response ended, over the same level.
+            top (list[tracemalloc.StatisticDiff] | None): Largest allocating lines, if snapshots were taken.
+        """
+        route = self.routes.get(key)
+        if route is None:
+            route = self.routes[key] = RouteAllocations()
+        route.requests += 1
+        route.peak += peak
+        route.held += held
+        if top is not None:
+            route.top = top
+
+    def report(self) -> str:
+        """Render the mean allocation figures per request of every route, with their top lines.
+
+        Returns:
+            str: A plain text table.
+        """
+        lines = [f'{"route":<48} {"requests":>9} {"peak KiB/req":>13} {"held KiB/req":>13}']
+        for (method, path), route in sorted(self.routes.items(), key=lambda item: item[0][::-1]):
+            peak = route.peak / route.requests / 1024
+            held = route.held / route.requests / 1024
+            lines.append(f'{f"{method} {path}":<48} {route.requests:>9} {peak:>13.2f} {held:>13.2f}')
+            lines.extend(
+                f'    {diff.size_diff / 1024:>+9.2f} KiB {diff.count_diff:>+6} blocks  {diff.traceback[0]}'
+                for diff in route.top
+            )
+        return '\n'.join(lines) + '\n'
+
+
+class AllocationProfilerMiddleware:
+    """ASGI middleware measuring the traced memory of every HTTP request per route."""
+
+    def __init__(self, app: ASGIApp, profiler: AllocationProfiler) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            profiler (AllocationProfiler): Where the measurements are recorded.
+        """
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve one request and record the memory it allocated."""
+        if scope['type'] != 'http' or not self.profiler.tracing:
+            await self.app(scope, receive, send)
+            return
+
+        before = tracemalloc.take_snapshot() if self.profiler.sample_next() else None
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        measured: tuple[int, int] | None = None
+        top = None
+
+        def measure() -> tuple[int, int]:
+            nonlocal top
+            current, peak = tracemalloc.get_traced_memory()
+            if before is not None:
+                after = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+                diffs = after.compare_to(before.filter_traces(_IGNORED), 'lineno')
+                # Only growth is the request's; memory freed meanwhile belonged to earlier work.
+                top = [diff for diff in diffs if diff.size_diff > 0][:TOP_LINES]
+            return peak - start, current - start
+
+        async def send_measured(message: Message) -> None:
+            nonlocal measured
+            # Measured before the last body chunk is sent, while the request's objects are still alive.
+            if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                measured = measure()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            peak, held = measured if measured is not None else measure()
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            self.profiler.record((scope['method'], path), peak, max(held, 0), top)
+
+
+allocation_profiler = AllocationProfiler(sample_every=settings.allocation_profiling_sample)
@@ -0,0 +1,158 @@
+"""Database utility functions for the audit log of authentication events."""
+
+import re
+import uuid
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Row, bindparam, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import AuthEvent
+
+PARTITION_NAME = re.compile(r'auth_event_p(\d{4})_(\d{2})')
+DEFAULT_PARTITION = 'auth_event_default'
+LIST_PARTITIONS = text(
+    'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+    "WHERE i.inhparent = 'auth_event'::regclass"
+)
+PARTITION_EXISTS = text('SELECT to_regclass(:name) IS NOT NULL')
+# Serializes partition maintenance of concurrent workers for the rest of the transaction.
+LOCK_MAINTENANCE = text("SELECT pg_advisory_xact_lock(hashtext('auth_event_partitions'))")
+LOCK_DEFAULT = text(f'LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE')
+DEFAULT_HAS_ROWS = text(
+    f'SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} WHERE occurred_at >= :start AND occurred_at < :end)'
+)
+PURGE_DEFAULT = text(f'DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at < :cutoff')
+# Served by ix_auth_event_username_occurred_at alone: every filtered and selected column is in the index.
+RECENT_AUTH_EVENTS = (
+    select(AuthEvent.occurred_at, AuthEvent.kind, AuthEvent.client_ip, AuthEvent.detail)
+    .where(AuthEvent.username == bindparam('username'), AuthEvent.user_id == bindparam('user_id'))
+    .order_by(AuthEvent.occurred_at.desc())
+    .limit(bindparam('limit'))
+)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """Return the first instant of the month ``months`` after the month of ``moment``, in UTC.
+
+    Args:
+        moment (datetime): Any timezone-aware instant.
+        months (int): Months to move forward; negative moves back.
+
+    Returns:
+        datetime: Midnight UTC on the first day of the target month.
+    """
+    moment = moment.astimezone(UTC)
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+async def insert_auth_events(db: AsyncSession, rows: Sequence[dict[str, Any]], chunk_rows: int) -> None:
+    """Insert events with multi-row INSERTs of up to ``chunk_rows`` rows, committed together.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        rows (Sequence[dict[str, Any]]): Column values of the events.
+        chunk_rows (int): Rows per statement.
+    """
+    for start in range(0, len(rows), chunk_rows):
+        await db.execute(insert(AuthEvent).values(rows[start : start + chunk_rows]))
+    await db.commit()
+
+
+async def recent_auth_events(
+    db: AsyncSession, username: str, user_id: uuid.UUID, limit: int, before: datetime | None = None
+) -> list[Row]:
+    """Return the newest events of a user, newest first.
+
+    Only events recorded with the user's id are returned, so attempts made for
+    the username before the account existed stay private.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        username (str): The username the events were recorded for.
+        user_id (uuid.UUID): The user the events were recorded for.
+        limit (int): Maximum number of events.
+        before (datetime | None): Only return events older than this instant.
+
+    Returns:
+        list[Row]: Rows with ``occurred_at``, ``kind``, ``client_ip`` and ``detail``.
+    """
+    stmt = RECENT_AUTH_EVENTS
+    if before is not None:
+        stmt = stmt.where(AuthEvent.occurred_at < before)
+    result = await db.execute(stmt, {'username': username, 'user_id': user_id, 'limit': limit})
+    return list(result.all())
+
+
+async def create_monthly_partitions(db: AsyncSession, now: datetime, months_ahead: int = 1) -> list[str]:
+    """Create the partitions of the current and the next ``months_ahead`` months if they are missing.
+
+    Events of a month without a partition land in ``auth_event_default``, and
+    Postgres refuses to create a partition for rows the default partition
+    already holds. Such rows are moved into a new table that is then attached
+    as the month's partition. Each month is committed on its own.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        now (datetime): The current instant.
+        months_ahead (int): Future months to prepare.
+
+    Returns:
+        list[str]: Names of the partitions that exist afterwards.
+    """
+    names = []
+    for offset in range(months_ahead + 1):
+        start, end = add_months(now, offset), add_months(now, offset + 1)
+        name = f'auth_event_p{start.year:04d}_{start.month:02d}'
+        # Bounds are generated here, never taken from input, so formatting them in is safe.
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        await db.execute(LOCK_MAINTENANCE)
+        if not await db.scalar(PARTITION_EXISTS, {'name': name}):
+            await db.execute(LOCK_DEFAULT)
+            if await db.scalar(DEFAULT_HAS_ROWS, {'start': start, 'end': end}):
+                await db.execute(text(f'CREATE TABLE {name} (LIKE auth_event)'))
+                await db.execute(
+                    text(
+                        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} '
+                        'WHERE occurred_at >= :start AND occurred_at < :end RETURNING *) '
+                        f'INSERT INTO {name} SELECT * FROM moved'
+                    ),
+                    {'start': start, 'end': end},
+                )
+                await db.execute(text(f'ALTER TABLE auth_event ATTACH PARTITION {name} {bounds}'))
+            else:
+                await db.execute(text(f'CREATE TABLE {name} PARTITION OF auth_event {bounds}'))
+        await db.commit()
+        names.append(name)
+    return names
+
+
+async def drop_expired_partitions(db: AsyncSession, now: datetime, retention_months: int) -> list[str]:
+    """Drop monthly partitions that ended more than ``retention_months`` months before the current month.
+
+    Events that expired in ``auth_event_default``, which is never dropped, are deleted.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        now (datetime): The current instant.
+        retention_months (int): Complete months of events to keep besides the current one.
+
+    Returns:
+        list[str]: Names of the dropped partitions.
+    """
+    cutoff = add_months(now, -retention_months)
+    dropped = []
+    for name in (await db.execute(LIST_PARTITIONS)).scalars().all():
+        match = PARTITION_NAME.fullmatch(name)
+        if match is None:
+            continue
+        start = datetime(int(match[1]), int(match[2]), 1, tzinfo=UTC)
+        if add_months(start, 1) <= cutoff:
+            await db.execute(text(f'DROP TABLE IF EXISTS {name}'))
+            dropped.append(name)
+    await db.execute(PURGE_DEFAULT, {'cutoff': cutoff})
+    await db.commit()
+    return dropped
@@ -0,0 +1,49 @@
+"""Fixed-size Bloom filter for string keys."""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Set membership test that may answer a false "yes" but never a false "no".
+
+    The filter is sized up front for ``capacity`` keys at ``error_rate``
+    false positives. Adding more keys keeps every answer for added keys
+    correct but raises the false positive rate. Keys cannot be removed.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """Allocate the bit array.
+
+        Args:
+            capacity (int): Number of keys the filter is sized for.
+            error_rate (float): Target false positive rate at ``capacity`` keys.
+        """
+        capacity = max(1, capacity)
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def __len__(self) -> int:
+        """Return the number of keys added, counting repeated keys every time."""
+        return self.count
+
+    def __contains__(self, key: str) -> bool:
+        """Report whether ``key`` may have been added."""
+        array = self._array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key: str) -> None:
+        """Add ``key`` to the filter."""
+        array = self._array
+        for position in self._positions(key):
+            array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing: two 64-bit halves of one digest give all bit positions.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.bits for index in range(self.hashes)]
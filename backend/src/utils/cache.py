@@ -0,0 +1,135 @@
+"""In-process and shared cache primitives."""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+MISSING: Any = object()
+
+
+class LRUCache:
+    """Size-bounded LRU cache with per-entry expiry.
+
+    ``None`` is a valid cached value, so lookups return :data:`MISSING` when
+    nothing is stored for a key. Expired entries are dropped lazily on access.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept before evicting the oldest.
+            ttl (float): Default time to live of an entry, in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones not yet dropped."""
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:  # noqa: ANN401
+        """Look up a key and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any: The cached value, or :data:`MISSING` if absent or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        """Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store; ``None`` is allowed.
+            ttl (float | None): Time to live in seconds, defaults to the cache TTL.
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if it is present.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and keep the counters."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss and eviction counters together with the current size."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._data)}
+
+
+class CacheBackend(ABC):
+    """Interface for a cache shared between workers.
+
+    Values must be JSON-compatible so that a network store can hold them.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:  # noqa: ANN401
+        """Return the stored value or :data:`MISSING`."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:  # noqa: ANN401
+        """Store a value for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a key if it is present."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local stand-in for a shared cache backend."""
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self._data: dict[str, tuple[float, Any]] = {}
+
+    async def get(self, key: str) -> Any:  # noqa: ANN401
+        """Return the stored value or :data:`MISSING`."""
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return MISSING
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:  # noqa: ANN401
+        """Store a value for ``ttl`` seconds."""
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        """Remove a key if it is present."""
+        self._data.pop(key, None)
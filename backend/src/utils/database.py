@@ -1,32 +1,88 @@
 """Database utility functions for managing User entities."""
 
-from sqlalchemy import select
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import bindparam, select, text, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
 
+from .cache import MISSING
+from .response_cache import response_cache
+from .user_cache import UserRecord, user_cache
+
+# Hot statements are built once. SQLAlchemy memoizes the cache key of a
+# statement object, so executing one of these skips statement construction and
+# cache key generation and goes straight to the compiled cache; asyncpg then
+# reuses the prepared statement of the same SQL text on each connection.
+# The user statements select columns rather than the entity: authentication
+# only reads them, and plain rows skip the identity map and instance state.
+USER_COLUMNS = (User.id, User.username, User.password)
+USER_BY_USERNAME = select(*USER_COLUMNS).where(User.username == bindparam('username'))
+INSERT_USER = (
+    insert(User)
+    .values(username=bindparam('name'), password=bindparam('password_hash'))
+    .on_conflict_do_nothing(index_elements=[User.username])
+    .returning(*USER_COLUMNS)
+)
+UPDATE_USER_PASSWORD = (
+    update(User)
+    .where(User.id == bindparam('user_id'))
+    .values(password=bindparam('password_hash'))
+    .execution_options(synchronize_session=False)
+)
+
 
-async def get_user_by_username(db: AsyncSession, username: str) -> User:
+async def get_user_by_username(db: AsyncSession, username: str) -> UserRecord | None:
     """Retrieve a user from the database by their username.
 
+    Usernames cached as missing by :data:`user_cache` are answered without a
+    query. Existing users are always read, so the password hash is current.
+
     Args:
         db (AsyncSession): The active SQLAlchemy asynchronous session.
         username (str): The username to search for.
 
     Returns:
-        User | None: The User object if found, otherwise None.
+        UserRecord | None: The user if found, otherwise None.
     """
-    user = await db.execute(select(User).where(User.username == username))
-    return user.scalar_one_or_none()
+    cached = await user_cache.get(username)
+    if cached is None:
+        return None
+
+    result = await db.execute(USER_BY_USERNAME, {'username': username})
+    row = result.one_or_none()
+    user = UserRecord(*row) if row is not None else None
+    if cached is MISSING:
+        await user_cache.set(username, user.id if user is not None else None)
+    return user
 
 
-async def create_user(db: AsyncSession, username: str, password_hash: str) -> User:
+async def is_known_username(username: str) -> bool:
+    """Check whether a username is cached as taken, without querying the database.
+
+    A False result means "unknown", not "free"; the insert itself is the
+    authoritative check.
+
+    Args:
+        username (str): The username to check.
+
+    Returns:
+        bool: True if the user cache holds an existing user with this username.
+    """
+    cached = await user_cache.get(username)
+    return cached is not MISSING and cached is not None
+
+
+async def create_user(db: AsyncSession, username: str, password_hash: str) -> UserRecord | None:
     """Create a new user in the database.
 
-    Uses PostgreSQL's `INSERT ... ON CONFLICT DO NOTHING` to avoid inserting
-    a duplicate user with the same username. If the user already exists,
-    no new record is created and None is returned.
+    Uses PostgreSQL's `INSERT ... ON CONFLICT DO NOTHING ... RETURNING` so that
+    creation and the duplicate check happen in one atomic statement: a
+    returned row means the user was created, no row means the username
+    already exists.
 
     Args:
         db (AsyncSession): The active SQLAlchemy asynchronous session.
@@ -34,15 +90,87 @@ async def create_user(db: AsyncSession, username: str, password_hash: str) -> Us
         password_hash (str): The hashed password for the new user.
 
     Returns:
-        User | None: The newly created User object if successful,
+        UserRecord | None: The newly created user if successful,
         otherwise None (e.g., if the username already exists).
     """
-    stmt = (
-        insert(User)
-        .values(username=username, password=password_hash)
-        .on_conflict_do_nothing(index_elements=[User.username])
-        .returning(User)
+    result = await db.execute(INSERT_USER, {'name': username, 'password_hash': password_hash})
+    await db.commit()
+    row = result.one_or_none()
+    user = UserRecord(*row) if row is not None else None
+    if user is not None:
+        await user_cache.set(username, user.id)
+    else:
+        await user_cache.invalidate(username)
+    return user
+
+
+async def create_users(db: AsyncSession, users: Sequence[tuple[str, str]], use_copy: bool = False) -> list[str]:
+    """Create many users in one transaction, skipping usernames that already exist.
+
+    By default the rows are sent as one executemany, which SQLAlchemy batches
+    into multi-row ``INSERT ... VALUES`` statements. With ``use_copy`` the rows
+    are streamed with ``COPY`` into a temporary table and moved over with a
+    single ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``, which is faster for
+    large imports but requires the asyncpg driver.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        users (Sequence[tuple[str, str]]): Pairs of username and password hash.
+        use_copy (bool): Whether to load the rows with ``COPY``.
+
+    Returns:
+        list[str]: Usernames that were created.
+    """
+    if not users:
+        return []
+
+    if use_copy:
+        created = await _copy_users(db, users)
+    else:
+        stmt = insert(User).on_conflict_do_nothing(index_elements=[User.username]).returning(User.username)
+        params = [{'id': uuid.uuid4(), 'username': username, 'password': password} for username, password in users]
+        result = await db.execute(stmt, params)
+        created = list(result.scalars())
+    await db.commit()
+
+    for username, _ in users:
+        await user_cache.invalidate(username)
+    return created
+
+
+async def _copy_users(db: AsyncSession, users: Sequence[tuple[str, str]]) -> list[str]:
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    if not hasattr(driver, 'copy_records_to_table'):
+        raise ValueError('COPY import requires the asyncpg driver')
+
+    await db.execute(text('CREATE TEMP TABLE user_import (LIKE "user" INCLUDING DEFAULTS) ON COMMIT DROP'))
+    await driver.copy_records_to_table(
+        'user_import',
+        records=[(uuid.uuid4(), username, password) for username, password in users],
+        columns=['id', 'username', 'password'],
+    )
+    result = await db.execute(
+        text(
+            'INSERT INTO "user" (id, username, password) '
+            'SELECT id, username, password FROM user_import '
+            'ON CONFLICT (username) DO NOTHING RETURNING username'
+        )
     )
-    result = await db.execute(stmt)
+    return list(result.scalars())
+
+
+async def update_user_password(db: AsyncSession, user: UserRecord, password_hash: str) -> None:
+    """Replace the stored password hash of a user.
+
+    Used to transparently upgrade legacy or weaker hashes after a successful login.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        user (UserRecord): The user to update.
+        password_hash (str): The new hashed password.
+    """
+    await db.execute(UPDATE_USER_PASSWORD, {'user_id': user.id, 'password_hash': password_hash})
     await db.commit()
-    return result.scalar_one_or_none()
+    await response_cache.invalidate(user.id)
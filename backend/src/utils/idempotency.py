@@ -0,0 +1,403 @@
+"""Replay of retried requests that carry an ``Idempotency-Key`` header.
+
+:class:`IdempotencyMiddleware` runs the first ``POST`` with a given key and
+stores its response; a retry with the same key gets that response back
+without reaching the handler, marked with ``Idempotent-Replayed: true``.
+Keys are scoped to the method, path and credentials of the request, so two
+clients picking the same key do not see each other's responses. Reusing a
+key for a different body is rejected with 422.
+
+Requests with the same key that arrive while the first one is still running
+wait for its result instead of running again. Within a worker they await
+the first request's future. With the Postgres store, the first worker also
+claims the key in the ``idempotency_key`` table, and other workers poll the
+row until the response is stored. After ``IDEMPOTENCY_WAIT`` seconds they
+give up with 409, which the client retries like a lost response.
+
+Only final answers are stored. Server errors and answers that ask for a
+retry (408, 409, 425, 429) release the key, so the next retry runs the
+handler. So does an exception in the handler.
+
+The in-memory store is a bounded LRU per worker. With several workers and
+no sticky sessions a retry can reach another worker, so use the database
+store to deduplicate across them.
+"""
+
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from typing import Any
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.database import database
+from src.models import IdempotencyKey
+
+from .cache import MISSING, LRUCache
+from .jobs import job_queue
+
+MAX_KEY_LENGTH = 255
+# Answers that tell the client to try again later are not the request's outcome.
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429})
+# Cookie names of fastapi_jwt; a request authenticated by cookie is scoped to its token.
+CREDENTIAL_COOKIES = ('access_token_cookie', 'refresh_token_cookie')
+REPLAYED_HEADER = (b'idempotent-replayed', b'true')
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when another worker is still running a request with the same key."""
+
+
+class StoredResponse:
+    """A complete response, kept to answer retries of the request that produced it."""
+
+    __slots__ = ('body', 'fingerprint', 'headers', 'status')
+
+    def __init__(self, fingerprint: str, status: int, headers: list[tuple[bytes, bytes]], body: bytes) -> None:
+        """Hold the response.
+
+        Args:
+            fingerprint (str): Digest of the request body the response answers.
+            status (int): The HTTP status code.
+            headers (list[tuple[bytes, bytes]]): The raw response headers.
+            body (bytes): The complete response body.
+        """
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class IdempotencyStore(ABC):
+    """Where responses, and keys being worked on, are kept."""
+
+    @abstractmethod
+    async def get(self, key: str) -> StoredResponse | None:
+        """Return the stored response for a key, or None if there is none yet."""
+
+    @abstractmethod
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        """Reserve a key for this worker; False if another worker is running it."""
+
+    @abstractmethod
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """Store the response of a claimed key."""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Give up a claimed key without a response."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Responses in an in-process LRU; concurrent requests are coalesced by the middleware."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Create an empty store.
+
+        Args:
+            maxsize (int): Maximum number of stored responses.
+            ttl (float): Seconds a response is replayed.
+        """
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> StoredResponse | None:
+        """Return the stored response for a key, or None if there is none yet."""
+        response = self.local.get(key)
+        return None if response is MISSING else response
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        """Reserve a key; the worker's own in-flight requests are the only competitors."""
+        return True
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """Store the response of a claimed key."""
+        self.local.set(key, response)
+
+    async def release(self, key: str) -> None:
+        """Give up a claimed key without a response."""
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Responses and claims in the ``idempotency_key`` table, shared by all workers."""
+
+    def __init__(self, sessions: Callable[[], async_sessionmaker[AsyncSession]], ttl: float, lease: float) -> None:
+        """Configure the store.
+
+        Args:
+            sessions (Callable[[], async_sessionmaker[AsyncSession]]): Returns the session factory; called on use.
+            ttl (float): Seconds a response is replayed.
+            lease (float): Seconds a claim holds before another worker may take the key over.
+        """
+        self.sessions = sessions
+        self.ttl = ttl
+        self.lease = lease
+
+    async def get(self, key: str) -> StoredResponse | None:
+        """Return the stored response for a key, or None if there is none yet."""
+        stmt = select(IdempotencyKey).where(
+            IdempotencyKey.key == key, IdempotencyKey.status.is_not(None), IdempotencyKey.expires_at > func.now()
+        )
+        async with self.sessions()() as db:
+            row = await db.scalar(stmt)
+        if row is None:
+            return None
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in row.headers or ()]
+        return StoredResponse(row.fingerprint, row.status, headers, row.body or b'')
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        """Insert a claim, or take over one that expired or was abandoned by its worker."""
+        values = {
+            'fingerprint': fingerprint,
+            'status': None,
+            'headers': None,
+            'body': None,
+            'locked_until': func.now() + timedelta(seconds=self.lease),
+            'expires_at': func.now() + timedelta(seconds=self.ttl),
+        }
+        stmt = (
+            insert(IdempotencyKey)
+            .values(key=key, **values)
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.key],
+                set_=values,
+                where=(IdempotencyKey.expires_at <= func.now())
+                | (IdempotencyKey.status.is_(None) & (IdempotencyKey.locked_until <= func.now())),
+            )
+            .returning(IdempotencyKey.key)
+        )
+        async with self.sessions()() as db:
+            claimed = await db.scalar(stmt)
+            await db.commit()
+        return claimed is not None
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """Store the response of a claimed key."""
+        headers = [[name.decode('latin-1'), value.decode('latin-1')] for name, value in response.headers]
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(status=response.status, headers=headers, body=response.body)
+        )
+        async with self.sessions()() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+    async def release(self, key: str) -> None:
+        """Delete the claim so that the next retry runs the request."""
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status.is_(None))
+        async with self.sessions()() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+
+async def purge_expired_keys(db: AsyncSession) -> int:
+    """Delete stored responses and claims past their expiry.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+    result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now()))
+    await db.commit()
+    return result.rowcount
+
+
+@job_queue.register('purge_idempotency_keys')
+async def purge_expired(_: list[Any]) -> None:
+    """Delete expired idempotency keys."""
+    async with database.sessions() as db:
+        await purge_expired_keys(db)
+
+
+def scope_key(scope: Scope, idempotency_key: str) -> str:
+    """Derive the store key of a request from its key header, route and credentials.
+
+    Args:
+        scope (Scope): The ASGI scope of the request.
+        idempotency_key (str): The value of the ``Idempotency-Key`` header.
+
+    Returns:
+        str: A hex digest.
+    """
+    digest = hashlib.sha256()
+    for part in (scope['method'], scope['path'], idempotency_key):
+        digest.update(part.encode() + b'\0')
+    cookies = SimpleCookie()
+    for name, value in scope['headers']:
+        if name == b'authorization':
+            digest.update(value + b'\0')
+        elif name == b'cookie':
+            cookies.load(value.decode('latin-1'))
+    for name in CREDENTIAL_COOKIES:
+        if name in cookies:
+            digest.update(f'{name}={cookies[name].value}'.encode() + b'\0')
+    return digest.hexdigest()
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware answering retried ``POST`` requests from an :class:`IdempotencyStore`."""
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, wait: float, max_body: int) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            store (IdempotencyStore): Where responses are kept.
+            wait (float): Seconds to wait for another worker running the same key before answering 409.
+            max_body (int): Largest request body accepted with a key, and largest response body stored.
+        """
+        self.app = app
+        self.store = store
+        self.wait = wait
+        self.max_body = max_body
+        self._in_flight: dict[str, asyncio.Future[StoredResponse | None]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve one request, replaying the stored response of a retry."""
+        idempotency_key = None
+        if scope['type'] == 'http' and scope['method'] == 'POST':
+            idempotency_key = next((v for n, v in scope['headers'] if n == b'idempotency-key'), None)
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            detail = f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters'
+            await JSONResponse({'detail': detail}, status.HTTP_400_BAD_REQUEST)(scope, receive, send)
+            return
+        body = await self._read_body(receive)
+        if body is None:
+            detail = 'Request body too large for an Idempotency-Key'
+            await JSONResponse({'detail': detail}, status.HTTP_413_CONTENT_TOO_LARGE)(scope, receive, send)
+            return
+
+        key = scope_key(scope, idempotency_key.decode('latin-1'))
+        fingerprint = hashlib.sha256(body).hexdigest()
+        sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return await receive()
+
+        while (pending := self._in_flight.get(key)) is not None:
+            # None means the first request did not produce a response to share; run this one instead.
+            response = await asyncio.shield(pending)
+            if response is not None:
+                await self._replay(response, fingerprint, scope, receive, send)
+                return
+
+        future: asyncio.Future[StoredResponse | None] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        response = None
+        try:
+            response = await self._stored_or_claim(key, fingerprint)
+            if response is None:
+                response = await self._run(key, fingerprint, scope, replay_receive, send)
+                return
+        except IdempotencyConflictError:
+            detail = 'A request with this Idempotency-Key is still being processed'
+            conflict = JSONResponse({'detail': detail}, status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+            await conflict(scope, receive, send)
+            return
+        finally:
+            del self._in_flight[key]
+            future.set_result(response)
+        await self._replay(response, fingerprint, scope, receive, send)
+
+    async def _read_body(self, receive: Receive) -> bytes | None:
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            more_body = message.get('more_body', False)
+        return b''.join(chunks)
+
+    async def _stored_or_claim(self, key: str, fingerprint: str) -> StoredResponse | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait
+        delay = 0.05
+        while True:
+            response = await self.store.get(key)
+            if response is not None:
+                return response
+            if await self.store.claim(key, fingerprint):
+                return None
+            if loop.time() >= deadline:
+                raise IdempotencyConflictError
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    async def _run(
+        self, key: str, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> StoredResponse | None:
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+        size = 0
+
+        async def send_recording(message: Message) -> None:
+            nonlocal status_code, headers, size
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = list(message.get('headers', ()))
+            elif message['type'] == 'http.response.body':
+                chunk = message.get('body', b'')
+                size += len(chunk)
+                if size <= self.max_body:
+                    chunks.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_recording)
+        except BaseException:
+            await self.store.release(key)
+            raise
+
+        if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR or status_code in RETRYABLE_STATUSES:
+            await self.store.release(key)
+            return None
+        if size > self.max_body:
+            # Too large to keep: the claim is dropped and a retry runs the request again.
+            await self.store.release(key)
+            return None
+        response = StoredResponse(fingerprint, status_code, headers, b''.join(chunks))
+        await self.store.save(key, response)
+        return response
+
+    async def _replay(
+        self, response: StoredResponse, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if response.fingerprint != fingerprint:
+            detail = 'Idempotency-Key was already used for a different request'
+            await JSONResponse({'detail': detail}, status.HTTP_422_UNPROCESSABLE_CONTENT)(scope, receive, send)
+            return
+        headers = [*response.headers, REPLAYED_HEADER]
+        await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.body})
+
+
+idempotency_store: IdempotencyStore = (
+    DatabaseIdempotencyStore(lambda: database.sessions, ttl=settings.idempotency_ttl, lease=settings.idempotency_lease)
+    if settings.idempotency_backend == 'database'
+    else MemoryIdempotencyStore(maxsize=settings.idempotency_cache_size, ttl=settings.idempotency_ttl)
+)
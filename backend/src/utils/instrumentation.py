@@ -0,0 +1,124 @@
+"""Per-request latency and database query instrumentation.
+
+:class:`MetricsMiddleware` times every HTTP request and records it per route
+template. :func:`instrument_engine` attaches cursor listeners that count
+queries and database time, both globally and for the request being served,
+so the middleware can report them in a ``Server-Timing`` header.
+
+Nothing here is installed unless ``METRICS_ENABLED`` is set; with the feature
+off the request path carries no extra code at all.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import Counter, Histogram, registry
+
+QUERY_BUCKETS: tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+request_seconds = registry.register(
+    Histogram('http_request_duration_seconds', 'HTTP request latency by route.', ('method', 'route', 'status'))
+)
+request_db_seconds = registry.register(
+    Histogram('http_request_db_seconds', 'Database time spent per HTTP request by route.', ('method', 'route'))
+)
+db_queries = registry.register(Counter('db_queries_total', 'Statements executed on the database.'))
+db_query_seconds = registry.register(
+    Histogram('db_query_seconds', 'Latency of single database statements.', buckets=QUERY_BUCKETS)
+)
+
+
+class RequestStats:
+    """Database work done while serving one request."""
+
+    __slots__ = ('db_seconds', 'queries')
+
+    def __init__(self) -> None:
+        """Start with no queries."""
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar('current_request', default=None)
+
+
+def _before_cursor_execute(conn: Connection, *_: Any) -> None:  # noqa: ANN401
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, *_: Any) -> None:  # noqa: ANN401
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    db_queries.inc()
+    db_query_seconds.observe(elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    if context.connection is not None and context.connection.info.get('query_started'):
+        context.connection.info['query_started'].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count queries and database time of every statement run through ``engine``.
+
+    Args:
+        engine (Engine): The engine, ``AsyncEngine.sync_engine`` for async engines.
+    """
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route and DB work per request."""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            server_timing (bool): Add a ``Server-Timing`` header with app and DB time.
+        """
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve one request and record its timings."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if self.server_timing:
+                    app_ms = (time.perf_counter() - started) * 1000
+                    db = f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries"'
+                    timing = f'app;dur={app_ms:.2f}, {db}'.encode()
+                    message['headers'] = [*message.get('headers', ()), (b'server-timing', timing)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            method = scope['method']
+            request_seconds.observe(time.perf_counter() - started, (method, path, str(status)))
+            request_db_seconds.observe(stats.db_seconds, (method, path))
@@ -0,0 +1,360 @@
+"""In-process queue for work deferred out of the request, with an optional durable table.
+
+Handlers are registered per job kind and receive a list of payloads, so
+similar jobs are combined: a kind with ``batch_size`` > 1 collects payloads
+for up to ``batch_interval`` seconds and hands them over together, for
+example to write audit rows with one multi-row INSERT. Handlers run as tasks
+on the event loop, at most ``concurrency`` at once across all kinds.
+:meth:`JobQueue.submit` never blocks the request: once ``max_pending``
+payloads are waiting, further ones are dropped and counted.
+:meth:`JobQueue.every` submits a kind periodically, for maintenance that must
+keep up with a long-running worker.
+
+In-memory jobs are lost if the process dies. Work that must survive a
+restart is written to the ``job`` table with :meth:`JobQueue.enqueue`, in the
+transaction of the write that caused it. When the queue is started with a
+session factory it polls the table and claims due rows with ``SELECT ... FOR
+UPDATE SKIP LOCKED``. The row locks are held while the handler runs, so no
+two workers handle a row at once, and a crash or shutdown releases the rows
+for another attempt: durable handlers must be idempotent.
+
+:meth:`JobQueue.drain` runs on shutdown. It stops accepting jobs, flushes
+partial batches and waits up to ``drain_timeout`` for running handlers.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any, NamedTuple
+
+from sqlalchemy import Interval, bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.models import Job
+
+from .metrics import Counter, Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[list[Any]], Awaitable[None]]
+
+jobs_completed = registry.register(Counter('jobs_completed_total', 'Job payloads handled successfully.', ('kind',)))
+jobs_failed = registry.register(Counter('jobs_failed_total', 'Job payloads whose handler raised.', ('kind',)))
+jobs_dropped = registry.register(
+    Counter('jobs_dropped_total', 'Job payloads rejected because the queue was full or stopping.', ('kind',))
+)
+
+INSERT_JOB = insert(Job).values(
+    kind=bindparam('kind'),
+    payload=bindparam('payload', type_=JSONB(none_as_null=True)),
+    run_at=func.now() + bindparam('delay', type_=Interval),
+)
+CLAIM_JOBS = (
+    select(Job.id, Job.payload)
+    .where(Job.kind == bindparam('kind'), Job.run_at <= func.now(), Job.attempts < bindparam('max_attempts'))
+    .order_by(Job.run_at)
+    .limit(bindparam('limit'))
+    .with_for_update(skip_locked=True)
+)
+DELETE_JOBS = delete(Job).where(Job.id.in_(bindparam('ids', expanding=True)))
+# Linear backoff: the n-th retry waits n times retry_delay.
+RETRY_JOBS = (
+    update(Job)
+    .where(Job.id.in_(bindparam('ids', expanding=True)))
+    .values(
+        attempts=Job.attempts + 1,
+        run_at=func.now() + (Job.attempts + 1) * bindparam('retry_delay', type_=Interval),
+        last_error=bindparam('error'),
+    )
+)
+
+
+class JobKind(NamedTuple):
+    """A registered job kind."""
+
+    handler: Handler
+    batch_size: int
+    batch_interval: float
+
+
+class JobQueue:
+    """Bounded asyncio job queue with per-kind batching and graceful drain."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        concurrency: int,
+        max_pending: int,
+        drain_timeout: float,
+        *,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        retry_delay: float = 30.0,
+    ) -> None:
+        """Configure the queue; nothing runs until :meth:`start`.
+
+        Args:
+            concurrency (int): Handlers running at once, across all kinds.
+            max_pending (int): In-memory payloads queued or running before new ones are dropped.
+            drain_timeout (float): Seconds :meth:`drain` waits for outstanding jobs.
+            poll_interval (float): Seconds between polls of an empty durable table.
+            max_attempts (int): Runs of a durable job before it is left in the table.
+            retry_delay (float): Base delay of a failed durable job's next attempt, in seconds.
+        """
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.drain_timeout = drain_timeout
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.kinds: dict[str, JobKind] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._accepting = False
+        self._pending = 0
+        self._queues: dict[str, asyncio.Queue[Any]] = {}
+        self._workers: list[asyncio.Task[None]] = []
+        self._running: set[asyncio.Task[None]] = set()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._idle = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        """Number of in-memory payloads queued or running."""
+        return self._pending
+
+    def register(self, kind: str, batch_size: int = 1, batch_interval: float = 0.0) -> Callable[[Handler], Handler]:
+        """Register the decorated coroutine function as the handler of ``kind``.
+
+        Args:
+            kind (str): Name of the job kind, also stored in durable rows.
+            batch_size (int): Most payloads passed to one handler call.
+            batch_interval (float): Seconds to wait for a batch to fill after its first payload.
+
+        Returns:
+            Callable[[Handler], Handler]: Decorator returning the handler unchanged.
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            self.kinds[kind] = JobKind(handler, batch_size, batch_interval)
+            return handler
+
+        return decorator
+
+    def start(self, sessions: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Start one collector per kind on the running loop.
+
+        Args:
+            sessions (async_sessionmaker[AsyncSession] | None): Session factory; when given, the durable table is
+                polled as well.
+        """
+        self._loop = loop = asyncio.get_running_loop()
+        self._accepting = True
+        self._pending = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._queues = {kind: asyncio.Queue() for kind in self.kinds}
+        self._workers = [loop.create_task(self._collect(kind)) for kind in self.kinds]
+        if sessions is not None:
+            self._workers.append(loop.create_task(self._poll(sessions)))
+
+    def submit(self, kind: str, payload: Any = None) -> bool:  # noqa: ANN401
+        """Queue a payload for the handler of ``kind`` without waiting for it.
+
+        Starts the queue on the running loop if the lifespan has not.
+
+        Args:
+            kind (str): A registered job kind.
+            payload (Any): Passed to the handler in a list with others of its batch.
+
+        Returns:
+            bool: False if the payload was dropped because the queue is full or draining.
+
+        Raises:
+            ValueError: If ``kind`` has no handler.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f'Unknown job kind {kind!r}')
+        if self._loop is not asyncio.get_running_loop():
+            self.start()
+        if not self._accepting or self._pending >= self.max_pending:
+            jobs_dropped.inc(labels=(kind,))
+            return False
+        self._pending += 1
+        self._idle.clear()
+        self._queues[kind].put_nowait(payload)
+        return True
+
+    def every(self, kind: str, interval: float, payload: Any = None, delay: float = 0.0) -> None:  # noqa: ANN401
+        """Submit a job after ``delay`` seconds and then every ``interval`` seconds until :meth:`drain`.
+
+        Starts the queue on the running loop if the lifespan has not.
+
+        Args:
+            kind (str): A registered job kind.
+            interval (float): Seconds between submissions.
+            payload (Any): Passed to the handler each time.
+            delay (float): Seconds before the first submission.
+
+        Raises:
+            ValueError: If ``kind`` has no handler.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f'Unknown job kind {kind!r}')
+        if self._loop is not asyncio.get_running_loop():
+            self.start()
+        self._workers.append(asyncio.get_running_loop().create_task(self._repeat(kind, interval, payload, delay)))
+
+    async def run(self, kind: str, payload: Any = None) -> None:  # noqa: ANN401
+        """Run the handler of ``kind`` once in the caller's task, bypassing the queue.
+
+        Args:
+            kind (str): A registered job kind.
+            payload (Any): Passed to the handler in a list of its own.
+
+        Raises:
+            ValueError: If ``kind`` has no handler.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f'Unknown job kind {kind!r}')
+        await self.kinds[kind].handler([payload])
+
+    async def enqueue(self, db: AsyncSession, kind: str, payload: Any = None, delay: float = 0.0) -> None:  # noqa: ANN401
+        """Add a durable job in the caller's transaction; workers see it once the caller commits.
+
+        Args:
+            db (AsyncSession): The active SQLAlchemy asynchronous session.
+            kind (str): A registered job kind.
+            payload (Any): JSON-serializable payload.
+            delay (float): Seconds before the job becomes due.
+
+        Raises:
+            ValueError: If ``kind`` has no handler.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f'Unknown job kind {kind!r}')
+        await db.execute(INSERT_JOB, {'kind': kind, 'payload': payload, 'delay': timedelta(seconds=delay)})
+
+    async def drain(self) -> int:
+        """Stop accepting jobs, wait up to ``drain_timeout`` for queued and running ones, then stop the workers.
+
+        A durable job still running at the end is rolled back and retried later.
+
+        Returns:
+            int: Number of in-memory payloads abandoned because the timeout expired.
+        """
+        if self._loop is None or not self._accepting:
+            return 0
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), self.drain_timeout)
+        except TimeoutError:
+            logger.warning('Abandoning %d background jobs still pending at shutdown', self._pending)
+        abandoned = self._pending
+        tasks = [*self._workers, *self._running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        return abandoned
+
+    async def _collect(self, name: str) -> None:
+        kind = self.kinds[name]
+        queue = self._queues[name]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + kind.batch_interval
+            while len(batch) < kind.batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0 or not self._accepting:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except TimeoutError:
+                    break
+            await self._semaphore.acquire()
+            task = loop.create_task(self._run(name, kind.handler, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _repeat(self, kind: str, interval: float, payload: Any, delay: float) -> None:  # noqa: ANN401
+        await asyncio.sleep(delay)
+        while True:
+            self.submit(kind, payload)
+            await asyncio.sleep(interval)
+
+    async def _run(self, name: str, handler: Handler, batch: list[Any]) -> None:
+        try:
+            await handler(batch)
+        except Exception:
+            jobs_failed.inc(len(batch), labels=(name,))
+            logger.exception('Background job %s failed for %d payloads', name, len(batch))
+        else:
+            jobs_completed.inc(len(batch), labels=(name,))
+        finally:
+            self._semaphore.release()
+            self._pending -= len(batch)
+            if self._pending == 0:
+                self._idle.set()
+
+    async def _poll(self, sessions: async_sessionmaker[AsyncSession]) -> None:
+        while True:
+            claimed = 0
+            for name, kind in self.kinds.items():
+                try:
+                    claimed += await self.run_durable(sessions, name, kind)
+                except (OSError, SQLAlchemyError):
+                    logger.warning('Could not poll durable %s jobs', name, exc_info=True)
+            if not claimed:
+                await asyncio.sleep(self.poll_interval)
+
+    async def run_durable(self, sessions: async_sessionmaker[AsyncSession], name: str, kind: JobKind) -> int:
+        """Claim one batch of due ``name`` rows, run the handler and delete or reschedule them.
+
+        Args:
+            sessions (async_sessionmaker[AsyncSession]): Session factory.
+            name (str): The job kind.
+            kind (JobKind): Its registration.
+
+        Returns:
+            int: Number of rows claimed.
+        """
+        async with sessions.begin() as db:
+            params = {'kind': name, 'limit': kind.batch_size, 'max_attempts': self.max_attempts}
+            rows = (await db.execute(CLAIM_JOBS, params)).all()
+            if not rows:
+                return 0
+            ids = [row.id for row in rows]
+            async with self._semaphore:
+                try:
+                    await kind.handler([row.payload for row in rows])
+                except Exception as exc:
+                    jobs_failed.inc(len(rows), labels=(name,))
+                    logger.exception('Durable job %s failed for %d rows', name, len(rows))
+                    retry_delay = timedelta(seconds=self.retry_delay)
+                    await db.execute(RETRY_JOBS, {'ids': ids, 'retry_delay': retry_delay, 'error': repr(exc)})
+                else:
+                    jobs_completed.inc(len(rows), labels=(name,))
+                    await db.execute(DELETE_JOBS, {'ids': ids})
+        return len(rows)
+
+
+job_queue = JobQueue(
+    concurrency=settings.job_concurrency,
+    max_pending=settings.job_max_pending,
+    drain_timeout=settings.job_drain_timeout,
+    poll_interval=settings.job_poll_interval,
+    max_attempts=settings.job_max_attempts,
+    retry_delay=settings.job_retry_delay,
+)
+
+registry.register(
+    Gauge('job_queue_pending', 'In-memory background jobs queued or running.', callback=lambda: job_queue.pending)
+)
@@ -0,0 +1,218 @@
+"""Minimal in-process metrics in the Prometheus text exposition format.
+
+Metrics are plain objects registered on :data:`registry`. Label values are
+passed as a tuple in the order of ``labelnames`` to keep recording cheap on
+hot paths. Gauges may be backed by a callback that is evaluated at scrape
+time, which suits values such as pool occupancy that already live elsewhere.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Metric:
+    """Base class of all metric types."""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Describe the metric.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text shown next to the metric.
+            labelnames (tuple[str, ...]): Names of the labels, in recording order.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines of all samples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric with its HELP and TYPE header."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Create a counter starting at zero."""
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Increase the counter.
+
+        Args:
+            amount (float): The non-negative increment.
+            labels (Labels): Label values in ``labelnames`` order.
+        """
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current value for a label set."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines of all samples."""
+        for labels, value in self._values.items():
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {value}'
+
+
+class Gauge(Metric):
+    """Value that can go up and down, optionally computed at scrape time."""
+
+    type_name = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        callback: Callable[[], float] | None = None,
+    ) -> None:
+        """Create a gauge.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text shown next to the metric.
+            labelnames (tuple[str, ...]): Names of the labels, in recording order.
+            callback (Callable[[], float] | None): Evaluated on every scrape when given.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Set the gauge for a label set."""
+        self._values[labels] = value
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current value for a label set."""
+        if self.callback is not None:
+            return self.callback()
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines of all samples."""
+        if self.callback is not None:
+            yield f'{self.name} {self.callback()}'
+            return
+        for labels, value in self._values.items():
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {value}'
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create an empty histogram.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text shown next to the metric.
+            labelnames (tuple[str, ...]): Names of the labels, in recording order.
+            buckets (tuple[float, ...]): Sorted upper bounds; ``+Inf`` is implicit.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation.
+
+        Args:
+            value (float): The observed value.
+            labels (Labels): Label values in ``labelnames`` order.
+        """
+        series = self._series.get(labels)
+        if series is None:
+            # One slot per bucket plus +Inf, then sum and count.
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, labels: Labels = ()) -> int:
+        """Return the number of observations for a label set."""
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+
+    def sum(self, labels: Labels = ()) -> float:
+        """Return the sum of observations for a label set."""
+        series = self._series.get(labels)
+        return series[-2] if series else 0.0
+
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines of all samples."""
+        for labels, series in self._series.items():
+            cumulative = 0.0
+            for bound, hits in zip((*self.buckets, '+Inf'), series[:-2], strict=True):
+                cumulative += hits
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f'{self.name}_bucket{le} {cumulative}'
+            suffix = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{suffix} {series[-2]}'
+            yield f'{self.name}_count{suffix} {series[-1]}'
+
+
+M = TypeVar('M', bound=Metric)
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        """Add a metric, replacing any previous metric with the same name.
+
+        Args:
+            metric (Metric): The metric to expose.
+
+        Returns:
+            Metric: The same metric, for assignment at module level.
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Metric | None:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every registered metric in the text exposition format."""
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,315 @@
+"""Server push of task change notifications to a user's open connections.
+
+Every server-sent events stream of a user is a :class:`Subscription` with a
+bounded buffer. :meth:`PushHub.publish` encodes an event once and appends it
+to each of the user's subscriptions without waiting. A subscriber whose
+buffer is full is not keeping up, so it is closed rather than allowed to
+hold memory or delay the others; its client reconnects and catches up.
+
+Events only say that a user's tasks changed and carry the new change
+version. Clients fetch the changes themselves from ``/api/tasks/changes``,
+so a missed event costs at most one extra sync and never loses data. Every
+stream starts with an event without a version for the same reason.
+
+Each worker only knows its own connections. With the bridge enabled, task
+writes send ``NOTIFY`` in their transaction instead of publishing locally,
+and every worker ``LISTEN``s on one dedicated connection and publishes what
+it receives. Postgres delivers a notification only after its transaction
+commits, so no worker announces a change before it can be read.
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from collections import deque
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+
+from .metrics import Counter, Gauge, registry
+from .responses import dumps
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'task_changes'
+
+push_dropped = registry.register(
+    Counter('push_slow_consumers_dropped_total', 'Push connections closed because their buffer was full.')
+)
+
+
+def encode_event(version: int | None) -> bytes:
+    """Encode a task change event in the server-sent events format.
+
+    Args:
+        version (int | None): The user's new change version; None asks the client to sync.
+
+    Returns:
+        bytes: The event, terminated by a blank line.
+    """
+    return b'event: tasks\ndata: ' + dumps({'version': version}) + b'\n\n'
+
+
+class Subscription:
+    """Bounded buffer of events for one connection of a user."""
+
+    __slots__ = ('_events', '_wakeup', 'closed', 'user_id')
+
+    def __init__(self, user_id: uuid.UUID, maxsize: int) -> None:
+        """Create an open, empty subscription.
+
+        Args:
+            user_id (uuid.UUID): The user whose events are delivered.
+            maxsize (int): Most undelivered events before the subscriber counts as slow.
+        """
+        self.user_id = user_id
+        self.closed = False
+        self._events: deque[bytes] = deque(maxlen=maxsize)
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: bytes) -> bool:
+        """Buffer an event, closing the subscription instead if the buffer is full.
+
+        Args:
+            event (bytes): The encoded event.
+
+        Returns:
+            bool: False if the subscription is closed.
+        """
+        if self.closed:
+            return False
+        if len(self._events) == self._events.maxlen:
+            push_dropped.inc()
+            self.close()
+            return False
+        self._events.append(event)
+        self._wakeup.set()
+        return True
+
+    def close(self) -> None:
+        """End the subscription; buffered events are discarded."""
+        self.closed = True
+        self._events.clear()
+        self._wakeup.set()
+
+    async def get(self) -> bytes | None:
+        """Wait for the next event.
+
+        Returns:
+            bytes | None: The event, or None once the subscription is closed.
+        """
+        while not self._events:
+            if self.closed:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self._events.popleft()
+
+
+class PushHub:
+    """Fans events out to the subscriptions of each user, optionally across workers."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        max_per_user: int,
+        heartbeat_interval: float,
+        *,
+        bridge_url: str | None = None,
+        retry_delay: float = 5.0,
+    ) -> None:
+        """Configure the hub; the bridge is not connected until :meth:`start`.
+
+        Args:
+            queue_size (int): Buffered events per connection.
+            max_per_user (int): Connections per user; opening one more closes the oldest.
+            heartbeat_interval (float): Seconds between keep-alive comments on idle streams and bridge checks.
+            bridge_url (str | None): Postgres DSN to ``LISTEN`` on; None keeps events within this worker.
+            retry_delay (float): Seconds between attempts to reconnect the bridge.
+        """
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self.heartbeat_interval = heartbeat_interval
+        self.bridge_url = bridge_url
+        self.retry_delay = retry_delay
+        self._subscriptions: dict[uuid.UUID, dict[Subscription, None]] = {}
+        self._bridge: asyncio.Task[None] | None = None
+
+    @property
+    def bridged(self) -> bool:
+        """Whether events travel through Postgres ``NOTIFY``."""
+        return self.bridge_url is not None
+
+    @property
+    def connections(self) -> int:
+        """Number of open subscriptions in this worker."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, user_id: uuid.UUID) -> Subscription:
+        """Open a subscription to a user's events.
+
+        Args:
+            user_id (uuid.UUID): The authenticated user.
+
+        Returns:
+            Subscription: The new subscription; pass it to :meth:`unsubscribe` when the connection ends.
+        """
+        subscriptions = self._subscriptions.setdefault(user_id, {})
+        while len(subscriptions) >= self.max_per_user:
+            oldest = next(iter(subscriptions))
+            oldest.close()
+            del subscriptions[oldest]
+        subscription = Subscription(user_id, self.queue_size)
+        subscriptions[subscription] = None
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription and forget it.
+
+        Args:
+            subscription (Subscription): A subscription returned by :meth:`subscribe`.
+        """
+        subscription.close()
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.pop(subscription, None)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id: uuid.UUID, version: int | None) -> int:
+        """Deliver a change event to the user's subscriptions in this worker.
+
+        Args:
+            user_id (uuid.UUID): The user whose tasks changed.
+            version (int | None): The new change version; None asks the clients to sync.
+
+        Returns:
+            int: Number of subscriptions the event was buffered for.
+        """
+        subscriptions = self._subscriptions.get(user_id)
+        if not subscriptions:
+            return 0
+        event = encode_event(version)
+        delivered = 0
+        for subscription in list(subscriptions):
+            if subscription.push(event):
+                delivered += 1
+            else:
+                self.unsubscribe(subscription)
+        return delivered
+
+    def resync(self) -> None:
+        """Ask every client of this worker to sync, after events may have been missed."""
+        for user_id in list(self._subscriptions):
+            self.publish(user_id, None)
+
+    async def notify(self, db: AsyncSession, user_id: uuid.UUID, version: int) -> None:
+        """Announce a change to every worker once the session's transaction commits.
+
+        Args:
+            db (AsyncSession): The session that wrote the change, before commit.
+            user_id (uuid.UUID): The user whose tasks changed.
+            version (int): The new change version.
+        """
+        await db.execute(select(func.pg_notify(CHANNEL, f'{user_id}:{version}')))
+
+    async def stream(self, user_id: uuid.UUID) -> AsyncGenerator[bytes, None]:
+        """Yield the server-sent events of one connection until it is closed.
+
+        Args:
+            user_id (uuid.UUID): The authenticated user.
+
+        Yields:
+            bytes: Encoded events and keep-alive comments.
+        """
+        subscription = self.subscribe(user_id)
+        try:
+            yield b'retry: 3000\n\n' + encode_event(None)
+            while True:
+                try:
+                    # A timeout scope rather than wait_for, which would add a task per idle connection.
+                    async with asyncio.timeout(self.heartbeat_interval):
+                        event = await subscription.get()
+                except TimeoutError:
+                    yield b': keep-alive\n\n'
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def start(self) -> None:
+        """Start listening for other workers' events on the running loop, if the bridge is enabled."""
+        if self.bridge_url is not None and self._bridge is None:
+            self._bridge = asyncio.get_running_loop().create_task(self._listen(self.bridge_url))
+
+    async def stop(self) -> None:
+        """Disconnect the bridge and close every subscription, which ends the open streams."""
+        if self._bridge is not None:
+            self._bridge.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._bridge
+            self._bridge = None
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                self.unsubscribe(subscription)
+
+    def _on_notification(self, connection: 'asyncpg.Connection', pid: int, channel: str, payload: str) -> None:
+        try:
+            user_id, version = payload.split(':')
+            self.publish(uuid.UUID(user_id), int(version))
+        except ValueError:
+            logger.warning('Ignoring malformed task change notification %r', payload)
+
+    async def _listen(self, dsn: str) -> None:
+        # Imported here so that the driver is still only loaded once the app starts.
+        import asyncpg  # noqa: PLC0415
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                await connection.add_listener(CHANNEL, self._on_notification)
+                # Notifications sent while the bridge was down are lost.
+                self.resync()
+                while True:
+                    await asyncio.sleep(self.heartbeat_interval)
+                    await asyncio.wait_for(connection.execute('SELECT 1'), self.heartbeat_interval)
+            except (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning('Task change bridge disconnected: %r', exc)
+            finally:
+                if connection is not None:
+                    connection.terminate()
+            await asyncio.sleep(self.retry_delay)
+
+
+def bridge_url(url: str) -> str:
+    """Turn a SQLAlchemy database URL into a DSN that asyncpg accepts.
+
+    Args:
+        url (str): URL such as ``postgresql+asyncpg://...``.
+
+    Returns:
+        str: The same URL with the plain ``postgresql`` scheme.
+    """
+    return make_url(url).set(drivername='postgresql').render_as_string(hide_password=False)
+
+
+push_hub = PushHub(
+    queue_size=settings.push_queue_size,
+    max_per_user=settings.push_max_connections_per_user,
+    heartbeat_interval=settings.push_heartbeat_interval,
+    bridge_url=bridge_url(settings.push_bridge_url or settings.database_url) if settings.push_bridge_enabled else None,
+)
+
+registry.register(Gauge('push_connections', 'Open server push connections.', callback=lambda: push_hub.connections))
@@ -0,0 +1,209 @@
+"""Rate limiting with token bucket and sliding window counters.
+
+A :class:`Limit` describes how many hits a key may make per period and with
+which algorithm. Both algorithms keep a fixed-size state per key (two or
+three floats), so memory grows by a constant amount per tracked key.
+
+States live in a :class:`RateLimitStore`. :class:`ShardedMemoryStore` keeps
+them in the process, split over shards with one lock each, and evicts the
+least recently used keys beyond ``max_keys``. A store shared between workers
+implements the same interface and applies a hit atomically on its side;
+:class:`InMemorySharedStore` is a process-local stand-in for it that keeps
+states in the JSON-compatible form a network store would hold.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Literal
+
+from src.config import settings
+
+Algorithm = Literal['token_bucket', 'sliding_window']
+State = list[float]
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a key has used up its limit."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Store the time until the next hit would be allowed.
+
+        Args:
+            retry_after (float): Seconds the client should wait before retrying.
+        """
+        super().__init__('Too many requests')
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Limit:
+    """Allowed number of hits per period for one key."""
+
+    __slots__ = ('algorithm', 'period', 'requests')
+
+    def __init__(self, requests: int, period: float, algorithm: Algorithm = 'token_bucket') -> None:
+        """Describe the limit.
+
+        A token bucket holds up to ``requests`` tokens and refills them evenly
+        over ``period``, so it allows bursts after idle time. A sliding window
+        counts hits over the last ``period`` seconds, weighting the previous
+        fixed window by how much of it still overlaps.
+
+        Args:
+            requests (int): Hits allowed per period; also the bucket size.
+            period (float): The period in seconds.
+            algorithm (Algorithm): Either ``token_bucket`` or ``sliding_window``.
+        """
+        self.requests = requests
+        self.period = period
+        self.algorithm = algorithm
+
+    def apply(self, state: State | None, now: float) -> tuple[State, float]:
+        """Apply one hit to a key's state.
+
+        Args:
+            state (State | None): The stored state, or None for a new key.
+            now (float): The current time in seconds.
+
+        Returns:
+            tuple[State, float]: The new state and the seconds to wait, 0.0 if the hit is allowed.
+        """
+        if self.algorithm == 'token_bucket':
+            return self._token_bucket(state, now)
+        return self._sliding_window(state, now)
+
+    def _token_bucket(self, state: State | None, now: float) -> tuple[State, float]:
+        tokens, updated_at = state if state is not None else (float(self.requests), now)
+        rate = self.requests / self.period
+        tokens = min(float(self.requests), tokens + (now - updated_at) * rate)
+        if tokens >= 1:
+            return [tokens - 1, now], 0.0
+        return [tokens, now], (1 - tokens) / rate
+
+    def _sliding_window(self, state: State | None, now: float) -> tuple[State, float]:
+        window_start, previous, current = state if state is not None else (now, 0.0, 0.0)
+        elapsed_windows = int((now - window_start) // self.period)
+        if elapsed_windows:
+            previous = current if elapsed_windows == 1 else 0.0
+            current = 0.0
+            window_start += elapsed_windows * self.period
+
+        overlap = 1 - (now - window_start) / self.period
+        if previous * overlap + current + 1 <= self.requests:
+            return [window_start, previous, current + 1], 0.0
+
+        window_end = window_start + self.period
+        if previous and current + 1 <= self.requests:
+            # The estimate drops below the limit once enough of the previous window has slid out.
+            wait = window_end - self.period * (self.requests - current - 1) / previous - now
+        else:
+            wait = window_end - now
+        return [window_start, previous, current], max(wait, 0.0)
+
+
+class RateLimitStore(ABC):
+    """Interface of a store holding rate limit states."""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: Limit) -> float:
+        """Apply one hit to ``key`` atomically.
+
+        Args:
+            key (str): The rate limited key, for example ``login:ip:10.0.0.1``.
+            limit (Limit): The limit of the key.
+
+        Returns:
+            float: Seconds to wait before the next allowed hit, 0.0 if this hit is allowed.
+        """
+
+
+class ShardedMemoryStore(RateLimitStore):
+    """In-process store with one lock and one LRU-bounded dict per shard."""
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        """Create empty shards.
+
+        Args:
+            shards (int): Number of shards; keys are spread over them by hash.
+            max_keys (int): Total number of keys kept before the least recently used are dropped.
+            clock (Callable[[], float]): Source of the current time in seconds.
+        """
+        self.clock = clock
+        self._per_shard = max(1, max_keys // shards)
+        self._shards = [(threading.Lock(), OrderedDict[str, State]()) for _ in range(shards)]
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return sum(len(states) for _, states in self._shards)
+
+    async def hit(self, key: str, limit: Limit) -> float:
+        """Apply one hit to ``key`` under the lock of its shard."""
+        lock, states = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            state, wait = limit.apply(states.get(key), self.clock())
+            states[key] = state
+            states.move_to_end(key)
+            if len(states) > self._per_shard:
+                states.popitem(last=False)
+        return wait
+
+
+class InMemorySharedStore(RateLimitStore):
+    """Process-local stand-in for a store shared between workers."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """Create an empty store.
+
+        Args:
+            clock (Callable[[], float]): Source of the current time in seconds.
+        """
+        self.clock = clock
+        self._data: dict[str, tuple[float, State]] = {}
+
+    async def hit(self, key: str, limit: Limit) -> float:
+        """Apply one hit to ``key``; states expire after two periods of inactivity."""
+        now = self.clock()
+        entry = self._data.get(key)
+        state = entry[1] if entry is not None and entry[0] > now else None
+        state, wait = limit.apply(state, now)
+        self._data[key] = (now + 2 * limit.period, state)
+        return wait
+
+
+class RateLimiter:
+    """Check keys against their limits and reject the first one that is exhausted."""
+
+    def __init__(self, store: RateLimitStore, enabled: bool = True) -> None:
+        """Configure the limiter.
+
+        Args:
+            store (RateLimitStore): Where the states live.
+            enabled (bool): When False every check passes without touching the store.
+        """
+        self.store = store
+        self.enabled = enabled
+
+    async def check(self, *rules: tuple[str, Limit]) -> None:
+        """Record one hit for every key, in order.
+
+        Args:
+            *rules (tuple[str, Limit]): Keys with their limits.
+
+        Raises:
+            RateLimitExceededError: If a key is over its limit; later keys are not charged.
+        """
+        if not self.enabled:
+            return
+        for key, limit in rules:
+            wait = await self.store.hit(key, limit)
+            if wait > 0:
+                raise RateLimitExceededError(wait)
+
+
+rate_limiter = RateLimiter(
+    ShardedMemoryStore(shards=settings.rate_limit_shards, max_keys=settings.rate_limit_max_keys),
+    enabled=settings.rate_limit_enabled,
+)
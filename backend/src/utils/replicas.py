@@ -0,0 +1,226 @@
+"""Routing of read-only sessions to replicas, with health checks and read-your-writes.
+
+:class:`ReplicaRouter` picks a replica for each read-only session, either in
+turn (``round_robin``) or the one with the fewest checked-out connections
+(``least_connections``). A background check runs ``SELECT 1`` against every
+replica; a replica that fails is ejected until a later check succeeds, and
+with no healthy replica left reads go to the primary.
+
+Replicas lag behind the primary, so a client that has just written must not
+read from one. Sessions of the primary are :class:`PrimarySession`, which
+notes every write in the request's :class:`RoutingState`.
+:class:`ReadYourWritesMiddleware` turns that into a short-lived cookie, and
+while a request carries the cookie its reads go to the primary. A cookie
+works across workers and servers, where an in-process record would not.
+"""
+
+import asyncio
+import itertools
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Literal
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = 'read_primary'
+
+Strategy = Literal['round_robin', 'least_connections']
+Probe = Callable[[AsyncEngine], Awaitable[None]]
+
+
+class RoutingState:
+    """Per-request routing facts shared between the middleware and the sessions."""
+
+    __slots__ = ('prefer_primary', 'wrote')
+
+    def __init__(self, prefer_primary: bool = False) -> None:
+        """Start a request.
+
+        Args:
+            prefer_primary (bool): Whether the client wrote recently and must read from the primary.
+        """
+        self.prefer_primary = prefer_primary
+        self.wrote = False
+
+
+current_routing: ContextVar[RoutingState | None] = ContextVar('current_routing', default=None)
+
+
+def prefers_primary() -> bool:
+    """Report whether the current request has to read from the primary."""
+    state = current_routing.get()
+    return state is not None and (state.prefer_primary or state.wrote)
+
+
+def mark_write() -> None:
+    """Note that the current request wrote to the primary."""
+    state = current_routing.get()
+    if state is not None:
+        state.wrote = True
+
+
+class PrimarySession(Session):
+    """Session of the primary that reports writes to the current request."""
+
+
+@event.listens_for(PrimarySession, 'after_flush')
+def _after_flush(session: Session, _: Any) -> None:  # noqa: ANN401
+    if session.new or session.dirty or session.deleted:
+        mark_write()
+
+
+@event.listens_for(PrimarySession, 'do_orm_execute')
+def _do_orm_execute(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        mark_write()
+
+
+async def ping(engine: AsyncEngine) -> None:
+    """Run ``SELECT 1`` on a fresh checkout from the engine's pool."""
+    async with engine.connect() as connection:
+        await connection.execute(text('SELECT 1'))
+
+
+class Replica:
+    """A read replica's engine, session factory and health."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """Wrap a replica engine.
+
+        Args:
+            engine (AsyncEngine): Engine connected to the replica.
+        """
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+        self.name = make_url(engine.url).render_as_string(hide_password=True)
+        self.healthy = True
+
+    def connections(self) -> int:
+        """Return the number of connections checked out of the replica's pool."""
+        return self.engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    """Selects a healthy replica per read-only session."""
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica],
+        strategy: Strategy = 'round_robin',
+        probe_timeout: float = 2.0,
+        probe: Probe = ping,
+    ) -> None:
+        """Configure routing.
+
+        Args:
+            replicas (Sequence[Replica]): The replicas, all healthy until checked.
+            strategy (Strategy): ``round_robin`` or ``least_connections``.
+            probe_timeout (float): Seconds a probe may take before it counts as failed.
+            probe (Probe): Coroutine that raises if a replica engine is unusable.
+        """
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.probe_timeout = probe_timeout
+        self.probe = probe
+        self._turn = itertools.count()
+
+    def healthy(self) -> list[Replica]:
+        """Return the replicas that passed their last check."""
+        return [replica for replica in self.replicas if replica.healthy]
+
+    def choose(self) -> Replica | None:
+        """Return the replica for the next read-only session, or None if there is no healthy one."""
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        if self.strategy == 'least_connections':
+            return min(healthy, key=Replica.connections)
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def check(self) -> None:
+        """Probe every replica concurrently, ejecting failed ones and readmitting recovered ones."""
+
+        async def check_one(replica: Replica) -> None:
+            try:
+                await asyncio.wait_for(self.probe(replica.engine), self.probe_timeout)
+            except (OSError, TimeoutError, SQLAlchemyError) as exc:
+                if replica.healthy:
+                    logger.warning('Ejecting replica %s: %r', replica.name, exc)
+                replica.healthy = False
+            else:
+                if not replica.healthy:
+                    logger.info('Replica %s is healthy again', replica.name)
+                replica.healthy = True
+
+        await asyncio.gather(*(check_one(replica) for replica in self.replicas))
+
+    async def watch(self, interval: float) -> None:
+        """Check the replicas every ``interval`` seconds until cancelled.
+
+        Args:
+            interval (float): Seconds between checks.
+        """
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+def read_session(primary: async_sessionmaker[AsyncSession], router: ReplicaRouter | None) -> AsyncSession:
+    """Open a session for read-only work on a replica, or on the primary if the request needs it.
+
+    Args:
+        primary (async_sessionmaker[AsyncSession]): Session factory of the primary.
+        router (ReplicaRouter | None): The replicas, if any are configured.
+
+    Returns:
+        AsyncSession: The new session.
+    """
+    replica = None if router is None or prefers_primary() else router.choose()
+    return replica.sessions() if replica is not None else primary()
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that keeps a client on the primary for a while after it wrote."""
+
+    def __init__(self, app: ASGIApp, window: int) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+            window (int): Seconds a client reads from the primary after a write.
+        """
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve one request with its routing state."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        cookies = SimpleCookie()
+        for name, value in scope['headers']:
+            if name == b'cookie':
+                cookies.load(value.decode('latin-1'))
+        state = RoutingState(prefer_primary=READ_PRIMARY_COOKIE in cookies)
+        token = current_routing.set(state)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message['type'] == 'http.response.start' and state.wrote:
+                cookie = f'{READ_PRIMARY_COOKIE}=1; Max-Age={self.window}; Path=/; HttpOnly; SameSite=Lax'
+                message['headers'] = [*message.get('headers', ()), (b'set-cookie', cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            current_routing.reset(token)
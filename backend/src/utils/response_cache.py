@@ -0,0 +1,267 @@
+"""Cache of rendered JSON responses of read endpoints, scoped per user.
+
+:meth:`ResponseCache.cached` wraps a route handler. The cache key is the
+authenticated user, the user's current generation, and the path and sorted
+query string of the request. A hit is answered with the stored body and its
+ETag without running the handler or serializing anything, and a matching
+``If-None-Match`` gets a 304.
+
+Write paths call :meth:`ResponseCache.invalidate` after committing. Instead of
+finding and deleting the user's entries, it drops the user's generation
+token. The next read draws a fresh random token, so old entries become
+unreachable and age out of the LRU. Losing a token to eviction or expiry has
+the same harmless effect.
+
+With read replicas, a read made right after a write can come from a replica
+that has not applied it yet. The writer itself reads from the primary for
+``replica_lag`` seconds (see :mod:`src.utils.replicas`), but another
+client's replica read could store the old data under the new generation and
+serve it to the writer. So for ``replica_lag`` seconds after a user's
+invalidation, responses read off a replica are returned without storing them.
+
+Entries live in an in-process :class:`LRUCache` and, optionally, in a
+:class:`CacheBackend` shared between workers. Without a shared backend, each
+worker only sees its own invalidations, so another worker can serve a stale
+response for up to ``ttl``. That is why the cache is off by default.
+"""
+
+import functools
+import hashlib
+import inspect
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, Security, status
+from pydantic import TypeAdapter
+
+from src.config import settings
+
+from .cache import MISSING, CacheBackend, LRUCache
+from .replicas import prefers_primary
+
+Endpoint = Callable[..., Awaitable[Any]]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an entity tag using weak comparison.
+
+    Args:
+        if_none_match (str): The header value; a list of tags or ``*``.
+        etag (str): The current entity tag.
+
+    Returns:
+        bool: True if the client already has the current representation.
+    """
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag.removeprefix('W/') in tags
+
+
+def digest(body: bytes) -> str:
+    """Return the hex digest a response body's ETag is made of."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Two-level cache of JSON response bodies with per-user generations."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        shared: CacheBackend | None = None,
+        enabled: bool = True,
+        replica_lag: float = 0.0,
+    ) -> None:
+        """Configure the cache.
+
+        Args:
+            maxsize (int): Maximum number of responses, and of user generations, kept in process.
+            ttl (float): Time to live of a cached response, in seconds.
+            shared (CacheBackend | None): Optional cache shared between workers.
+            enabled (bool): When False every request runs its handler.
+            replica_lag (float): Seconds after an invalidation during which replica reads are not stored;
+                0 without replicas.
+        """
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._generations = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._invalidated = LRUCache(maxsize=maxsize, ttl=replica_lag)
+        self.ttl = ttl
+        self.shared = shared
+        self.enabled = enabled
+        self.replica_lag = replica_lag
+
+    async def _generation(self, identity: str) -> str:
+        if self.shared is None:
+            generation = self._generations.get(identity)
+            if generation is MISSING:
+                generation = uuid.uuid4().hex
+                self._generations.set(identity, generation)
+            return generation
+
+        key = f'response-generation:{identity}'
+        generation = await self.shared.get(key)
+        if generation is MISSING:
+            generation = uuid.uuid4().hex
+            await self.shared.set(key, generation, self.ttl)
+        return generation
+
+    async def key(self, identity: str, request: Request) -> str:
+        """Build the cache key of a request made by ``identity``.
+
+        Args:
+            identity (str): The authenticated user.
+            request (Request): The incoming request.
+
+        Returns:
+            str: The key under the user's current generation.
+        """
+        generation = await self._generation(identity)
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f'response:{identity}:{generation}:{request.url.path}?{query}'
+
+    async def storable(self, identity: str) -> bool:
+        """Report whether a response just rendered for ``identity`` may be stored.
+
+        It may not if it could have been read off a lagging replica: the
+        request reads from replicas and the user's data changed less than
+        ``replica_lag`` seconds ago.
+
+        Args:
+            identity (str): The authenticated user.
+        """
+        if not self.replica_lag or prefers_primary():
+            return True
+        if self._invalidated.get(identity) is not MISSING:
+            return False
+        return self.shared is None or await self.shared.get(f'response-invalidated:{identity}') is MISSING
+
+    async def get(self, key: str) -> tuple[bytes, str] | None:
+        """Return the cached body and ETag for ``key``, or None.
+
+        Args:
+            key (str): A key from :meth:`key`.
+        """
+        cached = self.local.get(key)
+        if cached is not MISSING:
+            return cached
+        if self.shared is None:
+            return None
+
+        shared: dict[str, str] | Any = await self.shared.get(key)
+        if shared is MISSING:
+            return None
+        entry = (shared['body'].encode(), shared['etag'])
+        self.local.set(key, entry)
+        return entry
+
+    async def set(self, key: str, body: bytes) -> tuple[bytes, str]:
+        """Store a rendered body together with an ETag derived from its digest.
+
+        Args:
+            key (str): A key from :meth:`key`.
+            body (bytes): The JSON response body.
+
+        Returns:
+            tuple[bytes, str]: The stored body and ETag.
+        """
+        entry = (body, f'"{digest(body)}"')
+        self.local.set(key, entry)
+        if self.shared is not None:
+            await self.shared.set(key, {'body': body.decode(), 'etag': entry[1]}, self.ttl)
+        return entry
+
+    async def invalidate(self, identity: Any) -> None:  # noqa: ANN401
+        """Make every cached response of a user unreachable; call after the write has committed.
+
+        Args:
+            identity (Any): The user whose data changed, as passed to :meth:`cached` handlers.
+        """
+        if not self.enabled:
+            return
+        self._generations.delete(str(identity))
+        if self.replica_lag:
+            self._invalidated.set(str(identity), True)
+        if self.shared is not None:
+            await self.shared.delete(f'response-generation:{identity}')
+            if self.replica_lag:
+                await self.shared.set(f'response-invalidated:{identity}', True, self.replica_lag)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss and eviction counters of the in-process level."""
+        return self.local.stats()
+
+    @staticmethod
+    def respond(entry: tuple[bytes, str], if_none_match: str | None) -> Response:
+        """Build the response for a cached entry, or a 304 if the client has it already.
+
+        Args:
+            entry (tuple[bytes, str]): The body and ETag.
+            if_none_match (str | None): The request's ``If-None-Match`` header.
+
+        Returns:
+            Response: The full or the not modified response.
+        """
+        body, etag = entry
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def cached(self, model: Any, identity: Callable[..., Any]) -> Callable[[Endpoint], Endpoint]:  # noqa: ANN401
+        """Cache the JSON responses of a read endpoint per user.
+
+        The handler's result is validated and serialized with ``model``, as
+        the route's ``response_model`` would be. Responses returned by the
+        handler itself and exceptions are passed through uncached.
+
+        Args:
+            model (Any): The response model of the route.
+            identity (Callable[..., Any]): Security dependency returning the authenticated user.
+
+        Returns:
+            Callable[[Endpoint], Endpoint]: Decorator to apply below the route decorator.
+        """
+        adapter = TypeAdapter(model)
+
+        def decorator(endpoint: Endpoint) -> Endpoint:
+            @functools.wraps(endpoint)
+            async def wrapper(*args: Any, cache_request: Request, cache_identity: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                if not self.enabled:
+                    return await endpoint(*args, **kwargs)
+
+                key = await self.key(str(cache_identity), cache_request)
+                entry = await self.get(key)
+                if entry is None:
+                    result = await endpoint(*args, **kwargs)
+                    if isinstance(result, Response):
+                        return result
+                    validated = adapter.validate_python(result, from_attributes=True)
+                    body = adapter.dump_json(validated, by_alias=True)
+                    if await self.storable(str(cache_identity)):
+                        entry = await self.set(key, body)
+                    else:
+                        entry = (body, f'"{digest(body)}"')
+                return self.respond(entry, cache_request.headers.get('if-none-match'))
+
+            # FastAPI reads the signature to resolve dependencies; add the request and the user.
+            signature = inspect.signature(endpoint)
+            extra = [
+                inspect.Parameter('cache_request', inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+                inspect.Parameter(
+                    'cache_identity', inspect.Parameter.KEYWORD_ONLY, annotation=Annotated[Any, Security(identity)]
+                ),
+            ]
+            wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *extra])
+            return wrapper
+
+        return decorator
+
+
+response_cache = ResponseCache(
+    maxsize=settings.response_cache_size,
+    ttl=settings.response_cache_ttl,
+    enabled=settings.response_cache_enabled,
+    replica_lag=settings.db_read_your_writes_seconds if settings.database_replica_urls.strip() else 0.0,
+)
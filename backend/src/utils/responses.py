@@ -0,0 +1,77 @@
+"""JSON responses rendered with orjson when it is installed.
+
+Routes with a ``response_model`` are already serialized by Pydantic's Rust
+core. The remaining costs are validating the handler's result against the
+model, and rendering routes without a model through ``jsonable_encoder`` and
+``json.dumps``. :class:`FastJSONResponse` renders with orjson and falls back
+to a compact ``json.dumps`` when orjson is missing; it is the app's default
+response class when ``FAST_JSON_ENABLED`` is set.
+
+:func:`trusted_json` is for handlers that build their payload from values
+they control, such as freshly issued tokens. The returned response bypasses
+the route's ``response_model`` validation, while the model still documents
+the route in the OpenAPI schema.
+"""
+
+import datetime
+import enum
+import json
+import uuid
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, datetime.datetime | datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(content: Any) -> bytes:  # noqa: ANN401
+    """Render JSON-compatible content, plus datetimes, UUIDs and enums, as compact UTF-8 JSON.
+
+    Args:
+        content (Any): The value to render.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:  # noqa: ANN401
+        """Render the content with orjson, or the standard library as a fallback."""
+        return dumps(content)
+
+
+def trusted_json(content: Any, status_code: int = 200, headers: Mapping[str, str] | None = None) -> FastJSONResponse:  # noqa: ANN401
+    """Wrap a payload the handler built itself, skipping ``response_model`` validation.
+
+    Only use it for payloads whose shape is guaranteed by the handler; the
+    route's ``response_model`` is not checked against them.
+
+    Args:
+        content (Any): The payload, already in the shape of the route's response model.
+        status_code (int): The response status.
+        headers (Mapping[str, str] | None): Extra response headers.
+
+    Returns:
+        FastJSONResponse: The rendered response.
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,663 @@
+"""Database utility functions for managing Task entities."""
+
+import base64
+import re
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncGenerator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Float,
+    Row,
+    Select,
+    String,
+    and_,
+    any_,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import ReturningInsert
+from sqlalchemy.sql.elements import BindParameter
+
+from src.models import Task, TaskStats, TaskStatus, TaskTombstone, User
+from src.models.task import SEARCH_CONFIG
+
+from .push import push_hub
+from .response_cache import response_cache
+
+Cursor = tuple[datetime | None, uuid.UUID]
+SearchCursor = tuple[bool, float, uuid.UUID]
+
+MAX_SEARCH_TERMS = 8
+SEARCH_TERM = re.compile(r'[^\W_]+')
+
+# Rendered as a literal so the planner can match the partial index predicate
+# even when the statement is executed with a generic prepared plan.
+NOT_DONE = Task.status != literal_column("'done'")
+
+
+class UnknownOwnerError(Exception):
+    """Raised when a task write is made for a user that no longer exists."""
+
+    def __init__(self) -> None:
+        """Set the message returned to the client."""
+        super().__init__('User no longer exists')
+
+
+def encode_cursor(position: Cursor) -> str:
+    """Encode a keyset position as an opaque cursor.
+
+    Args:
+        position (Cursor): The ``(due_at, id)`` of the last task of a page.
+
+    Returns:
+        str: An opaque URL-safe cursor.
+    """
+    due_at, task_id = position
+    due = due_at.isoformat() if due_at is not None else ''
+    return base64.urlsafe_b64encode(f'{due}|{task_id}'.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Returns:
+        Cursor: The ``(due_at, id)`` position to continue after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        due, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError('Malformed cursor') from e
+    return (datetime.fromisoformat(due) if due else None), uuid.UUID(task_id)
+
+
+async def next_task_version(db: AsyncSession, owner_id: uuid.UUID) -> int:
+    """Bump the owner's change version for the current transaction.
+
+    Every task write transaction calls this first. The ``UPDATE`` keeps the
+    owner's row locked until commit, so versions of one user become visible
+    in increasing order and a client that has seen version ``v`` can never
+    miss a change committed later with a smaller version.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks being written.
+
+    Returns:
+        int: The version to stamp on every row written by the transaction.
+
+    Raises:
+        UnknownOwnerError: If the user was deleted, for example while their token is still valid.
+    """
+    stmt = (
+        update(User)
+        .where(User.id == owner_id)
+        .values(task_version=User.task_version + 1)
+        .returning(User.task_version)
+        .execution_options(synchronize_session=False)
+    )
+    version = (await db.execute(stmt)).scalar_one_or_none()
+    if version is None:
+        raise UnknownOwnerError
+    return version
+
+
+async def commit_task_write(db: AsyncSession, owner_id: uuid.UUID, version: int) -> None:
+    """Commit a task write, then invalidate the owner's cached responses and notify their connections.
+
+    With the push bridge enabled the notification is a ``NOTIFY`` sent in
+    the transaction, so it reaches every worker only if the write commits.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the written tasks.
+        version (int): The change version stamped by the write.
+    """
+    if push_hub.bridged:
+        await push_hub.notify(db, owner_id, version)
+    await db.commit()
+    await response_cache.invalidate(owner_id)
+    if not push_hub.bridged:
+        push_hub.publish(owner_id, version)
+
+
+async def get_task_version(db: AsyncSession, owner_id: uuid.UUID) -> int:
+    """Return the owner's current change version without reading any task rows.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+
+    Returns:
+        int: The version of the last committed task write, 0 if there was none.
+    """
+    result = await db.execute(select(User.task_version).where(User.id == owner_id))
+    return result.scalar_one_or_none() or 0
+
+
+def _delete_with_tombstones(
+    owner_id: uuid.UUID, condition: ColumnElement[bool], version: int
+) -> ReturningInsert[tuple[uuid.UUID]]:
+    """Build one statement that deletes tasks and records a tombstone for each of them."""
+    deleted = delete(Task).where(Task.owner_id == owner_id, condition).returning(Task.id, Task.owner_id).cte('deleted')
+    stmt = pg_insert(TaskTombstone).from_select(
+        ['task_id', 'owner_id', 'version'],
+        select(deleted.c.id, deleted.c.owner_id, literal(version, BigInteger)),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskTombstone.owner_id, TaskTombstone.task_id],
+        set_={'version': stmt.excluded.version, 'deleted_at': func.now()},
+    )
+    return stmt.returning(TaskTombstone.task_id)
+
+
+def encode_search_cursor(position: SearchCursor) -> str:
+    """Encode a search position as an opaque cursor.
+
+    Args:
+        position (SearchCursor): Whether the page is a fuzzy match, and the score and id of its last task.
+
+    Returns:
+        str: An opaque URL-safe cursor.
+    """
+    fuzzy, score, task_id = position
+    return base64.urlsafe_b64encode(f'{int(fuzzy)}|{score!r}|{task_id}'.encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """Decode a cursor produced by :func:`encode_search_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Returns:
+        SearchCursor: The position to continue after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        fuzzy, score, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError('Malformed cursor') from e
+    return fuzzy == '1', float(score), uuid.UUID(task_id)
+
+
+async def create_task(db: AsyncSession, owner_id: uuid.UUID, values: dict[str, Any]) -> Task:
+    """Create a task for a user.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the new task.
+        values (dict[str, Any]): Column values of the task.
+
+    Returns:
+        Task: The created task.
+    """
+    version = await next_task_version(db, owner_id)
+    result = await db.execute(insert(Task).values(owner_id=owner_id, version=version, **values).returning(Task))
+    await commit_task_write(db, owner_id, version)
+    return result.scalar_one()
+
+
+async def get_task(db: AsyncSession, owner_id: uuid.UUID, task_id: uuid.UUID) -> Task | None:
+    """Retrieve a task of a user by id.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the task.
+        task_id (uuid.UUID): The task id.
+
+    Returns:
+        Task | None: The task if it exists and belongs to the user, otherwise None.
+    """
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == owner_id))
+    return result.scalar_one_or_none()
+
+
+async def update_task(db: AsyncSession, owner_id: uuid.UUID, task_id: uuid.UUID, values: dict[str, Any]) -> Task | None:
+    """Update columns of a task in a single ``UPDATE ... RETURNING``.
+
+    If no task matched, the transaction is rolled back and the change version stays as it was.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the task.
+        task_id (uuid.UUID): The task id.
+        values (dict[str, Any]): Column values to change.
+
+    Returns:
+        Task | None: The updated task, or None if it does not belong to the user.
+    """
+    if not values:
+        return await get_task(db, owner_id, task_id)
+
+    version = await next_task_version(db, owner_id)
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .values(version=version, **values)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = (await db.execute(stmt)).scalar_one_or_none()
+    if task is None:
+        # Nothing changed: keep the version, so sync clients and the response cache are left alone.
+        await db.rollback()
+        return None
+    await commit_task_write(db, owner_id, version)
+    return task
+
+
+async def delete_task(db: AsyncSession, owner_id: uuid.UUID, task_id: uuid.UUID) -> bool:
+    """Delete a task of a user and leave a tombstone for delta sync.
+
+    If no task matched, the transaction is rolled back and the change version stays as it was.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the task.
+        task_id (uuid.UUID): The task id.
+
+    Returns:
+        bool: True if a task was deleted.
+    """
+    version = await next_task_version(db, owner_id)
+    result = await db.execute(_delete_with_tombstones(owner_id, Task.id == task_id, version))
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
+    await commit_task_write(db, owner_id, version)
+    return True
+
+
+async def list_tasks(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    limit: int,
+    status: TaskStatus | None = None,
+    after: Cursor | None = None,
+) -> tuple[list[Task], Cursor | None]:
+    """List tasks of a user ordered by due date using keyset pagination.
+
+    Tasks are ordered by ``due_at`` with undated tasks last, then by ``id``.
+    Dated and undated tasks are fetched with separate range queries so that
+    each one is a plain index range scan; the cost is proportional to the
+    page size regardless of how deep the page is.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+        limit (int): Maximum number of tasks to return.
+        status (TaskStatus | None): Only tasks with this status; None means every task not done.
+        after (Cursor | None): Continue after this position.
+
+    Returns:
+        tuple[list[Task], Cursor | None]: The page and the position of its last task if more remain.
+    """
+    base = select(Task).where(Task.owner_id == owner_id)
+    base = base.where(NOT_DONE) if status is None else base.where(Task.status == status)
+
+    tasks: list[Task] = []
+    if after is None or after[0] is not None:
+        dated = base.where(Task.due_at.is_not(None))
+        if after is not None:
+            dated = dated.where(tuple_(Task.due_at, Task.id) > tuple_(*after))
+        result = await db.execute(dated.order_by(Task.due_at, Task.id).limit(limit + 1))
+        tasks.extend(result.scalars())
+
+    if len(tasks) <= limit:
+        undated = base.where(Task.due_at.is_(None))
+        if after is not None and after[0] is None:
+            undated = undated.where(Task.id > after[1])
+        result = await db.execute(undated.order_by(Task.id).limit(limit + 1 - len(tasks)))
+        tasks.extend(result.scalars())
+
+    if len(tasks) <= limit:
+        return tasks, None
+
+    page = tasks[:limit]
+    return page, (page[-1].due_at, page[-1].id)
+
+
+def prefix_tsquery(query: str) -> str | None:
+    """Turn free text into a ``to_tsquery`` expression matching every word as a prefix.
+
+    Only letters and digits are kept, so the result never contains tsquery
+    operators supplied by the user.
+
+    Args:
+        query (str): The text typed by the user.
+
+    Returns:
+        str | None: For example ``'buy:* & mil:*'``, or None if the text has no words.
+    """
+    terms = SEARCH_TERM.findall(query.lower())[:MAX_SEARCH_TERMS]
+    return ' & '.join(f'{term}:*' for term in terms) or None
+
+
+def _search_statement(
+    owner_id: uuid.UUID, query: str, tsquery: str, fuzzy: bool, after: SearchCursor | None
+) -> Select[tuple[Task, float]]:
+    """Build a full-text or trigram search ordered by ``(score DESC, id)``."""
+    if fuzzy:
+        typed = bindparam(None, query, type_=String)
+        score = func.word_similarity(typed, Task.title)
+        match = typed.op('<%')(Task.title)
+    else:
+        ts = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        score = func.ts_rank(Task.search_vector, ts)
+        match = Task.search_vector.op('@@')(ts)
+
+    stmt = select(Task, score.label('score')).where(Task.owner_id == owner_id, match)
+    if after is not None:
+        last = bindparam(None, after[1], type_=Float)
+        stmt = stmt.where(or_(score < last, and_(score == last, Task.id > after[2])))
+    return stmt.order_by(score.desc(), Task.id)
+
+
+async def search_tasks(
+    db: AsyncSession, owner_id: uuid.UUID, query: str, limit: int, after: SearchCursor | None = None
+) -> tuple[list[Task], bool, SearchCursor | None]:
+    """Search tasks of a user by title and description, best matches first.
+
+    Words are matched as prefixes against ``search_vector`` through the GIN
+    index and ranked with ``ts_rank``, titles weighing more than
+    descriptions. If nothing matches, the first page falls back to trigram
+    word similarity on titles so that typos still find something; the cursor
+    remembers which mode a result set uses. Pages are keyset-paginated on
+    ``(score DESC, id)``.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+        query (str): The text typed by the user.
+        limit (int): Maximum number of tasks to return.
+        after (SearchCursor | None): Continue after this position.
+
+    Returns:
+        tuple[list[Task], bool, SearchCursor | None]: The page, whether it comes from the trigram fallback
+        and the position of its last task if more remain.
+    """
+    tsquery = prefix_tsquery(query)
+    if tsquery is None:
+        return [], False, None
+
+    fuzzy = after[0] if after is not None else False
+    stmt = _search_statement(owner_id, query, tsquery, fuzzy, after).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    if not rows and after is None:
+        fuzzy = True
+        rows = (await db.execute(_search_statement(owner_id, query, tsquery, fuzzy, after).limit(limit + 1))).all()
+
+    if len(rows) <= limit:
+        return [row.Task for row in rows], fuzzy, None
+
+    page = rows[:limit]
+    return [row.Task for row in page], fuzzy, (fuzzy, page[-1].score, page[-1].Task.id)
+
+
+def _id_array(ids: Sequence[uuid.UUID]) -> BindParameter[list[uuid.UUID]]:
+    """Bind a list of ids as one ``uuid[]`` parameter for ``= ANY(...)``."""
+    return bindparam(None, list(ids), type_=ARRAY(UUID(as_uuid=True)))
+
+
+async def apply_task_batch(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    creates: Sequence[tuple[uuid.UUID, dict[str, Any]]],
+    updates: Sequence[tuple[uuid.UUID, dict[str, Any]]],
+    deletes: Sequence[uuid.UUID],
+) -> tuple[set[uuid.UUID], set[uuid.UUID], set[uuid.UUID]]:
+    """Apply many task mutations with a few set-based statements in one transaction.
+
+    Creates are sent as one executemany ``INSERT ... ON CONFLICT (id) DO
+    NOTHING``. Updates are grouped by the set of changed columns and each
+    group becomes one ``UPDATE ... FROM (VALUES ...)``. Deletes are one
+    ``DELETE ... WHERE id = ANY(...)``. Every statement is restricted to the
+    owner's rows, so ids of other users' tasks are reported as not applied.
+    The whole batch shares one change version, which is only taken if at
+    least one operation applied.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+        creates (Sequence[tuple[uuid.UUID, dict[str, Any]]]): New task ids with their column values.
+        updates (Sequence[tuple[uuid.UUID, dict[str, Any]]]): Task ids with the columns to change.
+        deletes (Sequence[uuid.UUID]): Ids of tasks to delete.
+
+    Returns:
+        tuple[set[uuid.UUID], set[uuid.UUID], set[uuid.UUID]]: Ids actually created, updated and deleted.
+    """
+    created: set[uuid.UUID] = set()
+    updated: set[uuid.UUID] = set()
+    deleted: set[uuid.UUID] = set()
+    version = await next_task_version(db, owner_id)
+
+    if creates:
+        stmt = pg_insert(Task).on_conflict_do_nothing(index_elements=[Task.id]).returning(Task.id)
+        params = [{'id': task_id, 'owner_id': owner_id, 'version': version, **row} for task_id, row in creates]
+        created.update((await db.execute(stmt, params)).scalars())
+        if created:
+            # A client-generated id may be reused after a delete; the live row supersedes the owner's tombstone.
+            # Another user's tombstone for the same id stays, or that user's sync would miss the delete.
+            await db.execute(
+                delete(TaskTombstone).where(
+                    TaskTombstone.owner_id == owner_id, TaskTombstone.task_id == any_(_id_array(list(created)))
+                )
+            )
+
+    groups: dict[tuple[str, ...], list[tuple[uuid.UUID, dict[str, Any]]]] = defaultdict(list)
+    for task_id, changes in updates:
+        groups[tuple(sorted(changes))].append((task_id, changes))
+
+    for names, rows in groups.items():
+        if not names:
+            stmt = select(Task.id).where(
+                Task.owner_id == owner_id, Task.id == any_(_id_array([task_id for task_id, _ in rows]))
+            )
+            updated.update((await db.execute(stmt)).scalars())
+            continue
+        table = Task.__table__.c
+        data = values(*(column(name, table[name].type) for name in ('id', *names)), name='v').data(
+            [(task_id, *(changes[name] for name in names)) for task_id, changes in rows]
+        )
+        stmt = (
+            update(Task)
+            .where(Task.id == data.c.id, Task.owner_id == owner_id)
+            .values({'version': version, **{name: data.c[name] for name in names}})
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated.update((await db.execute(stmt)).scalars())
+
+    if deletes:
+        stmt = _delete_with_tombstones(owner_id, Task.id == any_(_id_array(deletes)), version)
+        deleted.update((await db.execute(stmt)).scalars())
+
+    if created or updated or deleted:
+        await commit_task_write(db, owner_id, version)
+    else:
+        await db.rollback()
+    return created, updated, deleted
+
+
+EXPORT_COLUMNS = ('id', 'title', 'description', 'status', 'priority', 'due_at', 'created_at', 'updated_at')
+
+
+async def stream_task_rows(
+    db: AsyncSession, owner_id: uuid.UUID, chunk_rows: int
+) -> AsyncGenerator[Sequence[Row[Any]], None]:
+    """Stream all tasks of a user in chunks through a server-side cursor.
+
+    Plain column rows are fetched instead of ORM objects, and at most
+    ``chunk_rows`` of them are held in memory at a time.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+        chunk_rows (int): Number of rows fetched from the cursor per chunk.
+
+    Yields:
+        Sequence[Row[Any]]: Up to ``chunk_rows`` rows with the columns of :data:`EXPORT_COLUMNS`.
+    """
+    table = Task.__table__.c
+    stmt = (
+        select(*(table[name] for name in EXPORT_COLUMNS))
+        .where(table.owner_id == owner_id)
+        .order_by(table.created_at, table.id)
+        .execution_options(yield_per=chunk_rows)
+    )
+    result = await db.stream(stmt)
+    async for partition in result.partitions(chunk_rows):
+        yield partition
+
+
+async def list_task_changes(
+    db: AsyncSession, owner_id: uuid.UUID, since: int, upto: int, limit: int
+) -> tuple[list[Task], list[Row[tuple[uuid.UUID, int]]], int, bool]:
+    """Collect task changes of a user with ``since < version <= upto``.
+
+    Every query is a range scan of an ``(owner_id, version)`` index. Writes
+    of one transaction share a version and are never split across pages, so
+    a page may hold more than ``limit`` changes when it ends inside a large
+    batch.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+        since (int): The last version the client has applied.
+        upto (int): The current version, read before calling this.
+        limit (int): Soft maximum number of changes.
+
+    Returns:
+        tuple[list[Task], list[Row[tuple[uuid.UUID, int]]], int, bool]: Changed tasks, ``(task_id, version)`` of
+        deleted tasks, the version to continue from and whether more changes remain.
+    """
+    task_versions = await db.execute(
+        select(Task.version)
+        .where(Task.owner_id == owner_id, Task.version > since, Task.version <= upto)
+        .order_by(Task.version)
+        .limit(limit + 1)
+    )
+    tombstone_versions = await db.execute(
+        select(TaskTombstone.version)
+        .where(TaskTombstone.owner_id == owner_id, TaskTombstone.version > since, TaskTombstone.version <= upto)
+        .order_by(TaskTombstone.version)
+        .limit(limit + 1)
+    )
+    versions = sorted([*task_versions.scalars(), *tombstone_versions.scalars()])
+    has_more = len(versions) > limit
+    if has_more:
+        upto = versions[limit - 1]
+
+    tasks = await db.execute(
+        select(Task)
+        .where(Task.owner_id == owner_id, Task.version > since, Task.version <= upto)
+        .order_by(Task.version, Task.id)
+    )
+    tombstones = await db.execute(
+        select(TaskTombstone.task_id, TaskTombstone.version)
+        .where(TaskTombstone.owner_id == owner_id, TaskTombstone.version > since, TaskTombstone.version <= upto)
+        .order_by(TaskTombstone.version, TaskTombstone.task_id)
+    )
+    return list(tasks.scalars()), list(tombstones.all()), upto, has_more
+
+
+async def get_task_stats(db: AsyncSession, owner_id: uuid.UUID) -> dict[str, int]:
+    """Return a user's task counts by status and the number of overdue tasks.
+
+    The status counts are one primary key lookup of the trigger-maintained
+    ``task_stats`` row. Overdue depends on the clock, so it cannot be kept
+    as a counter; it is counted with a range scan of the partial index
+    ``ix_task_owner_open_due``, which only visits the overdue tasks.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        owner_id (uuid.UUID): The owner of the tasks.
+
+    Returns:
+        dict[str, int]: ``open``, ``in_progress``, ``done``, ``overdue`` and ``total``.
+    """
+    overdue = (
+        select(func.count())
+        .select_from(Task)
+        .where(Task.owner_id == owner_id, NOT_DONE, Task.due_at < func.now())
+        .scalar_subquery()
+    )
+    stmt = select(TaskStats.open, TaskStats.in_progress, TaskStats.done, overdue.label('overdue')).where(
+        TaskStats.owner_id == owner_id
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return {'open': 0, 'in_progress': 0, 'done': 0, 'overdue': 0, 'total': 0}
+    return {**row._asdict(), 'total': row.open + row.in_progress + row.done}
+
+
+async def repair_task_stats(db: AsyncSession, batch_size: int) -> int:
+    """Recompute the task counters of every user in batches and fix the ones that drifted.
+
+    Each batch locks its users' rows first. Every task write bumps the
+    owner's ``task_version`` before touching tasks, so writes of those users
+    wait for the batch to commit, and the recount, a separate statement with
+    a fresh snapshot, sees every write committed before. Only rows whose
+    counters differ are written.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        batch_size (int): Users recounted per transaction.
+
+    Returns:
+        int: Number of users whose counters were corrected.
+    """
+    # The counter columns are named after the statuses.
+    actual = [func.count(Task.id).filter(Task.status == status) for status in TaskStatus]
+    stored = [TaskStats.__table__.c[status] for status in TaskStatus]
+    corrected = 0
+    after: uuid.UUID | None = None
+    while True:
+        owners = select(User.id).order_by(User.id).limit(batch_size).with_for_update(key_share=True)
+        if after is not None:
+            owners = owners.where(User.id > after)
+        owner_ids = list((await db.execute(owners)).scalars())
+
+        recount = (
+            select(User.id, *actual)
+            .outerjoin(Task, Task.owner_id == User.id)
+            .outerjoin(TaskStats, TaskStats.owner_id == User.id)
+            .where(User.id == any_(_id_array(owner_ids)))
+            .group_by(User.id, *stored)
+            .having(tuple_(*(func.coalesce(count, 0) for count in stored)) != tuple_(*actual))
+        )
+        stmt = pg_insert(TaskStats).from_select(['owner_id', *TaskStatus], recount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskStats.owner_id], set_={status: stmt.excluded[status] for status in TaskStatus}
+        )
+        corrected += len((await db.execute(stmt.returning(TaskStats.owner_id))).all())
+        await db.commit()
+        if len(owner_ids) < batch_size:
+            return corrected
+        after = owner_ids[-1]
@@ -0,0 +1,108 @@
+"""Database utility functions for revoked refresh tokens."""
+
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, bindparam, delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import RevokedToken
+
+# Records a refresh token as used unless it already was or its family is
+# revoked; no returned row means the token must be rejected.
+CLAIM_REFRESH_TOKEN = (
+    insert(RevokedToken)
+    .from_select(
+        ['token_id', 'expires_at'],
+        select(bindparam('token_id', type_=String), bindparam('expires_at', type_=DateTime(timezone=True))).where(
+            ~exists().where(RevokedToken.token_id == bindparam('family'))
+        ),
+    )
+    .on_conflict_do_nothing(index_elements=[RevokedToken.token_id])
+    .returning(RevokedToken.token_id)
+)
+REVOKE_TOKEN = (
+    insert(RevokedToken)
+    .values(token_id=bindparam('token_id'), expires_at=bindparam('expires_at'))
+    .on_conflict_do_nothing(index_elements=[RevokedToken.token_id])
+)
+
+
+async def claim_refresh_token(db: AsyncSession, token_id: str, family: str, expires_at: datetime) -> bool:
+    """Mark a refresh token as used, atomically.
+
+    The insert and both checks are one ``INSERT ... SELECT ... ON CONFLICT DO
+    NOTHING`` statement, so two requests presenting the same token cannot both
+    succeed, whichever worker serves them.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        token_id (str): The ``jti`` of the presented refresh token.
+        family (str): The ID shared by all refresh tokens issued from one login.
+        expires_at (datetime): When the stored row may be purged.
+
+    Returns:
+        bool: True if the token was unused and its family is not revoked.
+    """
+    result = await db.execute(CLAIM_REFRESH_TOKEN, {'token_id': token_id, 'family': family, 'expires_at': expires_at})
+    await db.commit()
+    return result.scalar_one_or_none() is not None
+
+
+async def revoke_token_id(db: AsyncSession, token_id: str, expires_at: datetime) -> None:
+    """Store a token or family ID as revoked; storing it again is a no-op.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        token_id (str): The token or family ID.
+        expires_at (datetime): When the stored row may be purged.
+    """
+    await db.execute(REVOKE_TOKEN, {'token_id': token_id, 'expires_at': expires_at})
+    await db.commit()
+
+
+async def find_revoked_token_ids(db: AsyncSession, token_ids: Iterable[str]) -> set[str]:
+    """Return which of ``token_ids`` are stored as revoked and not yet expired.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        token_ids (Iterable[str]): Token or family IDs to look up.
+
+    Returns:
+        set[str]: The revoked IDs among them.
+    """
+    stmt = select(RevokedToken.token_id).where(
+        RevokedToken.token_id.in_(list(token_ids)), RevokedToken.expires_at > func.now()
+    )
+    return set((await db.execute(stmt)).scalars())
+
+
+async def stream_revoked_token_ids(db: AsyncSession, chunk_rows: int = 10_000) -> AsyncIterator[str]:
+    """Yield every revoked ID that has not expired, fetched in chunks.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+        chunk_rows (int): Rows fetched per round trip.
+
+    Yields:
+        str: Token or family IDs.
+    """
+    stmt = select(RevokedToken.token_id).where(RevokedToken.expires_at > func.now())
+    result = await db.stream_scalars(stmt.execution_options(yield_per=chunk_rows))
+    async for token_id in result:
+        yield token_id
+
+
+async def purge_expired_tokens(db: AsyncSession) -> int:
+    """Delete revoked IDs whose tokens have all expired.
+
+    Args:
+        db (AsyncSession): The active SQLAlchemy asynchronous session.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+    result = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= func.now()))
+    await db.commit()
+    return result.rowcount
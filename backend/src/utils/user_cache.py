@@ -0,0 +1,144 @@
+"""Cache of user lookups by username.
+
+Both hits and misses are cached: most lookups during credential stuffing are
+for usernames that do not exist, and a cached miss answers them without a
+database round trip. Misses use a shorter TTL so that a user registered
+through another worker becomes visible quickly even without a shared backend.
+
+Only the user id is cached for an existing username, never the password
+hash. A hash changes when it is upgraded or the password is changed, and an
+in-process copy on another worker would keep verifying against the old one
+until it expired, so logins always read the hash from the database.
+"""
+
+import uuid
+from typing import Any
+
+from src.config import settings
+
+from .cache import MISSING, CacheBackend, LRUCache
+
+
+class UserRecord:
+    """The columns of a user that authentication reads, without ORM state.
+
+    Loaded from column-only selects, so no identity map, instance state or
+    attribute history is built for it. It is a detached copy: changing it does
+    not change the database.
+    """
+
+    __slots__ = ('id', 'password', 'username')
+
+    def __init__(self, id: uuid.UUID, username: str, password: str) -> None:
+        """Hold the columns of one user.
+
+        Args:
+            id (uuid.UUID): The user's primary key.
+            username (str): The unique username.
+            password (str): The password hash.
+        """
+        self.id = id
+        self.username = username
+        self.password = password
+
+    def __repr__(self) -> str:
+        """Show the user without the password hash."""
+        return f'UserRecord(id={self.id!r}, username={self.username!r})'
+
+
+class UserCache:
+    """Two-level username cache: an in-process LRU and an optional shared backend."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        shared: CacheBackend | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """Configure the cache.
+
+        Args:
+            maxsize (int): Maximum number of usernames kept in process.
+            ttl (float): Time to live of a cached user, in seconds.
+            negative_ttl (float): Time to live of a cached miss, in seconds.
+            shared (CacheBackend | None): Optional cache shared between workers.
+            enabled (bool): When False every lookup goes to the database.
+        """
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.shared = shared
+        self.enabled = enabled
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return f'user:{username}'
+
+    async def get(self, username: str) -> uuid.UUID | None:
+        """Return the cached lookup result for a username.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            uuid.UUID | None: The user's id, None for a cached miss, or :data:`MISSING`.
+        """
+        if not self.enabled:
+            return MISSING
+
+        cached = self.local.get(username)
+        if cached is not MISSING or self.shared is None:
+            return cached
+
+        shared: dict[str, Any] | None = await self.shared.get(self._key(username))
+        if shared is MISSING:
+            return MISSING
+
+        if shared is None:
+            self.local.set(username, None, self.negative_ttl)
+            return None
+
+        user_id = uuid.UUID(shared['id'])
+        self.local.set(username, user_id)
+        return user_id
+
+    async def set(self, username: str, user_id: uuid.UUID | None) -> None:
+        """Store a lookup result, including a miss.
+
+        Args:
+            username (str): The username that was looked up.
+            user_id (uuid.UUID | None): The id of the user, or None if it does not exist.
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl if user_id is not None else self.negative_ttl
+        self.local.set(username, user_id, ttl)
+
+        if self.shared is not None:
+            payload = {'id': str(user_id)} if user_id is not None else None
+            await self.shared.set(self._key(username), payload, ttl)
+
+    async def invalidate(self, username: str) -> None:
+        """Drop a username from every cache level.
+
+        Args:
+            username (str): The username whose cached entry is stale.
+        """
+        self.local.delete(username)
+        if self.shared is not None:
+            await self.shared.delete(self._key(username))
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss and eviction counters of the in-process level."""
+        return self.local.stats()
+
+
+user_cache = UserCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+    negative_ttl=settings.user_cache_negative_ttl,
+    enabled=settings.user_cache_enabled,
+)
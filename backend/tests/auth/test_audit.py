@@ -0,0 +1,125 @@
+"""Buffered auth event log and /api/auth/events."""
+
+import asyncio
+from datetime import UTC, datetime
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth import audit
+from src.auth.audit import AuthEventLog, auth_events, auth_events_dropped
+from src.models import AuthEventKind
+from src.utils.auth_events import add_months
+
+CAPACITY = 5
+
+
+@pytest.fixture
+def written(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Collect flushed events instead of writing them to the database."""
+    rows: list[dict[str, Any]] = []
+
+    async def insert(_: AsyncSession | None, events: list[dict[str, Any]], __: int) -> None:
+        rows.extend(events)
+
+    monkeypatch.setattr(audit, 'insert_auth_events', insert)
+    return rows
+
+
+def test_full_buffer_overwrites_the_oldest_events() -> None:
+    """Beyond capacity the ring buffer keeps the newest events and counts the dropped ones."""
+    log = AuthEventLog(capacity=CAPACITY, flush_rows=100, flush_interval=60.0)
+    dropped = auth_events_dropped.value()
+
+    for number in range(CAPACITY + 2):
+        log.record(AuthEventKind.LOGIN, f'user{number}')
+
+    assert len(log) == CAPACITY
+    assert auth_events_dropped.value() == dropped + 2
+    assert log._buffer[0]['username'] == 'user2'
+
+
+def test_disabled_log_records_nothing() -> None:
+    """A disabled log ignores events."""
+    log = AuthEventLog(capacity=CAPACITY, flush_rows=100, flush_interval=60.0, enabled=False)
+
+    log.record(AuthEventKind.LOGIN, 'user')
+
+    assert len(log) == 0
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_by_size_and_on_stop(written: list[dict[str, Any]]) -> None:
+    """A full batch is written without waiting for the interval; the rest is written on stop."""
+    log = AuthEventLog(capacity=100, flush_rows=3, flush_interval=60.0)
+    log.start()
+
+    for number in range(3):
+        log.record(AuthEventKind.LOGIN_FAILED, f'user{number}', '10.0.0.1', detail='wrong_password')
+    await asyncio.sleep(0.01)
+    assert len(written) == 3  # noqa: PLR2004
+
+    log.record(AuthEventKind.LOGIN_FAILED, 'user3', '10.0.0.1', detail='wrong_password')
+    await log.stop()
+    assert [event['username'] for event in written] == ['user0', 'user1', 'user2', 'user3']
+    assert written[0]['kind'] == AuthEventKind.LOGIN_FAILED
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Events that could not be written go back in front of newer ones."""
+    log = AuthEventLog(capacity=CAPACITY, flush_rows=100, flush_interval=60.0)
+
+    async def unavailable(*_: object) -> None:
+        log.record(AuthEventKind.LOGIN, 'during')
+        raise OSError('database is down')
+
+    monkeypatch.setattr(audit, 'insert_auth_events', unavailable)
+    log.record(AuthEventKind.LOGIN, 'before')
+
+    assert await log.flush() == 0
+    assert [event['username'] for event in log._buffer] == ['before', 'during']
+
+
+def test_add_months_crosses_years() -> None:
+    """Month arithmetic returns the first instant of the month in UTC."""
+    moment = datetime(2026, 12, 31, 23, 30, tzinfo=UTC)
+
+    assert add_months(moment, 2) == datetime(2027, 2, 1, tzinfo=UTC)
+    assert add_months(moment, 0) == datetime(2026, 12, 1, tzinfo=UTC)
+    assert add_months(moment, -12) == datetime(2025, 12, 1, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_events_are_listed_newest_first(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Registration and login attempts show up for the username once flushed."""
+    credentials = {'username': 'audited', 'password': 'qwerty'}
+    await client.post('/api/auth/register', json={**credentials, 'confirm_password': 'qwerty'})
+    await client.post('/api/auth/login', json={**credentials, 'password': 'WRONG'})
+    login = await client.post('/api/auth/login', json=credentials)
+    await auth_events.flush(db_session)
+
+    response = await client.get('/api/auth/events', headers={'Authorization': f'Bearer {login.json()["access_token"]}'})
+
+    assert response.status_code == HTTPStatus.OK
+    events = response.json()
+    assert [event['kind'] for event in events] == ['login', 'login_failed', 'register']
+    assert events[1]['detail'] == 'wrong_password'
+
+
+@pytest.mark.asyncio
+async def test_events_from_before_the_account_are_not_listed(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Attempts made for a username before it was registered stay out of the new account's events."""
+    credentials = {'username': 'latecomer', 'password': 'qwerty'}
+    await client.post('/api/auth/login', json=credentials)
+    await client.post('/api/auth/register', json={**credentials, 'confirm_password': 'qwerty'})
+    login = await client.post('/api/auth/login', json=credentials)
+    await auth_events.flush(db_session)
+
+    response = await client.get('/api/auth/events', headers={'Authorization': f'Bearer {login.json()["access_token"]}'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [event['kind'] for event in response.json()] == ['login', 'register']
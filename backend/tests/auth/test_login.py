@@ -1,9 +1,19 @@
 """/api/auth/login."""
 
+import importlib
+import uuid
 from http import HTTPStatus
 
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+
+from src.auth.hashing import HashingPoolSaturatedError, password_hasher
+from src.auth.security import hash_password_legacy
+from src.main import app
+from src.utils.user_cache import UserRecord
+
+# ``src.auth.router`` is shadowed by the APIRouter re-exported from ``src.auth``.
+auth_router = importlib.import_module('src.auth.router')
 
 
 @pytest.mark.asyncio
@@ -52,3 +62,30 @@ async def test_login_nonexistent_user(client: AsyncClient) -> None:
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json()['detail'] == 'User does not exist'
+
+
+@pytest.mark.asyncio
+async def test_login_succeeds_when_the_rehash_pool_is_saturated(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A verified login still gets its tokens when the opportunistic rehash cannot be scheduled."""
+    record = UserRecord(uuid.uuid4(), 'legacy_user', hash_password_legacy('qwerty'))
+    rehashed = []
+
+    async def lookup(_: object, username: str) -> UserRecord | None:
+        return record if username == record.username else None
+
+    async def saturated(_: str) -> str:
+        raise HashingPoolSaturatedError(retry_after=1)
+
+    async def update(_: object, user: UserRecord, password_hash: str) -> None:
+        rehashed.append((user, password_hash))
+
+    monkeypatch.setattr(auth_router, 'get_user_by_username', lookup)
+    monkeypatch.setattr(auth_router, 'update_user_password', update)
+    monkeypatch.setattr(password_hasher, 'hash', saturated)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.post('/api/auth/login', json={'username': 'legacy_user', 'password': 'qwerty'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'access_token' in response.json()
+    assert rehashed == []
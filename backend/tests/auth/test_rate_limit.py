@@ -0,0 +1,57 @@
+"""Rate limiting of /api/auth/login."""
+
+import importlib
+from http import HTTPStatus
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app
+from src.utils.rate_limit import Limit, RateLimiter, ShardedMemoryStore
+
+# ``src.auth.router`` is shadowed by the APIRouter re-exported from ``src.auth``.
+auth_router = importlib.import_module('src.auth.router')
+
+
+@pytest.mark.asyncio
+async def test_login_is_rejected_before_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once a username is over its limit, login answers 429 without looking the user up."""
+    lookups = []
+
+    async def lookup(_: object, username: str) -> None:
+        lookups.append(username)
+
+    monkeypatch.setattr(auth_router, 'rate_limiter', RateLimiter(ShardedMemoryStore()))
+    monkeypatch.setattr(auth_router, 'username_limit', Limit(1, 60.0, algorithm='sliding_window'))
+    monkeypatch.setattr(auth_router, 'get_user_by_username', lookup)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        first = await client.post('/api/auth/login', json={'username': 'victim', 'password': 'guess1'})
+        second = await client.post('/api/auth/login', json={'username': 'Victim', 'password': 'guess2'})
+
+    assert first.status_code == HTTPStatus.UNAUTHORIZED
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(second.headers['retry-after']) > 0
+    assert lookups == ['victim']
+
+
+@pytest.mark.asyncio
+async def test_registrations_do_not_use_up_the_login_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Register and login count in separate buckets for the same address."""
+
+    async def lookup(_: object, __: str) -> None:
+        return None
+
+    monkeypatch.setattr(auth_router, 'rate_limiter', RateLimiter(ShardedMemoryStore()))
+    monkeypatch.setattr(auth_router, 'ip_limit', Limit(1, 60.0))
+    monkeypatch.setattr(auth_router, 'get_user_by_username', lookup)
+    mismatch = {'password': 'secret', 'confirm_password': 'other'}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        first = await client.post('/api/auth/register', json={'username': 'nat_a', **mismatch})
+        second = await client.post('/api/auth/register', json={'username': 'nat_b', **mismatch})
+        login = await client.post('/api/auth/login', json={'username': 'nat_c', 'password': 'secret'})
+
+    assert first.status_code == HTTPStatus.UNAUTHORIZED
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert login.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,79 @@
+"""/api/auth/refresh."""
+
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+
+async def login(client: AsyncClient, username: str) -> str:
+    """Register ``username`` and return its refresh token."""
+    response = await client.post(
+        '/api/auth/register',
+        json={'username': username, 'password': 'qwerty', 'confirm_password': 'qwerty'},
+    )
+    client.cookies.clear()
+    return response.json()['refresh_token']
+
+
+async def refresh(client: AsyncClient, token: str) -> tuple[int, dict[str, str]]:
+    """Call the refresh endpoint with ``token`` as bearer and return the status and body."""
+    response = await client.post('/api/auth/refresh', headers={'Authorization': f'Bearer {token}'})
+    client.cookies.clear()
+    return response.status_code, response.json()
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_tokens(client: AsyncClient) -> None:
+    """A refresh token is exchanged for a new pair that works for the same user."""
+    token = await login(client, 'refresh_user')
+
+    status, body = await refresh(client, token)
+
+    assert status == HTTPStatus.OK
+    assert body['refresh_token'] != token
+    me = await client.get('/api/auth/me', headers={'Authorization': f'Bearer {body["access_token"]}'})
+    assert me.json() == {'username': 'refresh_user'}
+
+
+@pytest.mark.asyncio
+async def test_reuse_revokes_the_family(client: AsyncClient) -> None:
+    """Presenting a used token fails and also invalidates the token issued in its place."""
+    stolen = await login(client, 'reused_user')
+    _, rotated = await refresh(client, stolen)
+
+    reuse_status, reuse_body = await refresh(client, stolen)
+    rotated_status, _ = await refresh(client, rotated['refresh_token'])
+
+    assert reuse_status == HTTPStatus.UNAUTHORIZED
+    assert reuse_body['detail'] == 'Refresh token has been revoked'
+    assert rotated_status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_other_logins_are_unaffected(client: AsyncClient) -> None:
+    """Revoking one family leaves tokens from another login of the same user working."""
+    await login(client, 'two_devices')
+    response = await client.post('/api/auth/login', json={'username': 'two_devices', 'password': 'qwerty'})
+    client.cookies.clear()
+    other_device = response.json()['refresh_token']
+    stolen = (await client.post('/api/auth/login', json={'username': 'two_devices', 'password': 'qwerty'})).json()
+    client.cookies.clear()
+
+    await refresh(client, stolen['refresh_token'])
+    await refresh(client, stolen['refresh_token'])
+    status, _ = await refresh(client, other_device)
+
+    assert status == HTTPStatus.OK
+
+
+@pytest.mark.asyncio
+async def test_access_token_is_not_a_refresh_token(client: AsyncClient) -> None:
+    """Access tokens are rejected by the refresh endpoint."""
+    await login(client, 'wrong_type')
+    response = await client.post('/api/auth/login', json={'username': 'wrong_type', 'password': 'qwerty'})
+    client.cookies.clear()
+
+    status, _ = await refresh(client, response.json()['access_token'])
+
+    assert status == HTTPStatus.UNAUTHORIZED
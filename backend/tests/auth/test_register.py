@@ -53,3 +53,17 @@ async def test_register_existing_user(client: AsyncClient) -> None:
 
     assert response.status_code == HTTPStatus.BAD_REQUEST
     assert response.json()['detail'] == 'Username already registered'
+
+
+@pytest.mark.asyncio
+async def test_register_retry_with_idempotency_key_is_replayed(client: AsyncClient) -> None:
+    """A retried registration with the same key returns the first response instead of 'already registered'."""
+    body = {'username': 'retry_user', 'password': 'pass', 'confirm_password': 'pass'}
+    headers = {'Idempotency-Key': 'register-retry-user'}
+
+    first = await client.post('/api/auth/register', json=body, headers=headers)
+    retry = await client.post('/api/auth/register', json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == HTTPStatus.OK
+    assert retry.json() == first.json()
+    assert retry.headers['idempotent-replayed'] == 'true'
@@ -0,0 +1,62 @@
+"""In-memory revocation index."""
+
+from src.auth.revocation import RevocationIndex
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def loaded_index(clock: FakeClock, lifetime: float = 100.0) -> RevocationIndex:
+    """Return an index that behaves as if it had been loaded from an empty table."""
+    index = RevocationIndex(capacity=1000, error_rate=0.001, lifetime=lifetime, clock=clock)
+    index.loaded = True
+    return index
+
+
+def test_unloaded_index_defers_to_the_table() -> None:
+    """Before loading, every ID counts as possibly revoked."""
+    index = RevocationIndex(capacity=1000, error_rate=0.001, lifetime=100.0)
+
+    assert index.might_be_revoked('never-revoked')
+
+
+def test_revoked_ids_are_found() -> None:
+    """Added IDs are reported, others are not."""
+    index = loaded_index(FakeClock())
+    index.add('used-token')
+
+    assert index.might_be_revoked('fresh-token', 'used-token')
+    assert not index.might_be_revoked('fresh-token', 'fresh-family')
+
+
+def test_ids_expire_after_one_to_two_lifetimes() -> None:
+    """An ID survives one rotation and is dropped by the second."""
+    clock = FakeClock()
+    index = loaded_index(clock)
+    index.add('used-token')
+
+    clock.now += 150.0
+    assert index.might_be_revoked('used-token')
+
+    clock.now += 100.0
+    assert not index.might_be_revoked('used-token')
+
+
+def test_long_idle_period_drops_everything() -> None:
+    """After two idle lifetimes both generations are cleared at once."""
+    clock = FakeClock()
+    index = loaded_index(clock)
+    index.add('used-token')
+
+    clock.now += 250.0
+
+    assert not index.might_be_revoked('used-token')
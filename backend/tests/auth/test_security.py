@@ -0,0 +1,83 @@
+"""Password hashing and the hashing worker pool."""
+
+import asyncio
+
+import pytest
+
+from src.auth import security
+from src.auth.hashing import HashingPoolSaturatedError, PasswordHasher
+
+FAST_COST = 10
+
+
+def test_hash_and_verify() -> None:
+    """A scrypt hash verifies only the original password."""
+    hashed = security.hash_password('qwerty', FAST_COST)
+
+    assert hashed.startswith('scrypt$')
+    assert security.verify_password('qwerty', hashed)
+    assert not security.verify_password('QWERTY', hashed)
+
+
+def test_hashes_are_salted() -> None:
+    """Hashing the same password twice gives different hashes."""
+    assert security.hash_password('qwerty', FAST_COST) != security.hash_password('qwerty', FAST_COST)
+
+
+def test_legacy_hash_is_verified_and_flagged() -> None:
+    """Bare SHA-256 hashes still verify and are marked for rehash."""
+    legacy = security.hash_password_legacy('qwerty')
+
+    assert security.verify_password('qwerty', legacy)
+    assert not security.verify_password('wrong', legacy)
+    assert security.needs_rehash(legacy, FAST_COST)
+
+
+def test_needs_rehash_on_cost_increase() -> None:
+    """Hashes weaker than the current cost are marked for rehash."""
+    hashed = security.hash_password('qwerty', FAST_COST)
+
+    assert not security.needs_rehash(hashed, FAST_COST)
+    assert security.needs_rehash(hashed, FAST_COST + 1)
+
+
+def test_malformed_hash_is_rejected() -> None:
+    """Garbage in the password column never verifies."""
+    assert not security.verify_password('qwerty', 'scrypt$not-a-hash')
+
+
+def test_calibrate_cost_respects_bounds() -> None:
+    """Calibration stays within the requested cost range."""
+    assert security.calibrate_cost(0.001, min_cost=FAST_COST, max_cost=FAST_COST + 2) == FAST_COST
+    assert FAST_COST <= security.calibrate_cost(10_000, min_cost=FAST_COST, max_cost=FAST_COST + 1) <= FAST_COST + 1
+
+
+@pytest.mark.asyncio
+async def test_hasher_round_trip() -> None:
+    """Hashing through the pool produces verifiable hashes."""
+    hasher = PasswordHasher(workers=2, max_queue=2, cost=FAST_COST)
+    try:
+        hashed = await hasher.hash('qwerty')
+        assert await hasher.verify('qwerty', hashed)
+        assert not hasher.needs_rehash(hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hasher_rejects_when_saturated() -> None:
+    """Submitting beyond the pool capacity fails fast with a retry hint."""
+    hasher = PasswordHasher(workers=1, max_queue=0, cost=FAST_COST)
+    hasher.start()
+    try:
+        running = asyncio.create_task(hasher.hash('first'))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HashingPoolSaturatedError) as exc_info:
+            await hasher.hash('second')
+
+        assert exc_info.value.retry_after >= 1
+        await running
+        assert hasher.in_flight == 0
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,61 @@
+"""Verified access token cache."""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi_jwt import JwtAccessBearerCookie
+
+from src.auth.jwt_security import get_access_security, get_refresh_security
+from src.auth.token_cache import CachedJwtAccess, VerifiedTokenCache
+
+
+@pytest.mark.asyncio
+async def test_token_is_verified_once() -> None:
+    """A repeated token is answered from the cache."""
+    cache = VerifiedTokenCache(maxsize=10)
+    dependency = CachedJwtAccess(get_access_security, cache)
+    token = get_access_security().create_access_token(subject={'username': 'cached'})
+
+    first = await dependency(bearer=None, cookie=token)
+    second = await dependency(bearer=None, cookie=token)
+
+    assert second is first
+    assert first.subject == {'username': 'cached'}
+    assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_not_cached() -> None:
+    """Tokens past their expiry are rejected and never stored."""
+    cache = VerifiedTokenCache(maxsize=10)
+    dependency = CachedJwtAccess(get_access_security, cache)
+    token = get_access_security().create_access_token(subject={'username': 'old'}, expires_delta=timedelta(seconds=-60))
+
+    with pytest.raises(HTTPException):
+        await dependency(bearer=None, cookie=token)
+
+    assert cache.stats()['size'] == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_forged_tokens_are_rejected() -> None:
+    """Only access tokens signed with our key are accepted."""
+    dependency = CachedJwtAccess(get_access_security, VerifiedTokenCache(maxsize=10))
+    forged = JwtAccessBearerCookie(secret_key='other-key').create_access_token(subject={'username': 'evil'})
+    refresh = get_refresh_security().create_refresh_token(subject={'username': 'cached'})
+
+    for token in (forged, refresh):
+        with pytest.raises(HTTPException):
+            await dependency(bearer=None, cookie=token)
+
+
+@pytest.mark.asyncio
+async def test_missing_token() -> None:
+    """Requests without a token are rejected with the library's message."""
+    dependency = CachedJwtAccess(get_access_security, VerifiedTokenCache(maxsize=10))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(bearer=None, cookie=None)
+
+    assert 'credentials' in exc_info.value.detail.lower()
@@ -3,6 +3,7 @@
 from collections.abc import AsyncGenerator
 from typing import Any
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import NullPool
@@ -14,9 +15,10 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.config import settings
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.main import app
 from src.models.base import Base
+from src.utils.rate_limit import rate_limiter
 
 # ---------------------------------------------------------------------
 # Use a dedicated test database (can be overridden via environment vars)
@@ -24,6 +26,15 @@ from src.models.base import Base
 TEST_DATABASE_URL = settings.database_url + '_test'
 
 
+# ---------------------------------------------------------------------
+# Rate limits would trip on the many registrations made from one test client
+# ---------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def disable_rate_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Turn the auth rate limiter off; rate limit tests enable it explicitly."""
+    monkeypatch.setattr(rate_limiter, 'enabled', False)
+
+
 # ---------------------------------------------------------------------
 # Async SQLAlchemy engine + schema setup/teardown
 # ---------------------------------------------------------------------
@@ -71,6 +82,7 @@ async def override_get_db(db_session: AsyncSession) -> AsyncGenerator[None, None
         yield db_session
 
     app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_db
     yield
     app.dependency_overrides.clear()
 
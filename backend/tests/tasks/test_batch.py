@@ -0,0 +1,88 @@
+"""/api/tasks/batch."""
+
+import uuid
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from .test_tasks import register
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_each_operation(client: AsyncClient) -> None:
+    """Creates, updates and deletes are applied together with per-item results."""
+    await register(client, 'batch_user')
+    existing = (await client.post('/api/tasks', json={'title': 'old'})).json()['id']
+    to_delete = (await client.post('/api/tasks', json={'title': 'gone'})).json()['id']
+    client_id = str(uuid.uuid4())
+
+    response = await client.post(
+        '/api/tasks/batch',
+        json={
+            'operations': [
+                {'op': 'create', 'id': client_id, 'data': {'title': 'offline'}},
+                {'op': 'create', 'data': {'title': 'server id'}},
+                {'op': 'update', 'id': existing, 'data': {'status': 'done'}},
+                {'op': 'update', 'id': str(uuid.uuid4()), 'data': {'title': 'missing'}},
+                {'op': 'delete', 'id': to_delete},
+                {'op': 'delete', 'id': to_delete},
+                {'op': 'create', 'id': existing, 'data': {'title': 'clash'}},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()['results']
+    assert [item['status'] for item in results] == [
+        'created',
+        'created',
+        'updated',
+        'not_found',
+        'deleted',
+        'duplicate',
+        'duplicate',
+    ]
+    assert results[0]['id'] == client_id
+    assert (await client.get(f'/api/tasks/{existing}')).json()['status'] == 'done'
+    assert (await client.get(f'/api/tasks/{to_delete}')).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_batch_does_not_touch_other_users_tasks(client: AsyncClient) -> None:
+    """Ids of tasks owned by someone else are reported as not applied."""
+    await register(client, 'batch_victim')
+    foreign = (await client.post('/api/tasks', json={'title': 'mine'})).json()['id']
+    await register(client, 'batch_intruder')
+
+    response = await client.post(
+        '/api/tasks/batch',
+        json={'operations': [{'op': 'create', 'id': foreign, 'data': {'title': 'steal'}}]},
+    )
+    assert response.json()['results'][0]['status'] == 'conflict'
+
+    response = await client.post('/api/tasks/batch', json={'operations': [{'op': 'delete', 'id': foreign}]})
+    assert response.json()['results'][0]['status'] == 'not_found'
+
+
+@pytest.mark.asyncio
+async def test_reused_id_keeps_the_other_users_tombstone(client: AsyncClient) -> None:
+    """Reusing and deleting the id another user deleted does not hide that delete from their sync."""
+    task_id = str(uuid.uuid4())
+    await register(client, 'tombstone_owner')
+    await client.post(
+        '/api/tasks/batch', json={'operations': [{'op': 'create', 'id': task_id, 'data': {'title': 'a'}}]}
+    )
+    await client.delete(f'/api/tasks/{task_id}')
+
+    await register(client, 'tombstone_reuser')
+    response = await client.post(
+        '/api/tasks/batch', json={'operations': [{'op': 'create', 'id': task_id, 'data': {'title': 'b'}}]}
+    )
+    assert response.json()['results'][0]['status'] == 'created'
+    await client.delete(f'/api/tasks/{task_id}')
+    assert [task['id'] for task in (await client.get('/api/tasks/changes')).json()['deleted']] == [task_id]
+
+    await client.post('/api/auth/login', json={'username': 'tombstone_owner', 'password': 'secret'})
+    changes = (await client.get('/api/tasks/changes')).json()
+    assert [task['id'] for task in changes['deleted']] == [task_id]
@@ -0,0 +1,47 @@
+"""Response caching of the task read endpoints."""
+
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.utils.response_cache import response_cache
+
+from .test_tasks import register
+
+
+@pytest.fixture
+def enable_response_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Turn the response cache on for one test."""
+    monkeypatch.setattr(response_cache, 'enabled', True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('enable_response_cache')
+async def test_writes_invalidate_cached_listing(client: AsyncClient) -> None:
+    """A cached listing is revalidated with 304 until a write changes it."""
+    await register(client, 'cached_lister')
+    await client.post('/api/tasks', json={'title': 'first'})
+
+    listing = await client.get('/api/tasks')
+    etag = listing.headers['etag']
+    unchanged = await client.get('/api/tasks', headers={'If-None-Match': etag})
+    await client.post('/api/tasks', json={'title': 'second'})
+    changed = await client.get('/api/tasks', headers={'If-None-Match': etag})
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert [item['title'] for item in changed.json()['items']] == ['first', 'second']
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('enable_response_cache')
+async def test_cached_task_matches_uncached_rendering(client: AsyncClient) -> None:
+    """A task served from the cache has the same body as the handler's response."""
+    await register(client, 'cached_reader')
+    created = (await client.post('/api/tasks', json={'title': 'read me', 'priority': 1})).json()
+
+    first = await client.get(f'/api/tasks/{created["id"]}')
+    second = await client.get(f'/api/tasks/{created["id"]}')
+
+    assert first.json() == second.json() == created
@@ -0,0 +1,125 @@
+"""/api/tasks/changes."""
+
+import uuid
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import User
+from src.utils.response_cache import etag_matches
+
+from .test_tasks import register
+
+
+def test_etag_matches() -> None:
+    """Weak and listed tags match, other versions do not."""
+    assert etag_matches('"7"', '"7"')
+    assert etag_matches('W/"7", "8"', '"7"')
+    assert etag_matches('*', '"7"')
+    assert not etag_matches('"6"', '"7"')
+
+
+@pytest.mark.asyncio
+async def test_changes_since_version(client: AsyncClient) -> None:
+    """Only rows written after ``since`` are returned, deletions as tombstones."""
+    await register(client, 'sync_user')
+    kept = (await client.post('/api/tasks', json={'title': 'kept'})).json()
+    gone = (await client.post('/api/tasks', json={'title': 'gone'})).json()
+
+    full = (await client.get('/api/tasks/changes')).json()
+    assert [task['id'] for task in full['changed']] == [kept['id'], gone['id']]
+    assert full['deleted'] == []
+
+    await client.patch(f'/api/tasks/{kept["id"]}', json={'status': 'done'})
+    await client.delete(f'/api/tasks/{gone["id"]}')
+
+    delta = (await client.get('/api/tasks/changes', params={'since': full['version']})).json()
+    assert [task['id'] for task in delta['changed']] == [kept['id']]
+    assert [task['id'] for task in delta['deleted']] == [gone['id']]
+    assert delta['version'] > full['version']
+    assert not delta['has_more']
+
+
+@pytest.mark.asyncio
+async def test_changes_not_modified(client: AsyncClient) -> None:
+    """A poll with the current ETag gets 304 until something changes."""
+    await register(client, 'sync_poller')
+    await client.post('/api/tasks', json={'title': 'first'})
+
+    first = await client.get('/api/tasks/changes')
+    etag = first.headers['etag']
+    since = first.json()['version']
+
+    again = await client.get('/api/tasks/changes', params={'since': since}, headers={'If-None-Match': etag})
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    assert again.content == b''
+
+    await client.post('/api/tasks', json={'title': 'second'})
+    changed = await client.get('/api/tasks/changes', params={'since': since}, headers={'If-None-Match': etag})
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers['etag'] != etag
+
+
+@pytest.mark.asyncio
+async def test_changes_pages_keep_batches_whole(client: AsyncClient) -> None:
+    """A page never ends inside one batch, and ``has_more`` leads to the rest."""
+    await register(client, 'sync_pager')
+    await client.post('/api/tasks', json={'title': 'single'})
+    await client.post('/api/tasks/batch', json={'operations': [{'op': 'create', 'data': {'title': 'b'}}] * 3})
+    await client.post('/api/tasks', json={'title': 'last'})
+
+    first = await client.get('/api/tasks/changes', params={'limit': 2})
+    page = first.json()
+    assert len(page['changed']) == 4  # noqa: PLR2004
+    assert page['has_more']
+
+    params = {'since': page['version'], 'limit': 2}
+    headers = {'If-None-Match': first.headers['etag']}
+    rest = (await client.get('/api/tasks/changes', params=params, headers=headers)).json()
+    assert [task['title'] for task in rest['changed']] == ['last']
+    assert not rest['has_more']
+
+
+@pytest.mark.asyncio
+async def test_resync_ignores_the_current_etag(client: AsyncClient) -> None:
+    """A full sync sent with the ETag of an up-to-date poll still returns every task."""
+    await register(client, 'sync_resync')
+    await client.post('/api/tasks', json={'title': 'kept'})
+    etag = (await client.get('/api/tasks/changes')).headers['etag']
+
+    resync = await client.get('/api/tasks/changes', params={'since': 0}, headers={'If-None-Match': etag})
+
+    assert resync.status_code == HTTPStatus.OK
+    assert [task['title'] for task in resync.json()['changed']] == ['kept']
+
+
+@pytest.mark.asyncio
+async def test_missing_tasks_do_not_advance_the_version(client: AsyncClient) -> None:
+    """A PATCH or DELETE answered with 404 leaves the change version alone."""
+    await register(client, 'sync_missing')
+    await client.post('/api/tasks', json={'title': 'only'})
+    before = (await client.get('/api/tasks/changes')).json()['version']
+
+    missing = uuid.uuid4()
+    patched = await client.patch(f'/api/tasks/{missing}', json={'title': 'nope'})
+    deleted = await client.delete(f'/api/tasks/{missing}')
+    batch = await client.post('/api/tasks/batch', json={'operations': [{'op': 'delete', 'id': str(missing)}]})
+
+    assert patched.status_code == deleted.status_code == HTTPStatus.NOT_FOUND
+    assert batch.json()['results'][0]['status'] == 'not_found'
+    assert (await client.get('/api/tasks/changes')).json()['version'] == before
+
+
+@pytest.mark.asyncio
+async def test_writes_of_a_deleted_user_are_unauthorized(client: AsyncClient, db_session: AsyncSession) -> None:
+    """A token that outlives its user gets 401 on writes instead of a server error."""
+    await register(client, 'sync_deleted')
+    await db_session.execute(delete(User).where(User.username == 'sync_deleted'))
+    await db_session.commit()
+
+    response = await client.post('/api/tasks', json={'title': 'orphan'})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
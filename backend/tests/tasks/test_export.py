@@ -0,0 +1,84 @@
+"""/api/tasks/export."""
+
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Task
+from src.tasks.export import ExportFormat, encode_chunks
+from src.utils.database import create_user
+from src.utils.tasks import EXPORT_COLUMNS, stream_task_rows
+
+from .test_tasks import register
+
+CHUNK_ROWS = 200
+
+
+async def rows_of(*chunks: list[tuple]) -> AsyncGenerator[list[tuple], None]:
+    """Yield the given chunks like :func:`stream_task_rows` does."""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_encoders() -> None:
+    """NDJSON emits one object per row and CSV starts with a header."""
+    task_id = uuid.uuid4()
+    row = (task_id, 'Title, with comma', None, 'open', 1, None, datetime(2030, 1, 1, tzinfo=UTC), datetime.now(UTC))
+
+    ndjson = b''.join([chunk async for chunk in encode_chunks(rows_of([row]), ExportFormat.NDJSON)])
+    csv_body = b''.join([chunk async for chunk in encode_chunks(rows_of([row]), ExportFormat.CSV)])
+
+    assert json.loads(ndjson.splitlines()[0])['id'] == str(task_id)
+    parsed = list(csv.reader(io.StringIO(csv_body.decode())))
+    assert parsed[0] == list(EXPORT_COLUMNS)
+    assert parsed[1][1] == 'Title, with comma'
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint(client: AsyncClient) -> None:
+    """The endpoint streams the user's tasks in the requested format."""
+    await register(client, 'export_user')
+    for title in ('a', 'b', 'c'):
+        await client.post('/api/tasks', json={'title': title})
+
+    response = await client.get('/api/tasks/export', params={'format': 'csv'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert len(response.text.strip().splitlines()) == 4  # noqa: PLR2004
+
+
+async def export_peak_memory(db: AsyncSession, rows: int) -> int:
+    """Seed ``rows`` tasks for a new user and return the peak traced memory of exporting them."""
+    owner = await create_user(db, f'export_{rows}', 'hash')
+    await db.execute(insert(Task), [{'owner_id': owner.id, 'title': f'task {i}'} for i in range(rows)])
+    await db.commit()
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    async for chunk in encode_chunks(stream_task_rows(db, owner.id, CHUNK_ROWS), ExportFormat.NDJSON):
+        del chunk
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    await db.commit()
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_export_memory_stays_flat(db_session: AsyncSession) -> None:
+    """Peak memory of an export does not grow with the number of rows."""
+    small = await export_peak_memory(db_session, 1_000)
+    large = await export_peak_memory(db_session, 20_000)
+
+    assert large < small * 1.5
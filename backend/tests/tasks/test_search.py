@@ -0,0 +1,75 @@
+"""/api/tasks/search."""
+
+import uuid
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.utils.tasks import decode_search_cursor, encode_search_cursor, prefix_tsquery
+
+from .test_tasks import register
+
+
+def test_prefix_tsquery() -> None:
+    """Every word becomes a prefix term and tsquery operators are dropped."""
+    assert prefix_tsquery('Buy mil') == 'buy:* & mil:*'
+    assert prefix_tsquery("a|b & !c ' :*") == 'a:* & b:* & c:*'
+    assert prefix_tsquery('!!') is None
+
+
+def test_search_cursor_round_trip() -> None:
+    """A search cursor decodes to the position it was built from."""
+    position = (True, 0.0607927, uuid.uuid4())
+
+    assert decode_search_cursor(encode_search_cursor(position)) == position
+
+
+@pytest.mark.asyncio
+async def test_search_prefix_and_rank(client: AsyncClient) -> None:
+    """Prefixes match as-you-type and title matches rank above description matches."""
+    await register(client, 'search_user')
+    await client.post('/api/tasks', json={'title': 'Call mom', 'description': 'about the milkshake recipe'})
+    await client.post('/api/tasks', json={'title': 'Buy milk'})
+    await client.post('/api/tasks', json={'title': 'Walk the dog'})
+
+    response = await client.get('/api/tasks/search', params={'q': 'mil'})
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [task['title'] for task in body['items']] == ['Buy milk', 'Call mom']
+    assert not body['fuzzy']
+
+
+@pytest.mark.asyncio
+async def test_search_trigram_fallback(client: AsyncClient) -> None:
+    """A misspelled word still finds the task through the trigram fallback."""
+    await register(client, 'search_typo')
+    await client.post('/api/tasks', json={'title': 'Buy groceries'})
+
+    body = (await client.get('/api/tasks/search', params={'q': 'grocerys'})).json()
+
+    assert [task['title'] for task in body['items']] == ['Buy groceries']
+    assert body['fuzzy']
+
+
+@pytest.mark.asyncio
+async def test_search_pagination(client: AsyncClient) -> None:
+    """Pages continue after the cursor without repeats."""
+    await register(client, 'search_pager')
+    for i in range(5):
+        await client.post('/api/tasks', json={'title': f'report {i}'})
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {'q': 'rep', 'limit': 2} | ({'cursor': cursor} if cursor else {})
+        page = (await client.get('/api/tasks/search', params=params)).json()
+        seen.extend(task['id'] for task in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5  # noqa: PLR2004
+    invalid = await client.get('/api/tasks/search', params={'q': 'x', 'cursor': '!'})
+    assert invalid.status_code == HTTPStatus.BAD_REQUEST
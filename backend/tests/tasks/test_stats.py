@@ -0,0 +1,79 @@
+"""/api/tasks/stats and the repair of the task counters."""
+
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.models import TaskStats, User
+from src.tasks import stats
+from src.utils.tasks import repair_task_stats
+
+from .test_tasks import register
+
+EMPTY = {'open': 0, 'in_progress': 0, 'done': 0, 'overdue': 0, 'total': 0}
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_every_write(client: AsyncClient) -> None:
+    """Creates, status changes, deletes and batches all move the counters."""
+    await register(client, 'stats_user')
+    assert (await client.get('/api/tasks/stats')).json() == EMPTY
+
+    past = (datetime.now(UTC) - timedelta(days=1)).isoformat()
+    first = (await client.post('/api/tasks', json={'title': 'late', 'due_at': past})).json()['id']
+    second = (await client.post('/api/tasks', json={'title': 'late but done', 'due_at': past, 'status': 'done'})).json()
+    await client.post('/api/tasks', json={'title': 'someday'})
+    await client.patch(f'/api/tasks/{first}', json={'status': 'in_progress'})
+    await client.patch(f'/api/tasks/{first}', json={'title': 'renamed'})
+    await client.delete(f'/api/tasks/{second["id"]}')
+    await client.post(
+        '/api/tasks/batch',
+        json={'operations': [{'op': 'create', 'data': {'title': f'batch {n}', 'status': 'done'}} for n in range(3)]},
+    )
+
+    response = await client.get('/api/tasks/stats')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'open': 1, 'in_progress': 1, 'done': 3, 'overdue': 1, 'total': 5}
+
+
+@pytest.mark.asyncio
+async def test_repair_fixes_drifted_counters(client: AsyncClient, db_session: AsyncSession) -> None:
+    """A recount overwrites counters that no longer match the tasks and leaves correct ones alone."""
+    await register(client, 'stats_drift')
+    await client.post('/api/tasks', json={'title': 'one'})
+    await client.post('/api/tasks', json={'title': 'two', 'status': 'done'})
+    owner_id = await db_session.scalar(select(User.id).where(User.username == 'stats_drift'))
+    await db_session.execute(update(TaskStats).where(TaskStats.owner_id == owner_id).values(open=42))
+    await db_session.commit()
+
+    assert await repair_task_stats(db_session, batch_size=2) == 1
+    assert (await client.get('/api/tasks/stats')).json() == {**EMPTY, 'open': 1, 'done': 1, 'total': 2}
+    assert await repair_task_stats(db_session, batch_size=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_repair_job_skips_while_another_worker_repairs(
+    client: AsyncClient, db_session: AsyncSession, test_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The job leaves the counters alone while another transaction holds the repair lock."""
+    sessions = async_sessionmaker(test_engine, expire_on_commit=False)
+    monkeypatch.setattr(stats, 'database', SimpleNamespace(engine=test_engine, sessions=sessions))
+    await register(client, 'stats_locked')
+    await client.post('/api/tasks', json={'title': 'one'})
+    owner_id = await db_session.scalar(select(User.id).where(User.username == 'stats_locked'))
+    await db_session.execute(update(TaskStats).where(TaskStats.owner_id == owner_id).values(open=42))
+    await db_session.commit()
+    assert await db_session.scalar(stats.TRY_LOCK_REPAIR)
+
+    await stats.repair_stats([None])
+
+    assert await db_session.scalar(select(TaskStats.open).where(TaskStats.owner_id == owner_id)) == 42  # noqa: PLR2004
+    await db_session.rollback()
+    await stats.repair_stats([None])
+    assert (await client.get('/api/tasks/stats')).json()['open'] == 1
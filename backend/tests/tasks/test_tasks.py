@@ -0,0 +1,83 @@
+"""/api/tasks."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.utils.tasks import decode_cursor, encode_cursor
+
+
+async def register(client: AsyncClient, username: str) -> None:
+    """Register a user; the client keeps the access token cookie."""
+    response = await client.post(
+        '/api/auth/register',
+        json={'username': username, 'password': 'secret', 'confirm_password': 'secret'},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_cursor_round_trip() -> None:
+    """A cursor decodes to the position it was built from."""
+    position = (datetime(2030, 1, 2, 3, 4, tzinfo=UTC), uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(position)) == position
+    assert decode_cursor(encode_cursor((None, position[1]))) == (None, position[1])
+
+
+@pytest.mark.asyncio
+async def test_task_crud(client: AsyncClient) -> None:
+    """A task can be created, read, updated and deleted by its owner."""
+    await register(client, 'task_owner')
+
+    created = await client.post('/api/tasks', json={'title': 'Buy milk', 'priority': 2})
+    assert created.status_code == HTTPStatus.CREATED
+    task_id = created.json()['id']
+
+    updated = await client.patch(f'/api/tasks/{task_id}', json={'status': 'done', 'title': None})
+    assert updated.status_code == HTTPStatus.OK
+    assert updated.json()['status'] == 'done'
+    assert updated.json()['title'] == 'Buy milk'
+
+    assert (await client.delete(f'/api/tasks/{task_id}')).status_code == HTTPStatus.NO_CONTENT
+    assert (await client.get(f'/api/tasks/{task_id}')).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_keyset_pagination(client: AsyncClient) -> None:
+    """Pages follow due date order, undated tasks come last and done tasks are hidden."""
+    await register(client, 'task_pager')
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    for day in (3, 1, 2):
+        await client.post(
+            '/api/tasks', json={'title': f'day {day}', 'due_at': (start + timedelta(days=day)).isoformat()}
+        )
+    await client.post('/api/tasks', json={'title': 'someday'})
+    await client.post('/api/tasks', json={'title': 'finished', 'status': 'done'})
+
+    titles: list[str] = []
+    cursor = None
+    while True:
+        params = {'limit': 2} | ({'cursor': cursor} if cursor else {})
+        page = (await client.get('/api/tasks', params=params)).json()
+        titles.extend(item['title'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert titles == ['day 1', 'day 2', 'day 3', 'someday']
+
+    done = (await client.get('/api/tasks', params={'status': 'done'})).json()
+    assert [item['title'] for item in done['items']] == ['finished']
+
+
+@pytest.mark.asyncio
+async def test_tasks_require_authentication(client: AsyncClient) -> None:
+    """Task endpoints reject anonymous requests."""
+    client.cookies.clear()
+
+    response = await client.get('/api/tasks')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,38 @@
+"""Benchmark suite helpers and an in-process smoke run against the stand-in database."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.standin import standin_database
+from benchmarks.suite import ENDPOINTS, compare, percentile, run_endpoints
+from src.main import app
+
+
+def test_percentile_nearest_rank() -> None:
+    """Percentiles pick the nearest-rank sample."""
+    samples = [float(i) for i in range(1, 101)]
+
+    assert percentile(samples, 0.50) == 50.0  # noqa: PLR2004
+    assert percentile(samples, 0.99) == 99.0  # noqa: PLR2004
+    assert percentile([], 0.99) == 0.0
+
+
+def test_compare_flags_regressions() -> None:
+    """Throughput drops and p99 growth beyond the tolerance are reported."""
+    baseline = {'results': {'me': {'throughput_rps': 1000.0, 'p99_ms': 5.0, 'errors': 0}}}
+    steady = {'results': {'me': {'throughput_rps': 950.0, 'p99_ms': 5.2, 'errors': 0}}}
+    slower = {'results': {'me': {'throughput_rps': 700.0, 'p99_ms': 9.0, 'errors': 0}}}
+
+    assert compare(baseline, steady, 0.1) == []
+    assert len(compare(baseline, slower, 0.1)) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_suite_runs_against_standin() -> None:
+    """Every endpoint completes without errors in-process with users kept in memory."""
+    with standin_database(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://bench') as client:
+            results = await run_endpoints(client, ENDPOINTS, requests=4, concurrency=2)
+
+    assert set(results) == set(ENDPOINTS)
+    assert all(stats['errors'] == 0 and stats['requests'] == 4 for stats in results.values())  # noqa: PLR2004
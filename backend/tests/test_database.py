@@ -4,6 +4,9 @@ import pytest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.database import InstrumentedAsyncPool, engine_options, pool_sizing
+
 
 @pytest.mark.asyncio
 async def test_database_alive(db_session: AsyncSession) -> None:
@@ -15,3 +18,43 @@ async def test_database_alive(db_session: AsyncSession) -> None:
     print('📋 Tables:', tables)
 
     assert 'user' in tables, "The 'user' table was not found in the public schema."
+
+
+def test_pool_sizing_splits_budget_between_workers() -> None:
+    """Each worker gets an equal share of the connection budget."""
+    config = settings.model_copy(update={'db_max_connections': 90, 'uvicorn_workers': 3})
+
+    pool_size, max_overflow = pool_sizing(config)
+
+    assert (pool_size, max_overflow) == (20, 10)
+    assert (pool_size + max_overflow) * config.uvicorn_workers <= config.db_max_connections
+
+
+def test_pool_sizing_respects_explicit_values() -> None:
+    """Explicit pool size and overflow win over the derived split."""
+    config = settings.model_copy(update={'db_pool_size': 5, 'db_max_overflow': 0, 'uvicorn_workers': 8})
+
+    assert pool_sizing(config) == (5, 0)
+
+
+def test_engine_options_for_asyncpg() -> None:
+    """Pool knobs and the statement cache size reach the engine."""
+    config = settings.model_copy(
+        update={'database_url': 'postgresql+asyncpg://u:p@h/db', 'db_statement_cache_size': 0, 'db_pool_pre_ping': True}
+    )
+
+    options = engine_options(config)
+
+    assert options['poolclass'] is InstrumentedAsyncPool
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'prepared_statement_cache_size': 0}
+
+
+def test_engine_options_behind_pgbouncer() -> None:
+    """Transaction pooling mode disables statement caching and uses unique statement names."""
+    config = settings.model_copy(update={'database_url': 'postgresql+asyncpg://u:p@h/db', 'db_pgbouncer': True})
+
+    connect_args = engine_options(config)['connect_args']
+
+    assert connect_args['statement_cache_size'] == connect_args['prepared_statement_cache_size'] == 0
+    assert connect_args['prepared_statement_name_func']() != connect_args['prepared_statement_name_func']()
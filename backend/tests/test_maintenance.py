@@ -0,0 +1,43 @@
+"""Startup maintenance run once for a deployment."""
+
+from typing import Any
+
+import pytest
+
+from src import maintenance
+from src.utils.jobs import JobQueue
+
+
+class FakeDatabase:
+    """Records whether the pools were disposed."""
+
+    disposed = False
+
+    async def dispose(self) -> None:
+        """Remember the call."""
+        self.disposed = True
+
+
+@pytest.mark.asyncio
+async def test_failing_job_does_not_stop_the_others(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every startup job runs once, failures are counted and the pools are closed afterwards."""
+    queue = JobQueue(concurrency=1, max_pending=10, drain_timeout=1.0, retry_delay=0.0)
+    database = FakeDatabase()
+    runs: list[str] = []
+
+    @queue.register('broken')
+    async def broken(_: list[Any]) -> None:
+        runs.append('broken')
+        raise RuntimeError
+
+    @queue.register('purge')
+    async def purge(_: list[Any]) -> None:
+        runs.append('purge')
+
+    monkeypatch.setattr(maintenance, 'job_queue', queue)
+    monkeypatch.setattr(maintenance, 'database', database)
+    monkeypatch.setattr(maintenance, 'startup_jobs', lambda: ['broken', 'purge'])
+
+    assert await maintenance.run_startup_jobs() == 1
+    assert runs == ['broken', 'purge']
+    assert database.disposed
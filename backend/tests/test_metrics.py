@@ -0,0 +1,32 @@
+"""/api/metrics."""
+
+from http import HTTPStatus
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.config import settings
+from src.main import app
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_pool_and_hashing_gauges(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pool and hashing-pool gauges are rendered in the Prometheus text format."""
+    monkeypatch.setattr(settings, 'metrics_enabled', True)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/api/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert '# TYPE db_pool_checked_out gauge' in response.text
+    assert '# TYPE password_hash_in_flight gauge' in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_hidden_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without METRICS_ENABLED the endpoint answers 404."""
+    monkeypatch.setattr(settings, 'metrics_enabled', False)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/api/metrics')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
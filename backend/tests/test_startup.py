@@ -0,0 +1,38 @@
+"""Cold start time of the application."""
+
+from benchmarks.bench_startup import by_package, measure_startup, parse_importtime
+
+# Importing the app and building its OpenAPI schema in a fresh interpreter
+# takes about 1.2 s on a developer laptop; the budget leaves room for slow CI.
+STARTUP_BUDGET_SECONDS = 5.0
+
+
+def test_cold_start_stays_within_budget() -> None:
+    """A fresh worker imports the app and builds the schema within the budget."""
+    phases = measure_startup()
+
+    assert phases['import_seconds'] + phases['openapi_seconds'] < STARTUP_BUDGET_SECONDS
+
+
+def test_import_does_not_create_the_engine() -> None:
+    """The database driver is loaded by the lifespan, not by importing the app."""
+    assert measure_startup()['driver_loaded'] is False
+
+
+def test_parse_importtime() -> None:
+    """Import time lines are parsed with their nesting and summed per package."""
+    output = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |     sqlalchemy.sql\n'
+        'import time:        30 |        150 |   sqlalchemy\n'
+        'import time:        50 |        200 | src.main\n'
+    )
+
+    records = parse_importtime(output)
+
+    assert [(record.module, record.depth) for record in records] == [
+        ('sqlalchemy.sql', 2),
+        ('sqlalchemy', 1),
+        ('src.main', 0),
+    ]
+    assert by_package(records) == {'sqlalchemy': 150, 'src': 50}
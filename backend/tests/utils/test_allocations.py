@@ -0,0 +1,64 @@
+"""Per-route allocation profiling middleware."""
+
+import tracemalloc
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app as main_app
+from src.utils.allocations import AllocationProfiler, AllocationProfilerMiddleware
+
+
+def profiled_app(profiler: AllocationProfiler) -> FastAPI:
+    """Return an app whose only route keeps a known amount of memory alive until its response ends."""
+    app = FastAPI()
+    app.add_middleware(AllocationProfilerMiddleware, profiler=profiler)
+
+    @app.get('/items/{item_id}')
+    async def item(item_id: int) -> dict[str, int]:
+        ballast = bytearray(256 * 1024)
+        return {'id': item_id, 'size': len(ballast)}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_are_measured_per_route_with_sampled_snapshots() -> None:
+    """Peak memory is recorded under the route template, and sampled requests keep their top lines."""
+    profiler = AllocationProfiler(sample_every=2)
+    profiler.start()
+    try:
+        async with AsyncClient(transport=ASGITransport(app=profiled_app(profiler)), base_url='http://test') as client:
+            for item_id in range(3):
+                assert (await client.get(f'/items/{item_id}')).status_code == HTTPStatus.OK
+    finally:
+        profiler.stop()
+
+    route = profiler.routes['GET', '/items/{item_id}']
+    assert route.requests == 3  # noqa: PLR2004
+    assert route.peak >= 3 * 256 * 1024
+    assert route.top
+    assert 'GET /items/{item_id}' in profiler.report()
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_recorded_without_tracing() -> None:
+    """Requests pass straight through while tracemalloc is not running."""
+    assert not tracemalloc.is_tracing()
+    profiler = AllocationProfiler(sample_every=1)
+
+    async with AsyncClient(transport=ASGITransport(app=profiled_app(profiler)), base_url='http://test') as client:
+        await client.get('/items/1')
+
+    assert not profiler.routes
+
+
+@pytest.mark.asyncio
+async def test_report_endpoint_is_hidden_when_disabled() -> None:
+    """The report is only served with allocation profiling enabled."""
+    async with AsyncClient(transport=ASGITransport(app=main_app), base_url='http://test') as client:
+        response = await client.get('/api/allocations')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,66 @@
+"""Monthly partitions of the auth event log."""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import AuthEvent, AuthEventKind
+from src.utils.auth_events import (
+    LIST_PARTITIONS,
+    create_monthly_partitions,
+    drop_expired_partitions,
+    insert_auth_events,
+)
+
+
+def event_at(occurred_at: datetime) -> dict[str, object]:
+    """Return the column values of a login recorded at ``occurred_at``."""
+    return {'occurred_at': occurred_at, 'kind': AuthEventKind.LOGIN, 'username': 'partitioned'}
+
+
+async def partition_of(db: AsyncSession, occurred_at: datetime) -> str:
+    """Return the partition holding the event recorded at ``occurred_at``."""
+    stmt = select(text('tableoid::regclass::text')).select_from(AuthEvent).where(AuthEvent.occurred_at == occurred_at)
+    return await db.scalar(stmt)
+
+
+@pytest.mark.asyncio
+async def test_partitions_are_created_ahead_once(db_session: AsyncSession) -> None:
+    """The current and the following months get partitions, and a second run changes nothing."""
+    now = datetime(2001, 11, 20, tzinfo=UTC)
+
+    names = await create_monthly_partitions(db_session, now, months_ahead=2)
+    assert await create_monthly_partitions(db_session, now, months_ahead=2) == names
+
+    assert names == ['auth_event_p2001_11', 'auth_event_p2001_12', 'auth_event_p2002_01']
+    assert set(names) <= set((await db_session.execute(LIST_PARTITIONS)).scalars())
+
+
+@pytest.mark.asyncio
+async def test_rows_in_the_default_partition_are_moved_out(db_session: AsyncSession) -> None:
+    """Events written before their month had a partition end up in the new partition."""
+    stranded = datetime(2003, 4, 2, 8, 30, tzinfo=UTC)
+    await insert_auth_events(db_session, [event_at(stranded)], chunk_rows=10)
+    assert await partition_of(db_session, stranded) == 'auth_event_default'
+
+    await create_monthly_partitions(db_session, datetime(2003, 3, 31, tzinfo=UTC), months_ahead=1)
+
+    assert await partition_of(db_session, stranded) == 'auth_event_p2003_04'
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_and_default_rows_are_dropped(db_session: AsyncSession) -> None:
+    """Months that ended before the retention window go, later ones stay."""
+    await create_monthly_partitions(db_session, datetime(1998, 3, 1, tzinfo=UTC), months_ahead=2)
+    expired = datetime(1997, 1, 5, tzinfo=UTC)
+    await insert_auth_events(db_session, [event_at(expired)], chunk_rows=10)
+
+    dropped = await drop_expired_partitions(db_session, datetime(1999, 5, 10, tzinfo=UTC), retention_months=12)
+
+    assert sorted(dropped) == ['auth_event_p1998_03', 'auth_event_p1998_04']
+    partitions = set((await db_session.execute(LIST_PARTITIONS)).scalars())
+    assert 'auth_event_p1998_05' in partitions
+    assert 'auth_event_default' in partitions
+    assert await partition_of(db_session, expired) is None
@@ -0,0 +1,33 @@
+"""Bloom filter."""
+
+from src.utils.bloom import BloomFilter
+
+ERROR_RATE = 0.01
+SAMPLES = 20_000
+
+
+def test_added_keys_are_always_found() -> None:
+    """A Bloom filter has no false negatives, even beyond its capacity."""
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    keys = [f'token-{number}' for number in range(500)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert len(bloom) == len(keys)
+
+
+def test_false_positive_rate_is_near_target() -> None:
+    """At capacity, unknown keys are reported as present at about the configured rate."""
+    bloom = BloomFilter(capacity=10_000, error_rate=ERROR_RATE)
+    for number in range(10_000):
+        bloom.add(f'revoked-{number}')
+
+    false_positives = sum(f'unknown-{number}' in bloom for number in range(SAMPLES))
+
+    assert false_positives / SAMPLES < 2 * ERROR_RATE
+
+
+def test_empty_filter_contains_nothing() -> None:
+    """A fresh filter answers no for every key."""
+    assert 'anything' not in BloomFilter(capacity=10)
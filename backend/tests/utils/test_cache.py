@@ -0,0 +1,73 @@
+"""LRU cache and the username lookup cache."""
+
+import time
+import uuid
+
+import pytest
+
+from src.utils.cache import MISSING, InMemoryCacheBackend, LRUCache
+from src.utils.user_cache import UserCache
+
+
+def test_lru_hit_miss_and_eviction() -> None:
+    """The least recently used entry is evicted once the size bound is hit."""
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3  # noqa: PLR2004
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2}
+
+
+def test_lru_caches_none_and_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    """None is cached like any other value and dropped after its TTL."""
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set('ghost', None, ttl=1)
+    assert cache.get('ghost') is None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 2)
+
+    assert cache.get('ghost') is MISSING
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_user_cache_negative_and_invalidate() -> None:
+    """A cached miss is served until the username is invalidated."""
+    cache = UserCache(maxsize=10, ttl=60, negative_ttl=60)
+    assert await cache.get('bob') is MISSING
+
+    await cache.set('bob', None)
+    assert await cache.get('bob') is None
+
+    await cache.invalidate('bob')
+    assert await cache.get('bob') is MISSING
+
+
+@pytest.mark.asyncio
+async def test_user_cache_shared_backend() -> None:
+    """A user cached by one worker is visible to another through the shared backend."""
+    shared = InMemoryCacheBackend()
+    first = UserCache(maxsize=10, ttl=60, negative_ttl=60, shared=shared)
+    second = UserCache(maxsize=10, ttl=60, negative_ttl=60, shared=shared)
+    user_id = uuid.uuid4()
+
+    await first.set('alice', user_id)
+    cached = await second.get('alice')
+
+    assert cached == user_id
+    assert second.stats()['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_cache_disabled() -> None:
+    """A disabled cache never answers lookups."""
+    cache = UserCache(maxsize=10, ttl=60, negative_ttl=60, enabled=False)
+    await cache.set('bob', None)
+    assert await cache.get('bob') is MISSING
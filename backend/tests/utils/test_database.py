@@ -0,0 +1,56 @@
+"""User helpers in src.utils.database."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.utils.database import UPDATE_USER_PASSWORD, create_user, create_users, get_user_by_username
+from src.utils.user_cache import UserRecord, user_cache
+
+
+@pytest.mark.asyncio
+async def test_create_user_reports_conflict(db_session: AsyncSession) -> None:
+    """The second insert of a username returns None instead of a user."""
+    created = await create_user(db_session, 'upsert_user', 'hash')
+    duplicate = await create_user(db_session, 'upsert_user', 'other-hash')
+
+    assert created is not None
+    assert duplicate is None
+    assert (await get_user_by_username(db_session, 'upsert_user')).password == 'hash'
+
+
+@pytest.mark.asyncio
+async def test_lookups_return_plain_records(db_session: AsyncSession) -> None:
+    """Users are loaded as column records, never as ORM instances in the session."""
+    created = await create_user(db_session, 'record_user', 'hash')
+    await user_cache.invalidate('record_user')
+
+    loaded = await get_user_by_username(db_session, 'record_user')
+
+    assert isinstance(created, UserRecord)
+    assert isinstance(loaded, UserRecord)
+    assert (loaded.id, loaded.username, loaded.password) == (created.id, 'record_user', 'hash')
+    assert not db_session.identity_map
+
+
+@pytest.mark.asyncio
+async def test_lookup_reads_a_password_changed_elsewhere(db_session: AsyncSession) -> None:
+    """A hash changed by another worker, whose cache this worker never hears of, is the one returned."""
+    created = await create_user(db_session, 'changed_user', 'old-hash')
+    await db_session.execute(UPDATE_USER_PASSWORD, {'user_id': created.id, 'password_hash': 'new-hash'})
+    await db_session.commit()
+
+    assert (await get_user_by_username(db_session, 'changed_user')).password == 'new-hash'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('use_copy', [False, True])
+async def test_create_users_skips_existing(db_session: AsyncSession, use_copy: bool) -> None:
+    """Bulk creation inserts new usernames and skips taken ones."""
+    prefix = f'bulk_{int(use_copy)}'
+    await create_user(db_session, f'{prefix}_taken', 'hash')
+    users = [(f'{prefix}_{i}', 'hash') for i in range(100)] + [(f'{prefix}_taken', 'hash')]
+
+    created = await create_users(db_session, users, use_copy=use_copy)
+
+    assert sorted(created) == sorted(f'{prefix}_{i}' for i in range(100))
+    assert await get_user_by_username(db_session, f'{prefix}_42') is not None
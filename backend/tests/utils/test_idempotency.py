@@ -0,0 +1,150 @@
+"""Idempotency-Key middleware and its stores."""
+
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.utils.idempotency import (
+    DatabaseIdempotencyStore,
+    IdempotencyMiddleware,
+    MemoryIdempotencyStore,
+    StoredResponse,
+)
+
+
+def counting_app(gate: asyncio.Event | None = None) -> tuple[FastAPI, list[bytes]]:
+    """Return an app whose POST handler records each body it runs for, and that list."""
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=MemoryIdempotencyStore(100, 60.0), wait=1.0, max_body=1024)
+    calls: list[bytes] = []
+
+    @app.post('/items', status_code=HTTPStatus.CREATED)
+    async def create(request: Request) -> dict[str, int]:
+        calls.append(await request.body())
+        if gate is not None:
+            await gate.wait()
+        return {'id': len(calls)}
+
+    @app.post('/flaky')
+    async def flaky() -> dict[str, int]:
+        calls.append(b'')
+        if len(calls) == 1:
+            raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+        return {'attempt': len(calls)}
+
+    return app, calls
+
+
+def client_for(app: FastAPI) -> AsyncClient:
+    """Return a client calling ``app`` in-process."""
+    return AsyncClient(transport=ASGITransport(app=app), base_url='http://test')
+
+
+@pytest.mark.asyncio
+async def test_retry_is_replayed_without_running_the_handler() -> None:
+    """A repeated key gets the stored status and body back, marked as replayed."""
+    app, calls = counting_app()
+    async with client_for(app) as client:
+        first = await client.post('/items', json={'title': 'a'}, headers={'Idempotency-Key': 'k1'})
+        retry = await client.post('/items', json={'title': 'a'}, headers={'Idempotency-Key': 'k1'})
+        other = await client.post('/items', json={'title': 'a'}, headers={'Idempotency-Key': 'k2'})
+        plain = await client.post('/items', json={'title': 'a'})
+
+    assert len(calls) == 3  # noqa: PLR2004
+    assert retry.status_code == first.status_code == HTTPStatus.CREATED
+    assert retry.json() == first.json() == {'id': 1}
+    assert retry.headers['idempotent-replayed'] == 'true'
+    assert 'idempotent-replayed' not in first.headers
+    assert other.json() == {'id': 2}
+    assert plain.json() == {'id': 3}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_with_one_key_run_once() -> None:
+    """Requests arriving while the first is running wait for its response."""
+    gate = asyncio.Event()
+    app, calls = counting_app(gate)
+    async with client_for(app) as client:
+        requests = [
+            asyncio.create_task(client.post('/items', json={'title': 'a'}, headers={'Idempotency-Key': 'same'}))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        gate.set()
+        responses = await asyncio.gather(*requests)
+
+    assert len(calls) == 1
+    assert {response.json()['id'] for response in responses} == {1}
+    assert sum('idempotent-replayed' in response.headers for response in responses) == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_another_body_is_rejected() -> None:
+    """The same key with a different body is an error, not a replay."""
+    app, calls = counting_app()
+    async with client_for(app) as client:
+        await client.post('/items', json={'title': 'a'}, headers={'Idempotency-Key': 'k'})
+        response = await client.post('/items', json={'title': 'b'}, headers={'Idempotency-Key': 'k'})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_credentials() -> None:
+    """Two clients using the same key do not share responses."""
+    app, calls = counting_app()
+    async with client_for(app) as client:
+        for token in ('alice', 'bob'):
+            headers = {'Idempotency-Key': 'k', 'Authorization': f'Bearer {token}'}
+            await client.post('/items', json={'title': 'a'}, headers=headers)
+
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_retryable_answers_are_not_stored() -> None:
+    """After a 503 the retry runs the handler again."""
+    app, calls = counting_app()
+    async with client_for(app) as client:
+        failed = await client.post('/flaky', headers={'Idempotency-Key': 'k'})
+        retried = await client.post('/flaky', headers={'Idempotency-Key': 'k'})
+
+    assert failed.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert retried.json() == {'attempt': 2}
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_with_key_is_refused() -> None:
+    """A body larger than max_body cannot be fingerprinted and is answered with 413."""
+    app, calls = counting_app()
+    async with client_for(app) as client:
+        response = await client.post('/items', content=b'x' * 2048, headers={'Idempotency-Key': 'k'})
+
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert not calls
+
+
+@pytest.mark.asyncio
+async def test_database_store_claims_saves_and_takes_over(test_engine: AsyncEngine) -> None:
+    """A live claim blocks other workers, an abandoned one is taken over, and a saved response is served."""
+    sessions = async_sessionmaker(test_engine, expire_on_commit=False)
+    store = DatabaseIdempotencyStore(lambda: sessions, ttl=60.0, lease=60.0)
+    abandoning = DatabaseIdempotencyStore(lambda: sessions, ttl=60.0, lease=0.0)
+
+    assert await store.claim('live', 'f')
+    assert not await store.claim('live', 'f')
+    assert await store.get('live') is None
+
+    assert await abandoning.claim('abandoned', 'f')
+    assert await store.claim('abandoned', 'f')
+
+    await store.save('live', StoredResponse('f', 201, [(b'content-type', b'application/json')], b'{"id":1}'))
+    await store.release('live')
+    stored = await store.get('live')
+    assert (stored.status, stored.headers, stored.body) == (201, [(b'content-type', b'application/json')], b'{"id":1}')
@@ -0,0 +1,53 @@
+"""Request timing middleware and database query listeners."""
+
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from src.utils.instrumentation import (
+    MetricsMiddleware,
+    RequestStats,
+    current_request,
+    instrument_engine,
+    request_seconds,
+)
+
+
+def test_engine_listeners_count_queries_of_current_request() -> None:
+    """Statements run while a request is active are added to its stats."""
+    engine = create_engine('sqlite://')
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = current_request.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            conn.execute(text('SELECT 2'))
+    finally:
+        current_request.reset(token)
+
+    assert stats.queries == 2  # noqa: PLR2004
+    assert stats.db_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_route_and_server_timing() -> None:
+    """Latency is recorded under the route template and reported in Server-Timing."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, server_timing=True)
+
+    @app.get('/items/{item_id}')
+    async def item(item_id: int) -> dict[str, int]:
+        return {'id': item_id}
+
+    before = request_seconds.count(('GET', '/items/{item_id}', '200'))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/items/7')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['server-timing'].startswith('app;dur=')
+    assert 'db;dur=0.00;desc="0 queries"' in response.headers['server-timing']
+    assert request_seconds.count(('GET', '/items/{item_id}', '200')) == before + 1
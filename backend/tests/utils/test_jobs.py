@@ -0,0 +1,221 @@
+"""Background job queue: batching, bounded concurrency, back pressure, drain and the durable table."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.models import Job
+from src.utils.jobs import JobQueue, jobs_failed
+
+BATCH_SIZE = 10
+CONCURRENCY = 2
+
+
+def make_queue(max_pending: int = 1000, drain_timeout: float = 1.0) -> JobQueue:
+    """Return a queue that is not started yet."""
+    return JobQueue(concurrency=CONCURRENCY, max_pending=max_pending, drain_timeout=drain_timeout, retry_delay=0.0)
+
+
+@pytest.mark.asyncio
+async def test_payloads_are_batched() -> None:
+    """Payloads submitted together reach the handler in batches of at most batch_size."""
+    queue = make_queue()
+    batches: list[list[Any]] = []
+
+    @queue.register('audit', batch_size=BATCH_SIZE, batch_interval=0.05)
+    async def handle(payloads: list[Any]) -> None:
+        batches.append(payloads)
+
+    queue.start()
+    for number in range(25):
+        assert queue.submit('audit', number)
+    await queue.drain()
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [number for batch in batches for number in batch] == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded() -> None:
+    """No more than ``concurrency`` handlers run at once."""
+    queue = make_queue()
+    running = peak = 0
+
+    @queue.register('slow')
+    async def handle(_: list[Any]) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    queue.start()
+    for _ in range(8):
+        queue.submit('slow')
+    await queue.drain()
+
+    assert peak == CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking() -> None:
+    """Beyond max_pending payloads, submit returns False right away."""
+    queue = make_queue(max_pending=3)
+    release = asyncio.Event()
+
+    @queue.register('blocked')
+    async def handle(_: list[Any]) -> None:
+        await release.wait()
+
+    queue.start()
+    accepted = [queue.submit('blocked') for _ in range(5)]
+    release.set()
+    await queue.drain()
+
+    assert accepted == [True, True, True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_drain_rejects_new_jobs_and_times_out() -> None:
+    """Draining waits for running handlers up to the timeout and stops accepting jobs."""
+    queue = make_queue(drain_timeout=0.05)
+
+    @queue.register('stuck')
+    async def handle(_: list[Any]) -> None:
+        await asyncio.sleep(10)
+
+    queue.start()
+    queue.submit('stuck')
+    await asyncio.sleep(0)
+
+    assert await queue.drain() == 1
+    assert not queue.submit('stuck')
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_stop_the_queue() -> None:
+    """A handler error is logged and counted; later jobs still run."""
+    queue = make_queue()
+    handled: list[Any] = []
+
+    @queue.register('flaky')
+    async def handle(payloads: list[Any]) -> None:
+        if payloads == ['boom']:
+            raise RuntimeError('boom')
+        handled.extend(payloads)
+
+    failed = jobs_failed.value(('flaky',))
+    queue.start()
+    queue.submit('flaky', 'boom')
+    queue.submit('flaky', 'ok')
+    await queue.drain()
+
+    assert handled == ['ok']
+    assert jobs_failed.value(('flaky',)) == failed + 1
+    assert queue.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_starts_the_queue_and_rejects_unknown_kinds() -> None:
+    """Outside the lifespan the queue starts on first use; unregistered kinds are an error."""
+    queue = make_queue()
+    handled = asyncio.Event()
+
+    @queue.register('ping')
+    async def handle(_: list[Any]) -> None:
+        handled.set()
+
+    assert queue.submit('ping')
+    await asyncio.wait_for(handled.wait(), 1.0)
+    await queue.drain()
+
+    with pytest.raises(ValueError, match='Unknown job kind'):
+        queue.submit('missing')
+
+
+@pytest.mark.asyncio
+async def test_periodic_jobs_repeat_until_drain() -> None:
+    """A kind scheduled with every() runs at once and again after each interval, and stops on drain."""
+    queue = make_queue()
+    runs: list[Any] = []
+
+    @queue.register('maintain')
+    async def handle(payloads: list[Any]) -> None:
+        runs.extend(payloads)
+
+    queue.every('maintain', 0.01, 'tick')
+    await asyncio.sleep(0.05)
+    await queue.drain()
+    seen = len(runs)
+    await asyncio.sleep(0.03)
+
+    assert seen >= 2  # noqa: PLR2004
+    assert len(runs) == seen
+    assert set(runs) == {'tick'}
+
+
+@pytest.mark.asyncio
+async def test_run_calls_the_handler_directly() -> None:
+    """run() awaits the handler with the payload, without starting the queue."""
+    queue = make_queue()
+    runs: list[list[Any]] = []
+
+    @queue.register('purge')
+    async def handle(payloads: list[Any]) -> None:
+        runs.append(payloads)
+
+    await queue.run('purge', 'now')
+
+    assert runs == [['now']]
+    with pytest.raises(ValueError, match='Unknown job kind'):
+        await queue.run('missing')
+
+
+@pytest.mark.asyncio
+async def test_periodic_jobs_can_start_late() -> None:
+    """With a delay, every() waits before the first submission."""
+    queue = make_queue()
+    runs: list[Any] = []
+
+    @queue.register('maintain')
+    async def handle(payloads: list[Any]) -> None:
+        runs.extend(payloads)
+
+    queue.every('maintain', 0.01, 'tick', delay=0.2)
+    await asyncio.sleep(0.05)
+    await queue.drain()
+
+    assert runs == []
+
+
+@pytest.mark.asyncio
+async def test_durable_jobs_are_claimed_once(test_engine: AsyncEngine, db_session: AsyncSession) -> None:
+    """Rows are handled in batches, deleted on success and rescheduled on failure."""
+    sessions = async_sessionmaker(test_engine, expire_on_commit=False)
+    queue = make_queue()
+    handled: list[Any] = []
+
+    @queue.register('durable', batch_size=BATCH_SIZE)
+    async def handle(payloads: list[Any]) -> None:
+        if {'fail': True} in payloads:
+            raise RuntimeError('fail')
+        handled.extend(payloads)
+
+    for number in range(3):
+        await queue.enqueue(db_session, 'durable', {'number': number})
+    await db_session.commit()
+
+    assert await queue.run_durable(sessions, 'durable', queue.kinds['durable']) == 3  # noqa: PLR2004
+    assert sorted(payload['number'] for payload in handled) == [0, 1, 2]
+    assert await queue.run_durable(sessions, 'durable', queue.kinds['durable']) == 0
+
+    await queue.enqueue(db_session, 'durable', {'fail': True})
+    await db_session.commit()
+    assert await queue.run_durable(sessions, 'durable', queue.kinds['durable']) == 1
+    job = (await db_session.execute(select(Job).where(Job.kind == 'durable'))).scalar_one()
+    assert job.attempts == 1
+    assert job.last_error == "RuntimeError('fail')"
+    assert await db_session.scalar(select(func.count()).select_from(Job)) == 1
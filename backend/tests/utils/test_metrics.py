@@ -0,0 +1,30 @@
+"""Prometheus text rendering of the in-process metrics."""
+
+from src.utils.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    """Observations land in the first bucket whose bound is not below them."""
+    histogram = Histogram('latency_seconds', 'Latency.', labelnames=('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ('/a',))
+
+    lines = list(histogram.samples())
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2.0' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3.0' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4.0' in lines
+    assert 'latency_seconds_count{route="/a"} 4.0' in lines
+    assert histogram.count(('/a',)) == 4  # noqa: PLR2004
+
+
+def test_registry_renders_all_metric_types() -> None:
+    """Every registered metric is rendered with its HELP and TYPE lines."""
+    registry = Registry()
+    registry.register(Counter('requests_total', 'Requests.')).inc()
+    registry.register(Gauge('in_use', 'In use.', callback=lambda: 3))
+
+    text = registry.render()
+
+    assert '# TYPE requests_total counter\nrequests_total 1.0' in text
+    assert '# TYPE in_use gauge\nin_use 3' in text
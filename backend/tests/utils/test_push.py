@@ -0,0 +1,95 @@
+"""Server push hub: fan-out, slow consumers, the event stream and the bridge payloads."""
+
+import uuid
+from http import HTTPStatus
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app
+from src.utils.push import PushHub, encode_event, push_dropped
+
+
+def make_hub(queue_size: int = 4, max_per_user: int = 3) -> PushHub:
+    """Return a hub without a bridge and with a short heartbeat."""
+    return PushHub(queue_size=queue_size, max_per_user=max_per_user, heartbeat_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_events_reach_every_connection_of_the_user_only() -> None:
+    """A user's event is buffered for each of their connections and nobody else's."""
+    hub = make_hub()
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    first, second, other = hub.subscribe(alice), hub.subscribe(alice), hub.subscribe(bob)
+
+    assert hub.publish(alice, 7) == 2  # noqa: PLR2004
+    assert await first.get() == encode_event(7)
+    assert await second.get() == encode_event(7)
+    assert not other._events
+    assert hub.publish(uuid.uuid4(), 1) == 0
+
+
+def test_slow_consumer_is_dropped() -> None:
+    """A connection with a full buffer is closed and counted; the others keep receiving."""
+    hub = make_hub(queue_size=2)
+    user_id = uuid.uuid4()
+    slow, fast = hub.subscribe(user_id), hub.subscribe(user_id)
+    dropped = push_dropped.value()
+
+    for version in range(3):
+        hub.publish(user_id, version)
+        fast._events.clear()
+
+    assert slow.closed
+    assert not fast.closed
+    assert push_dropped.value() == dropped + 1
+    assert hub.connections == 1
+
+
+def test_opening_too_many_connections_closes_the_oldest() -> None:
+    """Beyond max_per_user, a new connection replaces the user's oldest one."""
+    hub = make_hub(max_per_user=2)
+    user_id = uuid.uuid4()
+    oldest, _, _ = hub.subscribe(user_id), hub.subscribe(user_id), hub.subscribe(user_id)
+
+    assert oldest.closed
+    assert hub.connections == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_stream_syncs_first_keeps_alive_and_ends_on_stop() -> None:
+    """A stream opens with a sync event, relays events, sends keep-alives and ends when the hub stops."""
+    hub = make_hub()
+    user_id = uuid.uuid4()
+    stream = hub.stream(user_id)
+
+    assert (await anext(stream)).endswith(encode_event(None))
+    hub.publish(user_id, 3)
+    assert await anext(stream) == encode_event(3)
+    assert await anext(stream) == b': keep-alive\n\n'
+
+    await hub.stop()
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert hub.connections == 0
+
+
+def test_bridge_notifications_are_published_locally() -> None:
+    """``user:version`` payloads from other workers are fanned out; malformed ones are ignored."""
+    hub = make_hub()
+    user_id = uuid.uuid4()
+    subscription = hub.subscribe(user_id)
+
+    hub._on_notification(None, 0, 'task_changes', f'{user_id}:12')
+    hub._on_notification(None, 0, 'task_changes', 'garbage')
+
+    assert list(subscription._events) == [encode_event(12)]
+
+
+@pytest.mark.asyncio
+async def test_events_endpoint_requires_credentials() -> None:
+    """The stream is only opened for an authenticated user."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/api/tasks/events')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
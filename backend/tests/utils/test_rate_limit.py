@@ -0,0 +1,78 @@
+"""Token bucket and sliding window limits and their stores."""
+
+import pytest
+
+from src.utils.rate_limit import (
+    InMemorySharedStore,
+    Limit,
+    RateLimiter,
+    RateLimitExceededError,
+    ShardedMemoryStore,
+)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills() -> None:
+    """A full bucket allows ``requests`` hits at once and refills at requests/period."""
+    limit = Limit(3, 60.0)
+    state = None
+    waits = []
+    for _ in range(4):
+        state, wait = limit.apply(state, 0.0)
+        waits.append(wait)
+
+    assert waits == [0.0, 0.0, 0.0, pytest.approx(20.0)]
+    assert limit.apply(state, 20.0)[1] == 0.0
+
+
+def test_sliding_window_weights_previous_window() -> None:
+    """Hits of the previous window count in proportion to their overlap."""
+    limit = Limit(4, 10.0, algorithm='sliding_window')
+    state = None
+    for _ in range(4):
+        state, wait = limit.apply(state, 0.0)
+        assert wait == 0.0
+
+    state, wait = limit.apply(state, 5.0)
+    assert wait > 0
+    # Halfway through the next window two of the four old hits still count.
+    assert limit.apply(state, 15.0)[1] == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('store_class', [ShardedMemoryStore, InMemorySharedStore])
+async def test_limiter_rejects_exhausted_key(store_class: type) -> None:
+    """Both stores reject a key over its limit and report when to retry."""
+    clock = FakeClock()
+    limiter = RateLimiter(store_class(clock=clock))
+    limit = Limit(2, 10.0)
+
+    await limiter.check(('k', limit))
+    await limiter.check(('k', limit))
+    with pytest.raises(RateLimitExceededError) as error:
+        await limiter.check(('k', limit))
+    assert error.value.retry_after == 5  # noqa: PLR2004
+
+    clock.now += 5
+    await limiter.check(('k', limit))
+
+
+@pytest.mark.asyncio
+async def test_sharded_store_is_bounded() -> None:
+    """The least recently used keys are dropped beyond ``max_keys``."""
+    store = ShardedMemoryStore(shards=4, max_keys=8)
+    for i in range(100):
+        await store.hit(f'key-{i}', Limit(1, 60.0))
+
+    assert len(store) <= 8  # noqa: PLR2004
@@ -0,0 +1,154 @@
+"""Per-user response cache with ETags."""
+
+from http import HTTPStatus
+from typing import Annotated
+
+import pytest
+from fastapi import FastAPI, Header, Response
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from src.utils.cache import InMemoryCacheBackend
+from src.utils.replicas import READ_PRIMARY_COOKIE, ReadYourWritesMiddleware
+from src.utils.response_cache import ResponseCache
+
+
+class Item(BaseModel):
+    """Response model of the test endpoint."""
+
+    name: str
+    calls: int
+
+
+def build_app(cache: ResponseCache) -> tuple[FastAPI, dict[str, int]]:
+    """Build an app with one cached endpoint that counts how often it runs."""
+    app = FastAPI()
+    calls = {'count': 0}
+
+    async def current_user(x_user: Annotated[str, Header()]) -> str:
+        return x_user
+
+    @app.get('/items/{name}', response_model=Item)
+    @cache.cached(Item, identity=current_user)
+    async def read_item(name: str, shout: bool = False) -> dict[str, object] | Response:
+        if name == 'raw':
+            return Response(status_code=HTTPStatus.ACCEPTED)
+        calls['count'] += 1
+        return {'name': name.upper() if shout else name, 'calls': calls['count']}
+
+    return app, calls
+
+
+async def get(app: FastAPI, path: str, user: str, **headers: str) -> Response:
+    """Send a GET request to ``app`` as ``user``."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        return await client.get(path, headers={'x-user': user, **headers})
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_the_handler() -> None:
+    """A repeated request is answered from the cache with the same body and ETag."""
+    app, calls = build_app(ResponseCache(maxsize=100, ttl=60))
+
+    first = await get(app, '/items/a?shout=true', 'alice')
+    second = await get(app, '/items/a?shout=true', 'alice')
+
+    assert first.json() == second.json() == {'name': 'A', 'calls': 1}
+    assert first.headers['etag'] == second.headers['etag']
+    assert calls['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_per_user_and_query() -> None:
+    """Different users and different query strings get their own entries."""
+    app, calls = build_app(ResponseCache(maxsize=100, ttl=60))
+
+    await get(app, '/items/a', 'alice')
+    await get(app, '/items/a', 'bob')
+    await get(app, '/items/a?shout=true', 'alice')
+
+    assert calls['count'] == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_conditional_get() -> None:
+    """A matching If-None-Match is answered with 304 and no body."""
+    app, _ = build_app(ResponseCache(maxsize=100, ttl=60))
+    etag = (await get(app, '/items/a', 'alice')).headers['etag']
+
+    response = await get(app, '/items/a', 'alice', **{'if-none-match': etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+
+@pytest.mark.asyncio
+async def test_invalidate_only_affects_one_user() -> None:
+    """After invalidation the user's next read runs the handler; other users keep their entries."""
+    cache = ResponseCache(maxsize=100, ttl=60)
+    app, calls = build_app(cache)
+    await get(app, '/items/a', 'alice')
+    await get(app, '/items/a', 'bob')
+
+    await cache.invalidate('alice')
+    alice = await get(app, '/items/a', 'alice')
+    await get(app, '/items/a', 'bob')
+
+    assert alice.json()['calls'] == 3  # noqa: PLR2004
+    assert calls['count'] == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_serves_other_workers() -> None:
+    """Entries and invalidations travel through the shared backend between caches."""
+    shared = InMemoryCacheBackend()
+    first_worker, first_calls = build_app(ResponseCache(maxsize=100, ttl=60, shared=shared))
+    second_cache = ResponseCache(maxsize=100, ttl=60, shared=shared)
+    second_worker, second_calls = build_app(second_cache)
+
+    await get(first_worker, '/items/a', 'alice')
+    served = await get(second_worker, '/items/a', 'alice')
+    await second_cache.invalidate('alice')
+    refreshed = await get(first_worker, '/items/a', 'alice')
+
+    assert served.json() == {'name': 'a', 'calls': 1}
+    assert second_calls['count'] == 0
+    assert refreshed.json()['calls'] == 2  # noqa: PLR2004
+    assert first_calls['count'] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_are_not_stored_right_after_a_write() -> None:
+    """Within the replica lag after an invalidation only reads from the primary fill the cache."""
+    cache = ResponseCache(maxsize=100, ttl=60, replica_lag=60)
+    app, calls = build_app(cache)
+    app.add_middleware(ReadYourWritesMiddleware, window=60)
+    await get(app, '/items/a', 'bob')
+    await get(app, '/items/a', 'bob')
+    await cache.invalidate('alice')
+
+    await get(app, '/items/a', 'alice')
+    replica = await get(app, '/items/a', 'alice')
+    await get(app, '/items/a', 'alice', cookie=f'{READ_PRIMARY_COOKIE}=1')
+    primary = await get(app, '/items/a', 'alice', cookie=f'{READ_PRIMARY_COOKIE}=1')
+
+    assert replica.json()['calls'] == 3  # noqa: PLR2004
+    assert 'etag' in replica.headers
+    assert primary.json()['calls'] == 4  # noqa: PLR2004
+    assert calls['count'] == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_and_handler_responses_pass_through() -> None:
+    """A disabled cache runs the handler every time; responses built by the handler are not cached."""
+    app, calls = build_app(ResponseCache(maxsize=100, ttl=60, enabled=False))
+
+    await get(app, '/items/a', 'alice')
+    second = await get(app, '/items/a', 'alice')
+    raw = await get(build_app(ResponseCache(maxsize=100, ttl=60))[0], '/items/raw', 'alice')
+
+    assert second.json()['calls'] == 2  # noqa: PLR2004
+    assert 'etag' not in second.headers
+    assert raw.status_code == HTTPStatus.ACCEPTED
+    assert calls['count'] == 2  # noqa: PLR2004
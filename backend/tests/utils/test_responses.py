@@ -0,0 +1,86 @@
+"""JSON rendering with orjson, the standard library fallback and trusted responses."""
+
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from src.main import app as main_app
+from src.models import TaskStatus
+from src.utils import responses
+from src.utils.responses import FastJSONResponse, dumps, trusted_json
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'status': TaskStatus.DONE,
+    'created_at': datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+    'title': 'Zadača',
+    'tags': [1, 2.5, None, True],
+}
+EXPECTED = {
+    'id': '12345678-1234-5678-1234-567812345678',
+    'status': 'done',
+    'created_at': '2024-01-02T03:04:05+00:00',
+    'title': 'Zadača',
+    'tags': [1, 2.5, None, True],
+}
+
+
+class Strict(BaseModel):
+    """A response model the trusted payload does not satisfy."""
+
+    count: int
+
+
+def test_dumps_renders_extended_types() -> None:
+    """Datetimes, UUIDs and enums are rendered like the response models would."""
+    assert json.loads(dumps(PAYLOAD)) == EXPECTED
+
+
+def test_fallback_matches_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without orjson the standard library produces the same compact document."""
+    rendered = dumps(PAYLOAD)
+    monkeypatch.setattr(responses, 'orjson', None)
+
+    assert dumps(PAYLOAD) == rendered
+    assert FastJSONResponse(PAYLOAD).body == rendered
+
+
+def test_fallback_rejects_unknown_types(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Objects without a JSON form raise in both implementations."""
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
+    monkeypatch.setattr(responses, 'orjson', None)
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
+
+
+@pytest.mark.asyncio
+async def test_trusted_response_skips_validation() -> None:
+    """A trusted response is sent as built while the model still documents the route."""
+    app = FastAPI()
+
+    @app.get('/count', response_model=Strict)
+    async def count() -> FastJSONResponse:
+        return trusted_json({'count': 'many'}, headers={'X-Trusted': '1'})
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response = await client.get('/count')
+
+    assert response.json() == {'count': 'many'}
+    assert response.headers['x-trusted'] == '1'
+    schema = app.openapi()['paths']['/count']['get']['responses']['200']['content']['application/json']['schema']
+    assert schema == {'$ref': '#/components/schemas/Strict'}
+
+
+def test_auth_routes_keep_their_models() -> None:
+    """Token endpoints returning trusted responses are still documented by their models."""
+    paths = main_app.openapi()['paths']
+
+    for path in ('/api/auth/login', '/api/auth/register', '/api/auth/refresh'):
+        content = paths[path]['post']['responses']['200']['content']['application/json']
+        assert content['schema'] == {'$ref': '#/components/schemas/TokenResponse'}